@@ -0,0 +1,105 @@
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import json
+import time
+import logging
+
+import openai
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+CHAT_ENDPOINT = "/v1/chat/completions"
+EMBEDDINGS_ENDPOINT = "/v1/embeddings"
+
+# Batch states after which nothing more will happen; expired batches still return partial output
+TERMINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+def batch_line(custom_id: str, endpoint: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    """One request of a Batch API input file"""
+    return {"custom_id": custom_id, "method": "POST", "url": endpoint, "body": body}
+
+def write_jsonl(path: Path, lines: Iterable[Dict[str, Any]]) -> int:
+    """Write request lines to a JSONL file; returns how many were written"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+class BatchAPIClient:
+    """Submits JSONL request files to the OpenAI Batch API and collects their results
+
+    Batch requests run asynchronously within the completion window, at half
+    the price of interactive calls and outside the per-minute rate limits.
+    """
+
+    def __init__(self, client: openai.OpenAI = None, poll_interval: float = None,
+                 completion_window: str = None, sleep: Callable[[float], None] = time.sleep):
+        self.client = client or openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.poll_interval = settings.BATCH_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.completion_window = completion_window or settings.BATCH_COMPLETION_WINDOW
+        self.sleep = sleep
+
+    def submit(self, path: Path, endpoint: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        """Upload a request file and start a batch for it; returns the batch id"""
+        with open(path, 'rb') as f:
+            uploaded = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=endpoint,
+            completion_window=self.completion_window,
+            **({"metadata": metadata} if metadata else {}),
+        )
+        logger.info(f"📦 Submitted batch {batch.id} ({endpoint}) from {path.name}")
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def wait(self, batch_ids: List[str], timeout: Optional[float] = None) -> Dict[str, str]:
+        """Poll until every batch reaches a terminal state or timeout passes; returns the last states"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            states = {batch_id: self.status(batch_id) for batch_id in batch_ids}
+            pending = [batch_id for batch_id, state in states.items() if state not in TERMINAL_STATES]
+            if not pending:
+                return states
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning(f"⏳ {len(pending)} batches still running after {timeout}s")
+                return states
+            logger.info(f"⏳ Waiting for {len(pending)} of {len(batch_ids)} batches: {sorted(set(states.values()))}")
+            self.sleep(self.poll_interval)
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """Response bodies of the successful requests of a batch, by custom_id"""
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.error_file_id:
+            errors = self.client.files.content(batch.error_file_id).text.splitlines()
+            logger.warning(f"⚠️ Batch {batch_id} reported {len([e for e in errors if e.strip()])} failed requests")
+        if not batch.output_file_id:
+            logger.warning(f"⚠️ Batch {batch_id} ended '{batch.status}' without output")
+            return {}
+
+        bodies = {}
+        for raw in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not raw.strip():
+                continue
+            line = json.loads(raw)
+            response = line.get("response") or {}
+            if line.get("error") or response.get("status_code") != 200:
+                continue
+            bodies[line["custom_id"]] = response.get("body") or {}
+        return bodies
+
+def chat_content(body: Dict[str, Any]) -> Optional[str]:
+    """Message text of a chat completion response body"""
+    choices = body.get("choices") or []
+    return choices[0].get("message", {}).get("content") if choices else None
+
+def embedding_vectors(body: Dict[str, Any]) -> List[List[float]]:
+    """Vectors of an embeddings response body, in input order"""
+    return [item["embedding"] for item in sorted(body.get("data") or [], key=lambda item: item["index"])]
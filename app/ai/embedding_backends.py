@@ -0,0 +1,114 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+import importlib.util
+import threading
+import logging
+
+from ..config import settings
+from .openai_service import OpenAIService
+
+logger = logging.getLogger(__name__)
+
+# Output size of the OpenAI embedding models, known without a request
+OPENAI_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+class EmbeddingBackend(ABC):
+    """Turns texts into vectors for the vector store"""
+
+    name: str = ""
+
+    def __init__(self, model: str):
+        self.model = model
+
+    @property
+    @abstractmethod
+    def dimensions(self) -> Optional[int]:
+        """Vector size, or None if it is only known after the first request"""
+        pass
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """One vector per text, in order; [] if the texts could not be embedded"""
+        pass
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    """Embeddings from the OpenAI API, through the cached and batched OpenAIService path"""
+
+    name = "openai"
+
+    def __init__(self, model: str = None, openai_service: OpenAIService = None):
+        super().__init__(model or settings.OPENAI_EMBEDDING_MODEL)
+        self.openai_service = openai_service or OpenAIService()
+
+    @property
+    def dimensions(self) -> Optional[int]:
+        return OPENAI_DIMENSIONS.get(self.model)
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return self.openai_service._create_embeddings(texts, self.model)
+
+class LocalEmbeddingBackend(EmbeddingBackend):
+    """sentence-transformers model run in-process on the CPU, encoding texts in batches
+
+    Loaded models are shared per process and the weights are only loaded on
+    the first embed, so opening a collection does not load them.
+    """
+
+    name = "local"
+    _models: Dict[tuple, object] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, model: str = None, batch_size: int = None, device: str = None):
+        super().__init__(model or settings.EMBEDDING_LOCAL_MODEL)
+        self.batch_size = batch_size or settings.EMBEDDING_LOCAL_BATCH_SIZE
+        self.device = device or settings.EMBEDDING_LOCAL_DEVICE
+
+    @property
+    def encoder(self):
+        key = (self.model, self.device)
+        with self._lock:
+            if key not in self._models:
+                from sentence_transformers import SentenceTransformer
+                logger.info(f"Loading local embedding model {self.model} on {self.device}")
+                self._models[key] = SentenceTransformer(self.model, device=self.device)
+            return self._models[key]
+
+    @property
+    def dimensions(self) -> Optional[int]:
+        # Known once the model is loaded; until then the collection records it on the first store
+        encoder = self._models.get((self.model, self.device))
+        return encoder.get_sentence_embedding_dimension() if encoder else None
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        try:
+            vectors = self.encoder.encode(texts, batch_size=self.batch_size, convert_to_numpy=True,
+                                          normalize_embeddings=True, show_progress_bar=False)
+            return vectors.tolist()
+        except Exception as e:
+            logger.error(f"Error creating local embeddings: {e}")
+            return []
+
+# Backend names accepted by EMBEDDING_BACKEND and the module each one needs
+EMBEDDING_BACKENDS = {
+    "openai": (OpenAIEmbeddingBackend, None),
+    "local": (LocalEmbeddingBackend, "sentence_transformers"),
+}
+
+def create_embedding_backend(name: str = None) -> EmbeddingBackend:
+    """Backend selected by EMBEDDING_BACKEND, falling back to OpenAI if it is unknown or not installed"""
+    name = name or settings.EMBEDDING_BACKEND
+    if name not in EMBEDDING_BACKENDS:
+        logger.warning(f"Unknown embedding backend '{name}', using openai")
+        return OpenAIEmbeddingBackend()
+
+    backend_class, module = EMBEDDING_BACKENDS[name]
+    if module and importlib.util.find_spec(module) is None:
+        logger.warning(f"Embedding backend '{name}' needs {module}, which is not installed; using openai")
+        return OpenAIEmbeddingBackend()
+    return backend_class()
@@ -0,0 +1,83 @@
+from typing import Awaitable, Callable, List, Optional, Tuple, Type
+import asyncio
+import logging
+
+from .rate_limiter import backoff_delay, retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingBatcher:
+    """Splits texts into sub-batches bounded by tokens and item count and embeds them concurrently
+
+    Sub-batches that fail are retried on their own with backoff; vectors are
+    written back by position, so the result always lines up with the input.
+    """
+
+    def __init__(self, max_tokens: int = 100_000, max_items: int = 512, concurrency: int = 4,
+                 max_retries: int = 3, retry_delay: float = 1.0,
+                 retryable: Tuple[Type[BaseException], ...] = (Exception,)):
+        self.max_tokens = max_tokens
+        self.max_items = max_items
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.retryable = retryable
+
+    def plan(self, token_counts: List[int]) -> List[List[int]]:
+        """Group text positions into consecutive sub-batches
+
+        A text larger than the token budget on its own still gets a batch of one.
+        """
+        batches, current, tokens = [], [], 0
+        for position, count in enumerate(token_counts):
+            if current and (tokens + count > self.max_tokens or len(current) >= self.max_items):
+                batches.append(current)
+                current, tokens = [], 0
+            current.append(position)
+            tokens += count
+        if current:
+            batches.append(current)
+        return batches
+
+    async def run(self, texts: List[str], count_tokens: Callable[[str], int],
+                  send: Callable[[List[str], int], Awaitable[List[List[float]]]]) -> List[List[float]]:
+        """Embed texts with send(batch_texts, batch_tokens); raises once a sub-batch runs out of retries"""
+        counts = [count_tokens(text) for text in texts]
+        batches = self.plan(counts)
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send_batch(batch: List[int]) -> List[List[float]]:
+            async with semaphore:
+                result = await send([texts[i] for i in batch], sum(counts[i] for i in batch))
+            if len(result) != len(batch):
+                raise ValueError(f"Expected {len(batch)} embeddings, got {len(result)}")
+            return result
+
+        pending = batches
+        logger.info(f"[Embeddings] {len(texts)} texts in {len(batches)} sub-batches")
+        attempts = max(self.max_retries, 1)
+        for attempt in range(attempts):
+            outcomes = await asyncio.gather(*[send_batch(batch) for batch in pending], return_exceptions=True)
+            failed, errors = [], []
+            for batch, outcome in zip(pending, outcomes):
+                if isinstance(outcome, BaseException):
+                    failed.append(batch)
+                    errors.append(outcome)
+                    continue
+                for position, vector in zip(batch, outcome):
+                    vectors[position] = vector
+            if not failed:
+                return vectors
+
+            fatal = next((e for e in errors if not isinstance(e, self.retryable)), None)
+            if fatal is not None:
+                raise fatal
+            if attempt == attempts - 1:
+                logger.error(f"[Embeddings] {len(failed)} sub-batches failed after {attempts} attempts")
+                raise errors[0]
+            retry_after = max((retry_after_seconds(e) or 0 for e in errors), default=0) or None
+            delay = backoff_delay(attempt, base=self.retry_delay, retry_after=retry_after)
+            logger.warning(f"[Embeddings] Retrying {len(failed)} of {len(batches)} sub-batches in {delay:.1f}s: {errors[0]}")
+            await asyncio.sleep(delay)
+            pending = failed
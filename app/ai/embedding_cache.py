@@ -0,0 +1,131 @@
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import hashlib
+import sqlite3
+import threading
+import time
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """SQLite store of embedding vectors keyed by (model, SHA-256 of the text)
+
+    Vectors are kept as packed float32 blobs (4 bytes per dimension, a quarter
+    of their JSON size). Embeddings are deterministic for a model, so entries
+    never expire; a different model simply misses.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+        self.calls_saved = 0
+        self.tokens_saved = 0
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """Cached vector per text, None where the text has not been embedded with this model"""
+        hashes = [self.text_hash(text) for text in texts]
+        found: Dict[str, tuple] = {}
+        with self._lock:
+            db = self._db()
+            unique = list(dict.fromkeys(hashes))
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                rows = db.execute(
+                    f"SELECT text_hash, vector, tokens FROM embeddings WHERE model = ? "
+                    f"AND text_hash IN ({','.join('?' * len(batch))})",
+                    [model, *batch]
+                ).fetchall()
+                found.update((text_hash, (vector, tokens)) for text_hash, vector, tokens in rows)
+            if found:
+                db.executemany("UPDATE embeddings SET accessed_at = ? WHERE model = ? AND text_hash = ?",
+                               [(time.time(), model, text_hash) for text_hash in found])
+                db.commit()
+
+            vectors = []
+            for text_hash in hashes:
+                if text_hash in found:
+                    vector, tokens = found[text_hash]
+                    vectors.append(_unpack(vector))
+                    self.hits += 1
+                    self.tokens_saved += tokens
+                else:
+                    vectors.append(None)
+                    self.misses += 1
+            if texts and all(vector is not None for vector in vectors):
+                self.calls_saved += 1
+            return vectors
+
+    def put_many(self, model: str, texts: List[str], vectors: List[List[float]], tokens: List[int] = None):
+        """Store vectors; tokens per text are what a later hit saves"""
+        tokens = tokens or [0] * len(texts)
+        now = time.time()
+        rows = [
+            (model, self.text_hash(text), len(vector), _pack(vector), count, now, now)
+            for text, vector, count in zip(texts, vectors, tokens)
+        ]
+        with self._lock:
+            self._db().executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, dimensions, vector, tokens, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._db().commit()
+
+    def clear(self):
+        """Remove every cached vector"""
+        with self._lock:
+            self._db().execute("DELETE FROM embeddings")
+            self._db().commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            entries, total = self._db().execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "calls_saved": self.calls_saved,
+            "tokens_saved": self.tokens_saved,
+        }
+
+    def _db(self) -> sqlite3.Connection:
+        """Open the database lazily so importing the module does not touch disk"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, text_hash TEXT NOT NULL, dimensions INTEGER NOT NULL, "
+                "vector BLOB NOT NULL, tokens INTEGER NOT NULL, created_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL, PRIMARY KEY (model, text_hash))"
+            )
+            self._conn.commit()
+        return self._conn
+
+def _pack(vector: List[float]) -> bytes:
+    return array('f', vector).tobytes()
+
+def _unpack(blob: bytes) -> List[float]:
+    vector = array('f')
+    vector.frombytes(blob)
+    return vector.tolist()
+
+# Global embedding cache shared by every OpenAIService (None when disabled)
+embedding_cache = EmbeddingCache(settings.EMBEDDING_CACHE_PATH) if settings.EMBEDDING_CACHE_ENABLED else None
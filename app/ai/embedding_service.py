@@ -1,50 +1,77 @@
 import chromadb
 from chromadb.config import Settings
+from functools import lru_cache
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-from app.ai.openai_service import OpenAIService
+from app.ai.embedding_backends import EmbeddingBackend, create_embedding_backend
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 class EmbeddingService:
-    """Service for managing embeddings and vector operations"""
+    """Service for managing embeddings and vector operations
+    
+    Vectors come from the backend selected by EMBEDDING_BACKEND. Each backend
+    gets its own collection, whose metadata records the backend, model and
+    vector dimensions; a collection holding vectors of another model is never
+    written to or queried with this one.
+    """
 
-    def __init__(self):
-        self.client = chromadb.PersistentClient(path=settings.CHROMA_DB_PATH)
-        self.openai_service = OpenAIService()
+    def __init__(self, backend: EmbeddingBackend = None, client=None):
+        self.client = client or chromadb.PersistentClient(path=settings.CHROMA_DB_PATH)
+        self.backend = backend or create_embedding_backend()
+        self.collection_name = collection_name_for(self.backend)
         self.collection = self._setup_collection()
 
     def _setup_collection(self):
-        """Setup the articles collection"""
+        """Setup the articles collection for this backend"""
         try:
+            expected = {
+                "embedding_backend": self.backend.name,
+                "embedding_model": self.backend.model,
+            }
+            if self.backend.dimensions:
+                expected["embedding_dimensions"] = self.backend.dimensions
             collection = self.client.get_or_create_collection(
-                name=settings.CHROMA_COLLECTION_NAME,
-                metadata={"description": "News article chunks and embeddings"}
+                name=self.collection_name,
+                metadata={"description": "News article chunks and embeddings", **expected}
             )
-            logger.info(f"Collection '{settings.CHROMA_COLLECTION_NAME}' created or retrieved")
+            # A collection created before backends were recorded is adopted as is
+            recorded = dict(collection.metadata or {})
+            _check_compatible(self.collection_name, recorded, expected)
+            if any(recorded.get(key) is None for key in expected):
+                collection.modify(metadata={**recorded, **expected})
+            logger.info(f"Collection '{self.collection_name}' created or retrieved "
+                        f"({self.backend.name}/{self.backend.model})")
             return collection
         except Exception as e:
             logger.error(f"Error setting up collection: {e}")
             raise
     
     def create_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Create embeddings for a list of texts using OpenAI"""
+        """Create embeddings for a list of texts with the configured backend"""
         try:
-            return self.openai_service._create_embeddings(texts)
+            return self.backend.embed(texts)
         except Exception as e:
             logger.error(f"Error creating embeddings: {e}")
             return []
 
-    def store_article_chunks(self, article_id: str, chunks: List[Dict]) -> bool:
-        """Store article chunks as vectors"""
+    def store_article_chunks(self, article_id: str, chunks: List[Dict],
+                             embeddings: Optional[List[List[float]]] = None) -> bool:
+        """Store article chunks as vectors; embeddings already computed (e.g. by a batch) are used as is"""
         try:
             # Extract chunk texts
             texts = [chunk.content for chunk in chunks]
             
             # Create embeddings
-            embeddings = self.create_embeddings(texts)
+            if embeddings is None:
+                embeddings = self.create_embeddings(texts)
+            if len(embeddings) != len(texts):
+                logger.error(f"Got {len(embeddings)} embeddings for {len(texts)} chunks of article {article_id}, not storing")
+                return False
+            if not self._check_dimensions(embeddings):
+                return False
 
             # Prepare metadata
             metadatas = []
@@ -77,7 +104,7 @@ class EmbeddingService:
         """Search for similar articles"""
         try:
             # Create embedding for query
-            query_embedding = self.openai_service._create_embeddings([query])[0]
+            query_embedding = self.create_embeddings([query])[0]
 
             # Search collection
             results = self.collection.query(
@@ -99,4 +126,40 @@ class EmbeddingService:
             return formatted_results
         except Exception as e:
             logger.error(f"Error in similarity search: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def _check_dimensions(self, embeddings: List[List[float]]) -> bool:
+        """Refuse vectors whose size differs from the collection's; records the size on first use"""
+        if not embeddings:
+            return True
+        size = len(embeddings[0])
+        recorded = self.collection.metadata.get("embedding_dimensions") if self.collection.metadata else None
+        if recorded is None:
+            self.collection.modify(metadata={**(self.collection.metadata or {}), "embedding_dimensions": size})
+            return True
+        if any(len(vector) != recorded for vector in embeddings):
+            logger.error(f"Collection '{self.collection_name}' stores {recorded}-dimension vectors, got {size}")
+            return False
+        return True
+
+@lru_cache(maxsize=1)
+def get_embedding_service() -> EmbeddingService:
+    """Service shared by request handlers, so Chroma and the backend are opened once per process"""
+    return EmbeddingService()
+
+def collection_name_for(backend: EmbeddingBackend) -> str:
+    """OpenAI vectors keep the configured collection; other backends get their own next to it"""
+    if backend.name == "openai":
+        return settings.CHROMA_COLLECTION_NAME
+    return f"{settings.CHROMA_COLLECTION_NAME}_{backend.name}"
+
+def _check_compatible(name: str, recorded: Dict, expected: Dict):
+    """Raise if the collection already holds vectors from another backend, model or dimension"""
+    conflicts = {
+        key: (recorded[key], value) for key, value in expected.items()
+        if recorded.get(key) is not None and recorded[key] != value
+    }
+    if conflicts:
+        details = ", ".join(f"{key} is {old!r}, not {new!r}" for key, (old, new) in conflicts.items())
+        raise ValueError(f"Collection '{name}' holds vectors from another embedding setup ({details}); "
+                         f"set CHROMA_COLLECTION_NAME to use a separate collection")
@@ -0,0 +1,142 @@
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import json
+import threading
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+Validator = Callable[[Optional[str]], bool]
+
+def parse_json_reply(reply: Optional[str]) -> Any:
+    """Decode a JSON reply, tolerating a markdown code fence around it; None if it is not JSON"""
+    text = (reply or "").strip()
+    if text.startswith("```"):
+        text = text.strip('`')
+        text = text[4:] if text.lower().startswith('json') else text
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+def json_object(reply: Optional[str]) -> bool:
+    return isinstance(parse_json_reply(reply), dict)
+
+def json_array(reply: Optional[str]) -> bool:
+    return isinstance(parse_json_reply(reply), list)
+
+def max_words(limit: int) -> Validator:
+    return lambda reply: bool(reply and reply.strip()) and len(reply.split()) <= limit
+
+def number_between(low: float, high: float) -> Validator:
+    def validate(reply: Optional[str]) -> bool:
+        try:
+            return low <= float((reply or "").strip()) <= high
+        except ValueError:
+            return False
+    return validate
+
+class TaskRoute(NamedTuple):
+    """Cheapest model tier a task starts at and the check its reply must pass"""
+    tier: int = 0
+    validator: Optional[Validator] = None
+
+# Tasks sent through OpenAIService; a reply failing its check is retried one tier up
+DEFAULT_ROUTES: Dict[str, TaskRoute] = {
+    "analysis": TaskRoute(0, json_object),
+    "sentiment": TaskRoute(0, json_object),
+    "entities": TaskRoute(0, json_array),
+    "topics": TaskRoute(0, json_array),
+    "keywords": TaskRoute(0, json_array),
+    "summary": TaskRoute(0, max_words(60)),
+    "language": TaskRoute(0, max_words(3)),
+    "quality": TaskRoute(0, number_between(0, 10)),
+    "chunking": TaskRoute(0, json_array),
+    "general": TaskRoute(0, None),
+}
+
+def _parse_tiers(value: str) -> Dict[str, int]:
+    """Parse "summary:1,analysis:0" into task tiers"""
+    tiers = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        task, _, tier = item.partition(':')
+        try:
+            tiers[task.strip()] = int(tier)
+        except ValueError:
+            logger.warning(f"Ignoring invalid task tier '{item}'")
+    return tiers
+
+class ModelRouter:
+    """Maps each task to a cascade of models, cheapest first, and records how the routes perform
+
+    models lists the tiers from cheapest to strongest. A task starts at its
+    route's tier and moves up one tier each time the reply fails the
+    route's validator. Per task it records calls, escalations, replies that
+    stayed invalid, latency, tokens and which model answered, so the tiers
+    can be tuned towards the cheapest route that still passes.
+    """
+
+    def __init__(self, models: List[str], routes: Dict[str, TaskRoute] = None, tiers: Dict[str, int] = None):
+        if not models:
+            raise ValueError("ModelRouter needs at least one model")
+        self.models = list(models)
+        self.routes = dict(DEFAULT_ROUTES if routes is None else routes)
+        for task, tier in (tiers or {}).items():
+            route = self.routes.get(task, TaskRoute())
+            self.routes[task] = route._replace(tier=tier)
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+
+    def route(self, task: Optional[str]) -> TaskRoute:
+        return self.routes.get(task or "general", self.routes.get("general", TaskRoute()))
+
+    def models_for(self, task: Optional[str]) -> List[str]:
+        """Models to try for a task, in order; without a validator there is nothing to escalate on"""
+        route = self.route(task)
+        tier = min(max(route.tier, 0), len(self.models) - 1)
+        return self.models[tier:] if route.validator else self.models[tier:tier + 1]
+
+    def validate(self, task: Optional[str], reply: Optional[str]) -> bool:
+        validator = self.route(task).validator
+        return validator is None or validator(reply)
+
+    def record(self, task: Optional[str], model: str, escalations: int, valid: bool, latency: float, tokens: int):
+        """Record one routed request: the model that answered last and how many tiers it climbed"""
+        with self._lock:
+            metrics = self._metrics.setdefault(task or "general", {
+                "calls": 0, "escalations": 0, "escalated_calls": 0, "invalid": 0,
+                "latency": 0.0, "tokens": 0, "models": {},
+            })
+            metrics["calls"] += 1
+            metrics["escalations"] += escalations
+            metrics["escalated_calls"] += 1 if escalations else 0
+            metrics["invalid"] += 0 if valid else 1
+            metrics["latency"] += latency
+            metrics["tokens"] += tokens
+            metrics["models"][model] = metrics["models"].get(model, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Per task: calls, escalation rate, invalid replies, mean latency and tokens, answering models"""
+        with self._lock:
+            return {
+                "models": self.models,
+                "tasks": {
+                    task: {
+                        "calls": m["calls"],
+                        "escalation_rate": round(m["escalated_calls"] / m["calls"], 3),
+                        "escalations": m["escalations"],
+                        "invalid": m["invalid"],
+                        "avg_latency_ms": round(1000 * m["latency"] / m["calls"], 1),
+                        "avg_tokens": round(m["tokens"] / m["calls"], 1),
+                        "models": dict(m["models"]),
+                    }
+                    for task, m in self._metrics.items()
+                },
+            }
+
+# Global router shared by every OpenAIService
+model_router = ModelRouter(
+    [model.strip() for model in settings.OPENAI_MODEL_TIERS.split(',') if model.strip()] or [settings.OPENAI_MODEL],
+    tiers=_parse_tiers(settings.OPENAI_TASK_TIERS),
+)
@@ -1,67 +1,244 @@
 import openai
 import tiktoken
-import time
+import asyncio
+import threading
 import logging
-from typing import List, Dict, Optional
+import time
+import weakref
+from typing import Callable, List, Dict, Optional, Tuple
 from ..config import settings
+from .rate_limiter import RequestRateLimiter, backoff_delay, retry_after_seconds
+from .response_cache import LLMResponseCache, llm_cache
+from .embedding_cache import EmbeddingCache, embedding_cache
+from .embedding_batcher import EmbeddingBatcher
+from .model_router import ModelRouter, model_router
 
 logger = logging.getLogger(__name__)
 
-class OpenAIService:
-    """OpenAI API service wrapper with rate limiting and error handling"""
+# Errors worth another attempt; anything else (bad request, auth) fails immediately
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+class _LoopThread:
+    """Event loop on a daemon thread that runs async requests for sync callers"""
+
     def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def run(self, coro):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="openai-loop", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+# Shared by every service instance: the limits apply to the API key, not to one pipeline
+openai_limiter = RequestRateLimiter(
+    requests_per_minute=settings.OPENAI_RPM_LIMIT,
+    tokens_per_minute=settings.OPENAI_TPM_LIMIT,
+)
+_loop_thread = _LoopThread()
+
+class OpenAIService:
+    """OpenAI API service wrapper with rate limiting and error handling
+
+    Chat requests go through an async client so many can be in flight under
+    the shared requests/tokens-per-minute limiter. _make_request_async is for
+    async code; _make_request is a blocking facade that runs the same
+    coroutine on a background event loop.
+    """
+    def __init__(self, limiter: RequestRateLimiter = None,
+                 async_client_factory: Callable[[], openai.AsyncOpenAI] = None, cache: LLMResponseCache = None,
+                 vector_cache: EmbeddingCache = None, router: ModelRouter = None):
         self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-        self.rate_limit_delay = 1
+        self.limiter = limiter or openai_limiter
+        self.cache = cache or llm_cache
+        self.vector_cache = vector_cache or embedding_cache
+        self.router = router or model_router
+        self.rate_limit_delay = settings.OPENAI_RATE_LIMIT_DELAY
+        self.max_retries = settings.OPENAI_MAX_RETRIES
+        self.embedding_batcher = EmbeddingBatcher(
+            max_tokens=settings.EMBEDDING_BATCH_MAX_TOKENS,
+            max_items=settings.EMBEDDING_BATCH_MAX_ITEMS,
+            concurrency=settings.EMBEDDING_BATCH_CONCURRENCY,
+            max_retries=self.max_retries,
+            retry_delay=self.rate_limit_delay,
+            retryable=RETRYABLE_ERRORS,
+        )
+        self._async_client_factory = async_client_factory or (
+            # Retries are handled here, with the shared limiter, instead of inside the SDK
+            lambda: openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
+        )
+        # httpx connection pools belong to one event loop, so each loop gets its own client
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._encoding = None
+
+    @property
+    def encoding(self):
+        # Loaded on first use: tiktoken may download the encoding file
+        if self._encoding is None:
+            self._encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        return self._encoding
 
     def _count_tokens(self, text: str) -> int:
         """Count the number of tokens in the text using tiktoken"""
         return len(self.encoding.encode(text))
-    
-    def _handle_rate_limit(self, retry_after: int = None) -> None:
-        """Handle rate limit errors by waiting and retrying"""
-        delay = retry_after or self.rate_limit_delay
-        logger.warning(f"[OpenAI] Rate limited. Waiting {delay} seconds...")
-        time.sleep(delay)
-
-    def _make_request(self, messages: List[Dict], max_retries: int = 3) -> Optional[str]:
-        logger.info(f"[OpenAI] Making API call with {len(messages)} messages")
+
+    def _estimate_tokens(self, messages: List[Dict]) -> int:
+        """Prompt tokens plus the completion budget, as counted against tokens-per-minute"""
+        prompt = sum(self._token_estimate(message.get("content") or "") + 4 for message in messages)
+        return prompt + settings.OPENAI_MAX_TOKENS
+
+    def _token_estimate(self, text: str) -> int:
+        """tiktoken count, or a length-based estimate when the encoding cannot be loaded"""
+        try:
+            return self._count_tokens(text)
+        except Exception as e:
+            logger.debug(f"[OpenAI] Token count unavailable, estimating from length: {e}")
+            return len(text) // 4
+
+    def _make_request(self, messages: List[Dict], max_retries: int = None, response_format: Optional[Dict] = None,
+                      bypass_cache: bool = False, task: str = None) -> Optional[str]:
+        """Blocking chat request for sync callers; do not call from a running event loop"""
+        return _loop_thread.run(self._make_request_async(messages, max_retries, response_format, bypass_cache, task))
+
+    async def _make_request_async(self, messages: List[Dict], max_retries: int = None,
+                                  response_format: Optional[Dict] = None, bypass_cache: bool = False,
+                                  task: str = None) -> Optional[str]:
+        """Chat request that waits for rate-limit budget and backs off without blocking the loop
+        
+        The router picks the models for the task, cheapest first; a reply that
+        fails the task's validation is asked again of the next tier. Replies
+        are served from the response cache when possible. bypass_cache (or
+        LLM_CACHE_BYPASS) skips the lookup but still stores the fresh reply.
+        """
+        models = self.router.models_for(task)
+        started = time.perf_counter()
+        tokens = 0
+        content, valid = None, False
+        for step, model in enumerate(models):
+            last = step == len(models) - 1
+            try:
+                content, used = await self._request_model(messages, model, max_retries, response_format, bypass_cache)
+            except openai.APIError as e:
+                if last:
+                    self.router.record(task, model, step, False, time.perf_counter() - started, tokens)
+                    raise
+                logger.warning(f"[OpenAI] {task or 'general'} request to {model} failed, escalating: {e}")
+                continue
+            tokens += used
+            valid = self.router.validate(task, content)
+            if valid or last:
+                self.router.record(task, model, step, valid, time.perf_counter() - started, tokens)
+                return content
+            logger.info(f"[OpenAI] {task} reply from {model} failed validation, escalating to {models[step + 1]}")
+        return content
+
+    async def _request_model(self, messages: List[Dict], model: str, max_retries: int = None,
+                             response_format: Optional[Dict] = None, bypass_cache: bool = False) -> Tuple[Optional[str], int]:
+        """One model's reply, from the cache or the API with retries; returns it with the tokens it cost"""
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(model, settings.OPENAI_TEMPERATURE,
+                                       settings.OPENAI_MAX_TOKENS, messages, response_format)
+            if not (bypass_cache or settings.LLM_CACHE_BYPASS):
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info("[OpenAI] Served reply from cache")
+                    return cached, 0
+        
+        max_retries = max_retries or self.max_retries
+        # JSON mode is only sent when asked for, so older models keep working
+        extra = {"response_format": response_format} if response_format else {}
+        estimated = self._estimate_tokens(messages)
+        logger.info(f"[OpenAI] Making {model} call with {len(messages)} messages (~{estimated} tokens)")
         for attempt in range(max_retries):
+            await self.limiter.acquire_async(estimated)
             try:
-                response = self.client.chat.completions.create(
-                    model=settings.OPENAI_MODEL,
+                response = await self._async_client().chat.completions.create(
+                    model=model,
                     messages=messages,
                     max_tokens=settings.OPENAI_MAX_TOKENS,
                     temperature=settings.OPENAI_TEMPERATURE,
+                    **extra,
                 )
+                usage = getattr(response, "usage", None)
+                tokens = usage.total_tokens if usage is not None and usage.total_tokens else 0
+                if tokens:
+                    self.limiter.settle(estimated, tokens)
                 logger.info("[OpenAI] API call successful")
-                return response.choices[0].message.content
-            except openai.RateLimitError as e:
-                self._handle_rate_limit()
+                content = response.choices[0].message.content
+                if cache_key and content:
+                    self.cache.put(cache_key, model, content, tokens or estimated)
+                return content, tokens or estimated
+            except RETRYABLE_ERRORS as e:
                 if attempt == max_retries - 1:
-                    logger.error(f"[OpenAI] Rate limit exceeded after {max_retries} attempts")
+                    logger.error(f"[OpenAI] Giving up after {max_retries} attempts: {e}")
                     raise
+                retry_after = retry_after_seconds(e)
+                delay = backoff_delay(attempt, base=self.rate_limit_delay, retry_after=retry_after)
+                kind = "Rate limited" if isinstance(e, openai.RateLimitError) else "Transient error"
+                logger.warning(f"[OpenAI] {kind}, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
             except openai.APIError as e:
                 logger.error(f"[OpenAI] API error: {e}")
-                if attempt == max_retries - 1:
-                    raise
-            except Exception as e:
-                logger.error(f"[OpenAI] Unexpected error: {e}")
-                if attempt == max_retries - 1:
-                    raise
+                raise
 
-            time.sleep(2 ** attempt)
-        
-        return None
-    
-    def _create_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Create embeddings for a list of texts using OpenAI"""
+        return None, 0
+
+    def _async_client(self) -> openai.AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = self._async_clients[loop] = self._async_client_factory()
+        return client
+
+    def _create_embeddings(self, texts: List[str], model: str = None) -> List[List[float]]:
+        """Blocking embedding request for sync callers; returns [] if any text could not be embedded"""
         try:
-            response = self.client.embeddings.create(
-                model=settings.OPENAI_EMBEDDING_MODEL,
-                input=texts
-            )
-            return [embedding.embedding for embedding in response.data]
+            return _loop_thread.run(self._create_embeddings_async(texts, model))
         except Exception as e:
             logger.error(f"[OpenAI] Error creating embeddings: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    async def _create_embeddings_async(self, texts: List[str], model: str = None) -> List[List[float]]:
+        """Create embeddings for a list of texts using OpenAI
+        
+        model defaults to OPENAI_EMBEDDING_MODEL. Texts already in the
+        embedding cache for that model skip the API. The remaining distinct
+        texts are split into token-budgeted sub-batches that are sent
+        concurrently under the shared limiter; failed sub-batches are retried
+        on their own. Raises if a sub-batch still fails.
+        """
+        model = model or settings.OPENAI_EMBEDDING_MODEL
+        vectors = self.vector_cache.get_many(model, texts) if self.vector_cache else [None] * len(texts)
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+        if not missing:
+            logger.info(f"[OpenAI] All {len(texts)} embeddings served from cache")
+            return vectors
+        
+        tokens = {text: self._token_estimate(text) for text in missing}
+        created = await self.embedding_batcher.run(
+            missing, tokens.__getitem__, lambda batch, batch_tokens: self._embed_batch(batch, batch_tokens, model)
+        )
+        if self.vector_cache:
+            self.vector_cache.put_many(model, missing, created, [tokens[text] for text in missing])
+        by_text = dict(zip(missing, created))
+        if len(missing) < len(texts):
+            logger.info(f"[OpenAI] Embedded {len(missing)} new texts, {len(texts) - len(missing)} from cache")
+        return [vector if vector is not None else by_text[text] for text, vector in zip(texts, vectors)]
+
+    async def _embed_batch(self, texts: List[str], tokens: int, model: str = None) -> List[List[float]]:
+        """One embeddings request, ordered by the index the API reports for each input"""
+        await self.limiter.acquire_async(tokens)
+        response = await self._async_client().embeddings.create(
+            model=model or settings.OPENAI_EMBEDDING_MODEL,
+            input=texts
+        )
+        data = sorted(response.data, key=lambda item: item.index)
+        return [item.embedding for item in data]
@@ -0,0 +1,100 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Optional
+import asyncio
+import random
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class RequestRateLimiter:
+    """Requests-per-minute and tokens-per-minute budget shared by every OpenAI call
+
+    Both limits are token buckets refilled continuously. A request reserves one
+    request and its estimated tokens up front; once the reply reports real
+    usage, settle() returns the difference to the bucket. State is guarded by
+    a thread lock, so sync callers and any number of event loops can share one
+    limiter.
+    """
+
+    def __init__(self, requests_per_minute: float = 500, tokens_per_minute: float = 200_000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated_at = clock()
+
+    def reserve(self, tokens: int) -> float:
+        """Take budget for one request if available; returns 0 on success or seconds to wait"""
+        # A single request larger than the whole budget would never fit; let it through once the bucket is full
+        tokens = min(tokens, self.tokens_per_minute)
+        with self._lock:
+            self._refill()
+            if self._requests >= 1 and self._tokens >= tokens:
+                self._requests -= 1
+                self._tokens -= tokens
+                return 0.0
+            request_wait = max(0.0, 1 - self._requests) * 60 / self.requests_per_minute
+            token_wait = max(0.0, tokens - self._tokens) * 60 / self.tokens_per_minute
+            return max(request_wait, token_wait)
+
+    def settle(self, estimated: int, actual: int):
+        """Correct the token bucket once a reply reports how many tokens it really used"""
+        with self._lock:
+            self._tokens = min(self.tokens_per_minute, self._tokens + estimated - actual)
+
+    def acquire(self, tokens: int, sleep: Callable[[float], None] = time.sleep):
+        """Block until the request fits the budget"""
+        while True:
+            wait = self.reserve(tokens)
+            if wait <= 0:
+                return
+            sleep(wait)
+
+    async def acquire_async(self, tokens: int):
+        """Wait without blocking the event loop until the request fits the budget"""
+        while True:
+            wait = self.reserve(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def _refill(self):
+        now = self.clock()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Delay the server asked for in Retry-After (or retry-after-ms), if any"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            # HTTP-date form
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0, retry_after: Optional[float] = None) -> float:
+    """Seconds to wait before the next attempt
+
+    Honors the server's Retry-After plus a little jitter so waiting clients do
+    not all retry at the same instant; otherwise full-jitter exponential backoff.
+    """
+    if retry_after is not None:
+        return retry_after + random.uniform(0, min(1.0, retry_after * 0.1 + 0.1))
+    return random.uniform(0, min(cap, base * 2 ** attempt))
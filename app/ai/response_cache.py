@@ -0,0 +1,132 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+class LLMResponseCache:
+    """SQLite cache of chat completion replies, keyed by a fingerprint of the request
+
+    The key hashes everything that determines a reply: model, temperature,
+    max_tokens, response format and the exact messages. Entries expire after
+    ttl seconds and the least recently used ones are evicted once the stored
+    replies exceed max_bytes.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, max_bytes: int = 200 * 1024 * 1024):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+        self.tokens_saved = 0
+
+    @staticmethod
+    def key(model: str, temperature: float, max_tokens: int, messages: List[Dict[str, Any]],
+            response_format: Optional[Dict] = None) -> str:
+        """Stable fingerprint of a chat request"""
+        payload = json.dumps(
+            {"model": model, "temperature": temperature, "max_tokens": max_tokens,
+             "response_format": response_format, "messages": messages},
+            sort_keys=True, ensure_ascii=False, separators=(',', ':'),
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached reply for a request key, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT response, tokens, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[2] >= self.ttl:
+                if row is not None:
+                    db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    db.commit()
+                self.misses += 1
+                return None
+            db.execute("UPDATE responses SET accessed_at = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            db.commit()
+            self.hits += 1
+            self.tokens_saved += row[1]
+            return row[0]
+
+    def put(self, key: str, model: str, response: str, tokens: int = 0):
+        """Store a reply; tokens is what the request cost, counted as saved on later hits"""
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            self._db().execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, tokens, created_at, accessed_at, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, model, response, size, tokens, now, now)
+            )
+            self._db().commit()
+        self.evict()
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until the cache fits in max_bytes"""
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM responses WHERE created_at <= ?", (time.time() - self.ttl,))
+            total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                evicted = 0
+                for key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC").fetchall():
+                    db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    total -= size
+                    evicted += 1
+                    if total <= self.max_bytes:
+                        break
+                logger.info(f"🧹 Evicted {evicted} cached LLM responses")
+            db.commit()
+
+    def clear(self):
+        """Remove every cached reply"""
+        with self._lock:
+            self._db().execute("DELETE FROM responses")
+            self._db().commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            entries, total = self._db().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+        }
+
+    def _db(self) -> sqlite3.Connection:
+        """Open the database lazily so importing the module does not touch disk"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, size INTEGER NOT NULL, "
+                "tokens INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL, "
+                "hits INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_responses_accessed ON responses (accessed_at)")
+            self._conn.commit()
+        return self._conn
+
+# Global LLM response cache shared by every OpenAIService (None when disabled)
+llm_cache = LLMResponseCache(
+    settings.LLM_CACHE_PATH,
+    ttl=settings.LLM_CACHE_TTL,
+    max_bytes=int(settings.LLM_CACHE_MAX_MB * 1024 * 1024),
+) if settings.LLM_CACHE_ENABLED else None
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 from .agents import router as agents_router
+from .ai import router as ai_router
 from .articles import router as articles_router
 from .common import router as common_router
+from .scrapers import router as scrapers_router
 
 # Create main API router with version info
 router = APIRouter(tags=["API v1"])
@@ -9,3 +11,5 @@ router = APIRouter(tags=["API v1"])
 router.include_router(common_router)
 router.include_router(agents_router)
 router.include_router(articles_router)
+router.include_router(scrapers_router)
+router.include_router(ai_router)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel
 import logging
@@ -15,19 +16,20 @@ class AgentRequest(BaseModel):
 @router.post("/curate")
 async def curate_article(request: AgentRequest):
     """Curate an article using the Content Curation Agent"""
-    result = agent_manager.execute_agent("curation", request.model_dump())
+    # Agents call the LLM synchronously, so they run off the event loop
+    result = await run_in_threadpool(agent_manager.execute_agent, "curation", request.model_dump())
     return result
 
 @router.post("/summarize")
 async def summarize_article(request: AgentRequest):
     """Summarize an article using the Summarization Agent"""
-    result = agent_manager.execute_agent("summarization", request.model_dump())
+    result = await run_in_threadpool(agent_manager.execute_agent, "summarization", request.model_dump())
     return result
 
 @router.post("/pipeline")
 async def run_agent_pipeline(request: AgentRequest):
     """Run a complete agent pipeline on an article"""
-    result = agent_manager.execute_pipeline(request.article_data, request.pipeline)
+    result = await run_in_threadpool(agent_manager.execute_pipeline, request.article_data, request.pipeline)
     return result
 
 @router.get("/stats")
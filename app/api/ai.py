@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from app.ai.embedding_cache import embedding_cache
+from app.ai.model_router import model_router
+from app.ai.response_cache import llm_cache
+from app.processors.local_classifiers import local_classifier
+
+router = APIRouter(prefix="/ai", tags=["AI"])
+
+@router.get("/stats")
+async def get_ai_stats():
+    """Cache effectiveness, LLM calls answered locally and per-task model routing metrics"""
+    return {
+        "routing": model_router.stats(),
+        "llm_cache": llm_cache.stats() if llm_cache else None,
+        "embedding_cache": embedding_cache.stats() if embedding_cache else None,
+        "local_classifier": local_classifier.stats() if local_classifier else None
+    }
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import StreamingResponse
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Union
 from pydantic import BaseModel, validator
+import json
 import logging
 from app.scrapers import UnifiedScraper
 from app.processors import ContentProcessingPipeline
-from app.ai.embedding_service import EmbeddingService
+from app.processors.jobs import job_runner
+from app.config import settings
+from app.ai.embedding_service import EmbeddingService, get_embedding_service
 
 router = APIRouter(prefix="/articles", tags=["Articles"])
 logger = logging.getLogger(__name__)
@@ -44,6 +49,8 @@ class ProcessedArticleResponse(BaseModel):
     analysis: Dict[str, Any]
     processing_status: str
     processed_at: str
+    duplicate_of: Optional[str] = None
+    story_id: Optional[str] = None
 
 @router.post("/process", response_model=List[ProcessedArticleResponse])
 async def process_articles(request: URLRequest):
@@ -61,42 +68,28 @@ async def process_articles(request: URLRequest):
             if not url:
                 logger.warning("Skipping article with no URL")
                 continue
+            
+            # The dedup check may hit the database or warm the Bloom filter, so it blocks too
+            if await run_in_threadpool(scraper.is_duplicate, url):
+                logger.info(f"Skipping already processed article: {url}")
+                continue
                 
             try:
-                scraped_article = scraper.scrape_article(url, platform)
+                # Scraping and the OpenAI calls block, so they run off the event loop
+                scraped_article = await run_in_threadpool(scraper.scrape_article_politely, url, platform)
                 if scraped_article.status != "success":
                     logger.error(f"Failed to scrape article: {url}")
                     continue
                     
-                processed_article = pipeline.process_article(scraped_article)
+                processed_article = await run_in_threadpool(pipeline.process_article, scraped_article)
                 
                 # Summarization/curation can be handled via agents API
-                final_article = ProcessedArticleResponse(
-                    original_url=processed_article.original_article_link,
-                    platform=platform,
-                    title=processed_article.title,
-                    summary=processed_article.analysis.ai_summary or "Summary not available",
-                    analysis=processed_article.analysis.model_dump(),
-                    processing_status=processed_article.processing_status,
-                    processed_at=processed_article.processed_at.isoformat()
-                )
-                processed_articles.append(final_article)
+                processed_articles.append(_article_response(processed_article, platform))
                 logger.info(f"Successfully processed article: {processed_article.title}")
                 
             except Exception as e:
                 logger.error(f"Error processing article {url}: {e}")
-                error_article = ProcessedArticleResponse(
-                    original_url=url,
-                    platform=platform,
-                    title="Error processing article",
-                    summary="Failed to process article",
-                    analysis={
-                        "error": "processing failed"
-                    },
-                    processing_status="failed",
-                    processed_at=datetime.now().isoformat()
-                )
-                processed_articles.append(error_article)
+                processed_articles.append(_failed_response(url, platform))
                 
         logger.info(f"Completed processing {len(processed_articles)} articles")
         return processed_articles
@@ -105,10 +98,125 @@ async def process_articles(request: URLRequest):
         logger.error(f"Error in process_articles endpoint: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@router.post("/process/stream")
+async def process_articles_stream(request: URLRequest, format: Optional[str] = Query(None, pattern="^(ndjson|sse)$"),
+                                  accept: Optional[str] = Header(None)):
+    """Stream each processed article as soon as it finishes, with progress events
+    
+    Sends NDJSON by default, or server-sent events for format=sse or an
+    Accept: text/event-stream header.
+    """
+    use_sse = format == "sse" or (format is None and "text/event-stream" in (accept or ""))
+    # Each step of the generator (dedup checks, scraping, OpenAI calls) blocks, so it runs off the event loop
+    events = iterate_in_threadpool(_processing_events(request.urls))
+    if use_sse:
+        body = (f"event: {event['event']}\ndata: {json.dumps(event)}\n\n" async for event in events)
+        return StreamingResponse(body, media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+    return StreamingResponse((json.dumps(event) + "\n" async for event in events), media_type="application/x-ndjson")
+
+def _processing_events(urls: List[Dict[str, str]]) -> Iterator[Dict[str, Any]]:
+    """Scrape concurrently and process each article as it arrives
+    
+    Only the scraper's bounded in-flight window is held in memory; every
+    result is yielded and dropped, so memory does not grow with the batch.
+    """
+    urls = [url_info for url_info in urls if url_info["url"]]
+    total = len(urls)
+    counts = {"processed": 0, "failed": 0, "skipped": 0}
+    yield {"event": "start", "total": total}
+    
+    scraper = UnifiedScraper()
+    pipeline = ContentProcessingPipeline()
+    for completed, (index, scraped_article) in enumerate(scraper.iter_scrape_articles(urls), start=1):
+        url, platform = scraped_article.url, urls[index]["platform"]
+        progress = {"event": "progress", "index": index, "url": url, "completed": completed, "total": total}
+        
+        if scraped_article.status == "duplicate":
+            counts["skipped"] += 1
+            yield {**progress, "status": "skipped"}
+            continue
+        if scraped_article.status != "success":
+            counts["failed"] += 1
+            yield {**progress, "status": "scrape_failed", "detail": scraped_article.status}
+            continue
+        yield {**progress, "status": "scraped"}
+        
+        try:
+            processed_article = pipeline.process_article(scraped_article)
+            response = _article_response(processed_article, platform)
+            counts["processed"] += 1
+        except Exception as e:
+            logger.error(f"Error processing article {url}: {e}")
+            response = _failed_response(url, platform)
+            counts["failed"] += 1
+        yield {"event": "article", "index": index, "data": response.model_dump()}
+    
+    yield {"event": "done", "total": total, **counts}
+
+def _article_response(processed_article, platform: str) -> ProcessedArticleResponse:
+    return ProcessedArticleResponse(
+        original_url=processed_article.original_article_link,
+        platform=platform,
+        title=processed_article.title,
+        summary=processed_article.analysis.ai_summary or "Summary not available",
+        analysis=processed_article.analysis.model_dump(),
+        processing_status=processed_article.processing_status,
+        processed_at=processed_article.processed_at.isoformat(),
+        duplicate_of=processed_article.duplicate_of,
+        story_id=processed_article.story_id
+    )
+
+def _failed_response(url: str, platform: str) -> ProcessedArticleResponse:
+    return ProcessedArticleResponse(
+        original_url=url,
+        platform=platform,
+        title="Error processing article",
+        summary="Failed to process article",
+        analysis={
+            "error": "processing failed"
+        },
+        processing_status="failed",
+        processed_at=datetime.now().isoformat()
+    )
+
+@router.post("/jobs", status_code=202)
+async def create_processing_job(request: URLRequest, background_tasks: BackgroundTasks):
+    """Queue URLs as a resumable job that is processed in the background"""
+    urls = [url_info for url_info in request.urls if url_info["url"]]
+    if not urls:
+        raise HTTPException(status_code=400, detail="No URLs to process")
+    
+    job_id = job_runner.create_job(urls)
+    background_tasks.add_task(job_runner.run_job, job_id, settings.JOB_WORKERS)
+    return job_runner.job_status(job_id)
+
+@router.get("/jobs/{job_id}")
+async def get_processing_job(job_id: str):
+    """Get a job's progress, with the last completed stage of every URL"""
+    return _job_or_404(job_id)
+
+@router.post("/jobs/{job_id}/resume", status_code=202)
+async def resume_processing_job(job_id: str, background_tasks: BackgroundTasks):
+    """Continue a job's unfinished items from their last completed stage"""
+    status = _job_or_404(job_id)
+    if status["status"] not in ("completed", "completed_with_errors"):
+        background_tasks.add_task(job_runner.run_job, job_id, settings.JOB_WORKERS)
+    return status
+
+def _job_or_404(job_id: str) -> Dict[str, Any]:
+    try:
+        status = job_runner.job_status(job_id)
+    except ValueError:
+        status = None
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Processing job {job_id} not found")
+    return status
+
 @router.get("/search")
-async def search_articles(query: str, limit: int = 5):
-    embedding_service = EmbeddingService()
-    results = embedding_service.similarity_search(query, limit)
+async def search_articles(query: str, limit: int = 5,
+                          embedding_service: EmbeddingService = Depends(get_embedding_service)):
+    # A sync dependency runs in the threadpool, so opening the service never blocks the event loop
+    results = await run_in_threadpool(embedding_service.similarity_search, query, limit)
     return {
         "query": query,
         "results": results,
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException
+from app.scrapers.driver_pool import driver_pool
+from app.scrapers.rate_control import rate_controller
+
+router = APIRouter(prefix="/scrapers", tags=["Scrapers"])
+
+@router.get("/domains")
+async def get_domain_rate_control():
+    """Per-domain request rate, circuit breaker state and error figures"""
+    domains = rate_controller.snapshot()
+    return {
+        "domains": domains,
+        "throttled": sorted(domain for domain, state in domains.items() if state["throttled"]),
+        "driver_pool": driver_pool.stats()
+    }
+
+@router.post("/domains/{domain}/reset")
+async def reset_domain_rate_control(domain: str):
+    """Close a domain's circuit breaker and restore its initial rate"""
+    if not rate_controller.reset(domain):
+        raise HTTPException(status_code=404, detail=f"No rate control state for {domain}")
+    return {"domain": domain, "state": rate_controller.snapshot()[domain]}
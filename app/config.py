@@ -14,13 +14,52 @@ class Settings:
     # OpenAI Configuration
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+    # Model cascade, cheapest first: a task starts at its tier and escalates when its reply fails validation
+    OPENAI_MODEL_TIERS: str = os.getenv("OPENAI_MODEL_TIERS", OPENAI_MODEL)
+    # Starting tier per task, e.g. "summary:1,analysis:0" (tasks not listed start at tier 0)
+    OPENAI_TASK_TIERS: str = os.getenv("OPENAI_TASK_TIERS", "")
     OPENAI_EMBEDDING_MODEL: str = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
     OPENAI_MAX_TOKENS: int = int(os.getenv("OPENAI_MAX_TOKENS", "1000"))
     OPENAI_TEMPERATURE: float = float(os.getenv("OPENAI_TEMPERATURE", "0.3"))
+    # "structured" asks for every analysis field in one JSON request; "per_field" makes one request per field
+    ANALYZER_MODE: str = os.getenv("ANALYZER_MODE", "structured")
+    # Characters of article text sent with the structured request (~1500 tokens; per-field prompts send 500-1000)
+    ANALYZER_MAX_CONTENT_CHARS: int = int(os.getenv("ANALYZER_MAX_CONTENT_CHARS", "6000"))
+    # Local classifiers answer language, sentiment and quality when at least this confident
+    LOCAL_CLASSIFIER_ENABLED: bool = os.getenv("LOCAL_CLASSIFIER_ENABLED", "True").lower() == "true"
+    LOCAL_LANGUAGE_MIN_CONFIDENCE: float = float(os.getenv("LOCAL_LANGUAGE_MIN_CONFIDENCE", "0.9"))
+    LOCAL_SENTIMENT_MIN_CONFIDENCE: float = float(os.getenv("LOCAL_SENTIMENT_MIN_CONFIDENCE", "0.7"))
+    LOCAL_QUALITY_MIN_CONFIDENCE: float = float(os.getenv("LOCAL_QUALITY_MIN_CONFIDENCE", "0.8"))
     
     # Rate Limiting
     OPENAI_RATE_LIMIT_DELAY: float = float(os.getenv("OPENAI_RATE_LIMIT_DELAY", "1.0"))
     OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "3"))
+    # Account limits shared by all chat requests from this process
+    OPENAI_RPM_LIMIT: float = float(os.getenv("OPENAI_RPM_LIMIT", "500"))
+    OPENAI_TPM_LIMIT: float = float(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+    # Persistent cache of chat replies keyed by the full request
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true"
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "./llm_cache/responses.sqlite3")
+    LLM_CACHE_TTL: float = float(os.getenv("LLM_CACHE_TTL", "604800"))
+    LLM_CACHE_MAX_MB: float = float(os.getenv("LLM_CACHE_MAX_MB", "200"))
+    LLM_CACHE_BYPASS: bool = os.getenv("LLM_CACHE_BYPASS", "False").lower() == "true"
+    # Embedding vectors cached by (model, text hash) as float32 blobs
+    EMBEDDING_CACHE_ENABLED: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "True").lower() == "true"
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", "./llm_cache/embeddings.sqlite3")
+    # Embedding requests are split into sub-batches sent concurrently
+    EMBEDDING_BATCH_MAX_TOKENS: int = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "100000"))
+    EMBEDDING_BATCH_MAX_ITEMS: int = int(os.getenv("EMBEDDING_BATCH_MAX_ITEMS", "512"))
+    EMBEDDING_BATCH_CONCURRENCY: int = int(os.getenv("EMBEDDING_BATCH_CONCURRENCY", "4"))
+    # Embedding backend for the vector store: openai or local (sentence-transformers on CPU)
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "openai")
+    EMBEDDING_LOCAL_MODEL: str = os.getenv("EMBEDDING_LOCAL_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    EMBEDDING_LOCAL_BATCH_SIZE: int = int(os.getenv("EMBEDDING_LOCAL_BATCH_SIZE", "32"))
+    EMBEDDING_LOCAL_DEVICE: str = os.getenv("EMBEDDING_LOCAL_DEVICE", "cpu")
+    # Offline backfills through the Batch API
+    BATCH_WORK_DIR: str = os.getenv("BATCH_WORK_DIR", "./batch_jobs")
+    BATCH_POLL_INTERVAL: float = float(os.getenv("BATCH_POLL_INTERVAL", "60"))
+    BATCH_COMPLETION_WINDOW: str = os.getenv("BATCH_COMPLETION_WINDOW", "24h")
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "50000"))
     
     # Application
     APP_ENV: str = os.getenv("APP_ENV", "development")
@@ -37,6 +76,55 @@ class Settings:
     # Story ingestion API key (required for POST /api/stories)
     SARANSH_INGEST_API_KEY: Optional[str] = os.getenv("SARANSH_INGEST_API_KEY")
 
+    # Scrapers
+    SCRAPER_DRIVER_POOL_SIZE: int = int(os.getenv("SCRAPER_DRIVER_POOL_SIZE", "2"))
+    SCRAPER_DRIVER_MAX_PAGES: int = int(os.getenv("SCRAPER_DRIVER_MAX_PAGES", "50"))
+    SCRAPER_DRIVER_MAX_MEMORY_MB: float = float(os.getenv("SCRAPER_DRIVER_MAX_MEMORY_MB", "512"))
+    SCRAPER_DRIVER_CHECKOUT_TIMEOUT: float = float(os.getenv("SCRAPER_DRIVER_CHECKOUT_TIMEOUT", "60"))
+    # Start the pool's Chrome drivers in the background at startup so the first scrapes skip browser launch
+    SCRAPER_DRIVER_WARM_ON_STARTUP: bool = os.getenv("SCRAPER_DRIVER_WARM_ON_STARTUP", "True").lower() == "true"
+    SCRAPER_MAX_CONCURRENCY: int = int(os.getenv("SCRAPER_MAX_CONCURRENCY", "4"))
+    SCRAPER_PER_DOMAIN_CONCURRENCY: int = int(os.getenv("SCRAPER_PER_DOMAIN_CONCURRENCY", "2"))
+    SCRAPER_DOMAIN_MIN_INTERVAL: float = float(os.getenv("SCRAPER_DOMAIN_MIN_INTERVAL", "0.5"))
+    # Adaptive per-domain rate (requests/s) and circuit breaker
+    SCRAPER_RATE_INITIAL: float = float(os.getenv("SCRAPER_RATE_INITIAL", "1.0"))
+    SCRAPER_RATE_MIN: float = float(os.getenv("SCRAPER_RATE_MIN", "0.1"))
+    SCRAPER_RATE_MAX: float = float(os.getenv("SCRAPER_RATE_MAX", "4.0"))
+    SCRAPER_TARGET_LATENCY: float = float(os.getenv("SCRAPER_TARGET_LATENCY", "8.0"))
+    SCRAPER_BREAKER_FAILURES: int = int(os.getenv("SCRAPER_BREAKER_FAILURES", "5"))
+    SCRAPER_BREAKER_COOLDOWN: float = float(os.getenv("SCRAPER_BREAKER_COOLDOWN", "60"))
+    SCRAPER_HTTP_TIMEOUT: float = float(os.getenv("SCRAPER_HTTP_TIMEOUT", "10"))
+    SCRAPER_HTTP_POOL_SIZE: int = int(os.getenv("SCRAPER_HTTP_POOL_SIZE", "10"))
+    # Block images, fonts, media and ad/analytics requests in Chrome
+    SCRAPER_BLOCK_RESOURCES: bool = os.getenv("SCRAPER_BLOCK_RESOURCES", "True").lower() == "true"
+    # BeautifulSoup backend for article HTML: lxml, html5lib or html.parser
+    SCRAPER_HTML_PARSER: str = os.getenv("SCRAPER_HTML_PARSER", "lxml")
+    # Raw HTML cache for re-runs and offline re-extraction
+    SCRAPER_CACHE_ENABLED: bool = os.getenv("SCRAPER_CACHE_ENABLED", "True").lower() == "true"
+    SCRAPER_CACHE_DIR: str = os.getenv("SCRAPER_CACHE_DIR", "./scrape_cache")
+    SCRAPER_CACHE_TTL: float = float(os.getenv("SCRAPER_CACHE_TTL", "3600"))
+    SCRAPER_CACHE_MAX_MB: float = float(os.getenv("SCRAPER_CACHE_MAX_MB", "500"))
+    # Seen-URL index used to skip articles that were already processed
+    SEEN_URL_BLOOM_CAPACITY: int = int(os.getenv("SEEN_URL_BLOOM_CAPACITY", "1000000"))
+    SEEN_URL_BLOOM_ERROR_RATE: float = float(os.getenv("SEEN_URL_BLOOM_ERROR_RATE", "0.001"))
+    # Near-duplicate detection: SimHash bits that may differ, and the shortest text fingerprinted
+    NEAR_DUP_ENABLED: bool = os.getenv("NEAR_DUP_ENABLED", "True").lower() == "true"
+    NEAR_DUP_MAX_DISTANCE: int = int(os.getenv("NEAR_DUP_MAX_DISTANCE", "5"))
+    NEAR_DUP_MIN_WORDS: int = int(os.getenv("NEAR_DUP_MIN_WORDS", "50"))
+    # Checkpointed processing jobs
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_ITEM_MAX_ATTEMPTS: int = int(os.getenv("JOB_ITEM_MAX_ATTEMPTS", "3"))
+    JOB_ITEM_LEASE_SECONDS: float = float(os.getenv("JOB_ITEM_LEASE_SECONDS", "600"))
+    JOBS_RESUME_ON_STARTUP: bool = os.getenv("JOBS_RESUME_ON_STARTUP", "True").lower() == "true"
+    # Crawl frontier: hours for a story's freshness score to halve
+    FRONTIER_HALF_LIFE_HOURS: float = float(os.getenv("FRONTIER_HALF_LIFE_HOURS", "6"))
+    # Seconds before a failed URL is retried, doubling with each attempt
+    FRONTIER_RETRY_BACKOFF_SECONDS: float = float(os.getenv("FRONTIER_RETRY_BACKOFF_SECONDS", "300"))
+    # Fetch mode overrides keyed by ScraperFactory platform name, e.g. "ndtv:http,othersite:browser"
+    SCRAPER_FETCH_MODES: str = os.getenv("SCRAPER_FETCH_MODES", "")
+    # Browser tabs per Chrome process when scraping a batch from one host, e.g. "ndtv.com:4"
+    SCRAPER_TABS_PER_HOST: str = os.getenv("SCRAPER_TABS_PER_HOST", "")
+
     # ChromaDB
     CHROMA_DB_PATH: str = os.getenv("CHROMA_DB_PATH", "./chroma_db")
     CHROMA_COLLECTION_NAME: str = os.getenv("CHROMA_COLLECTION_NAME", "articles")
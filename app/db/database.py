@@ -1,7 +1,9 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
+# Models declare against Base without needing the engine; it is re-exported here for existing imports
+from app.db.base import Base  # noqa: F401
 
 
 engine = create_engine(
@@ -15,8 +17,6 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
-Base = declarative_base()
-
 
 def get_db():
     db = SessionLocal()
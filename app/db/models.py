@@ -1,9 +1,13 @@
 import uuid
 
 from sqlalchemy import (
+    BigInteger,
     Column,
     DateTime,
+    Float,
     ForeignKey,
+    Integer,
+    JSON,
     String,
     Text,
     UniqueConstraint,
@@ -12,7 +16,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db.database import Base
+from app.db.base import Base
 
 
 class Story(Base):
@@ -135,4 +139,316 @@ class Source(Base):
             "url",
             name="uq_story_source_url",
         ),
-    )
\ No newline at end of file
+    )
+
+class SeenURL(Base):
+    """Canonical URLs that have already been scraped and processed."""
+
+    __tablename__ = "seen_urls"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    canonical_url = Column(
+        Text,
+        nullable=False,
+        unique=True,
+    )
+
+    # The URL as first seen, before canonicalization
+    url = Column(
+        Text,
+        nullable=False,
+    )
+
+    first_seen_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+class ContentFingerprint(Base):
+    """SimHash of a processed article's content, used to spot republished copies."""
+
+    __tablename__ = "content_fingerprints"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    canonical_url = Column(
+        Text,
+        nullable=False,
+        unique=True,
+    )
+
+    url = Column(
+        Text,
+        nullable=False,
+    )
+
+    # 64-bit SimHash stored as a signed BIGINT
+    fingerprint = Column(
+        BigInteger,
+        nullable=False,
+    )
+
+    # Analysis produced for this article, reused for its near-duplicates
+    analysis = Column(
+        JSON,
+        nullable=True,
+    )
+
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+class FrontierURL(Base):
+    """A discovered article URL waiting in (or done with) the crawl frontier."""
+
+    __tablename__ = "crawl_frontier"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    canonical_url = Column(
+        Text,
+        nullable=False,
+        unique=True,
+    )
+
+    url = Column(
+        Text,
+        nullable=False,
+    )
+
+    platform = Column(
+        String(50),
+        nullable=False,
+    )
+
+    section = Column(
+        String(100),
+        nullable=True,
+    )
+
+    published_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    # Higher is crawled first; see CrawlFrontier.priority
+    priority = Column(
+        Float,
+        nullable=False,
+        index=True,
+    )
+
+    # pending, in_progress, done, failed
+    status = Column(
+        String(20),
+        nullable=False,
+        default="pending",
+        index=True,
+    )
+
+    attempts = Column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    last_error = Column(
+        Text,
+        nullable=True,
+    )
+
+    claimed_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    # A failed URL is not claimed again before this time
+    not_before = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    finished_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    discovered_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+
+class ProcessingJob(Base):
+    """A batch of article URLs submitted for scraping and processing."""
+
+    __tablename__ = "processing_jobs"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    # pending, running, completed, completed_with_errors
+    status = Column(
+        String(30),
+        nullable=False,
+        default="pending",
+        index=True,
+    )
+
+    total_items = Column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    finished_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    items = relationship(
+        "ProcessingJobItem",
+        back_populates="job",
+        cascade="all, delete-orphan",
+        order_by="ProcessingJobItem.position",
+    )
+
+
+class ProcessingJobItem(Base):
+    """One URL of a processing job, checkpointed after every pipeline stage."""
+
+    __tablename__ = "processing_job_items"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+    )
+
+    job_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("processing_jobs.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    position = Column(
+        Integer,
+        nullable=False,
+    )
+
+    url = Column(
+        Text,
+        nullable=False,
+    )
+
+    platform = Column(
+        String(50),
+        nullable=False,
+    )
+
+    # Last completed stage: pending, scraped, chunked, analyzed, embedded
+    stage = Column(
+        String(20),
+        nullable=False,
+        default="pending",
+    )
+
+    # pending, in_progress, done, duplicate, near_duplicate, failed
+    status = Column(
+        String(20),
+        nullable=False,
+        default="pending",
+        index=True,
+    )
+
+    # For near-duplicates, the URL of the article whose analysis was reused
+    duplicate_of = Column(
+        Text,
+        nullable=True,
+    )
+
+    attempts = Column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    last_error = Column(
+        Text,
+        nullable=True,
+    )
+
+    # Stage outputs, kept so a resumed item skips the stages it already finished
+    scraped = Column(
+        JSON,
+        nullable=True,
+    )
+
+    chunks = Column(
+        JSON,
+        nullable=True,
+    )
+
+    analysis = Column(
+        JSON,
+        nullable=True,
+    )
+
+    claimed_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    finished_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    job = relationship(
+        "ProcessingJob",
+        back_populates="items",
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "job_id",
+            "position",
+            name="uq_job_item_position",
+        ),
+    )
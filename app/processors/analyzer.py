@@ -1,12 +1,35 @@
 import re
-from typing import List, Dict, Any
-from .models import ContentAnalysis
+from typing import List, Dict, Any, Optional
+from pydantic import ValidationError
+from .models import AnalysisFields, ContentAnalysis
+from .local_classifiers import LocalClassifier, local_classifier
+from ..ai.model_router import parse_json_reply
 from ..ai.openai_service import OpenAIService
-import json
+from ..config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+ANALYZER_MODES = ("structured", "per_field")
+
+TOPICS = ["Politics", "Technology", "Business", "Sports", "Entertainment",
+          "Health", "Science", "Education", "Crime", "Environment"]
+
+STRUCTURED_PROMPT = """
+Analyze this news article and return one JSON object with exactly these keys:
+- "sentiment_score": float between -1 (very negative) and 1 (very positive)
+- "sentiment_label": "positive", "negative" or "neutral"
+- "sentiment_confidence": float between 0 and 1
+- "entities": array of named entities (people, organizations, locations)
+- "topics": array of the top 3 most relevant topics from this list: {topics}
+- "summary": summary of the key facts and main story in 60 words or less
+- "keywords": array of the 10 most important keywords
+- "language": language name of the article (e.g. "English", "Hindi")
+- "quality": number from 0 to 10 for factual accuracy, writing quality, relevance and completeness
+
+Article: {content}
+"""
+
 class ContentAnalyzer:
     """Analyzes content for various metrics"""
     
@@ -101,12 +124,101 @@ class ContentAnalyzer:
         return max(1, count)  # At least 1 syllable
 
 class AIContentAnalyzer:
-    """AI-powered content analysis using OpenAI"""
+    """AI-powered content analysis using OpenAI
+    
+    In "structured" mode every field comes from one JSON-mode request, and
+    only fields missing or invalid in the reply are fetched with the
+    per-field prompts. "per_field" mode keeps the original one request per
+    field, so the two can be compared.
+    """
     
-    def __init__(self):
+    def __init__(self, mode: str = None, local: LocalClassifier = None):
         self.openai_service = OpenAIService()
+        # Answers language, sentiment and quality locally when confident; None asks the LLM every time
+        self.local_classifier = local or local_classifier
+        self.mode = mode or settings.ANALYZER_MODE
+        if self.mode not in ANALYZER_MODES:
+            logger.warning(f"Unknown analyzer mode '{self.mode}', using 'structured'")
+            self.mode = "structured"
     
     def analyze(self, content: str) -> ContentAnalysis:
+        if self.mode == "structured":
+            return self._analyze_structured(content)
+        return self._analyze_per_field(content)
+    
+    def _analyze_structured(self, content: str) -> ContentAnalysis:
+        """Get every field from one request, falling back per field for gaps in the reply"""
+        logger.info("[Analyzer] Starting structured AI analysis")
+        return self._complete_analysis(content, self._request_structured(content))
+    
+    def analyze_reply(self, content: str, reply: Optional[str]) -> ContentAnalysis:
+        """Build the analysis from a structured reply obtained elsewhere, e.g. a batch result"""
+        return self._complete_analysis(content, _validated_fields(reply))
+    
+    def structured_messages(self, content: str) -> List[Dict[str, str]]:
+        """Messages of the single structured analysis request
+        
+        The article is cut to ANALYZER_MAX_CONTENT_CHARS characters: enough for
+        the summary, which needs more than the per-field prompts' first
+        1000, while keeping long articles from dominating the request cost.
+        """
+        content = content[:settings.ANALYZER_MAX_CONTENT_CHARS]
+        return [
+            {"role": "system", "content": "You are a news analysis expert. Return only valid JSON."},
+            {"role": "user", "content": STRUCTURED_PROMPT.format(topics=TOPICS, content=content)}
+        ]
+    
+    def _complete_analysis(self, content: str, fields: AnalysisFields) -> ContentAnalysis:
+        """Fill fields missing from the structured reply with per-field requests"""
+        missing = []
+        if fields.sentiment_score is None or fields.sentiment_label is None:
+            missing.append("sentiment")
+            sentiment = self._analyze_sentiment(content)
+            fields.sentiment_score = sentiment.get('score', 0.0)
+            fields.sentiment_label = sentiment.get('label', 'neutral')
+            fields.sentiment_confidence = sentiment.get('confidence', fields.sentiment_confidence)
+        fallbacks = {
+            'entities': self._extract_entities,
+            'topics': self._classify_topics,
+            'summary': self._generate_summary,
+            'keywords': self._extract_keywords,
+            'language': self._detect_language,
+            'quality': lambda text: self._assess_quality(text) * 10,
+        }
+        for field, fallback in fallbacks.items():
+            if getattr(fields, field) is None:
+                missing.append(field)
+                setattr(fields, field, fallback(content))
+        if missing:
+            logger.info(f"[Analyzer] Filled {len(missing)} fields with separate requests: {missing}")
+        
+        return ContentAnalysis(
+            word_count=len(content.split()),
+            sentence_count=len(content.split('.')),
+            readability_score=0.0,
+            sentiment_score=fields.sentiment_score,
+            entities=fields.entities,
+            key_topics=fields.topics,
+            language=fields.language,
+            content_type="news",
+            ai_summary=fields.summary,
+            keywords=fields.keywords,
+            quality_score=fields.quality / 10.0,
+            sentiment_label=fields.sentiment_label,
+            confidence_score=fields.sentiment_confidence or 0.0
+        )
+    
+    def _request_structured(self, content: str) -> AnalysisFields:
+        """Ask for all fields at once"""
+        try:
+            response = self.openai_service._make_request(self.structured_messages(content),
+                                                         response_format={"type": "json_object"}, task="analysis")
+        except Exception as e:
+            logger.error(f"[Analyzer] Structured request failed: {e}")
+            return AnalysisFields()
+        return _validated_fields(response)
+    
+    def _analyze_per_field(self, content: str) -> ContentAnalysis:
         logger.info("[Analyzer] Starting AI-powered analysis")
         word_count = len(content.split())
         sentence_count = len(content.split('.'))
@@ -140,7 +252,12 @@ class AIContentAnalyzer:
         )
     
     def _analyze_sentiment(self, content: str) -> Dict[str, Any]:
-        """Analyze sentiment using OpenAI"""
+        """Analyze sentiment locally if confident, otherwise using OpenAI"""
+        if self.local_classifier:
+            local = self.local_classifier.sentiment(content)
+            if local is not None:
+                return local
+        
         prompt = f"""
         Analyze the sentiment of this news article. Return a JSON response with:
         - "score": float between -1 (very negative) and 1 (very positive)
@@ -153,12 +270,10 @@ class AIContentAnalyzer:
         response = self.openai_service._make_request([
             {"role": "system", "content": "You are a sentiment analysis expert. Return only valid JSON."},
             {"role": "user", "content": prompt}
-        ])
+        ], task="sentiment")
         
-        try:
-            return json.loads(response)
-        except:
-            return {"score": 0.0, "label": "neutral", "confidence": 0.0}
+        sentiment = parse_json_reply(response)
+        return sentiment if isinstance(sentiment, dict) else {"score": 0.0, "label": "neutral", "confidence": 0.0}
     
     def _extract_entities(self, content: str) -> List[str]:
         """Extract named entities using OpenAI"""
@@ -172,21 +287,15 @@ class AIContentAnalyzer:
         response = self.openai_service._make_request([
             {"role": "system", "content": "You are an NER expert. Return only a JSON array of entity names."},
             {"role": "user", "content": prompt}
-        ])
+        ], task="entities")
         
-        try:
-            entities = json.loads(response)
-            return entities if isinstance(entities, list) else []
-        except:
-            return []
+        entities = parse_json_reply(response)
+        return entities if isinstance(entities, list) else []
     
     def _classify_topics(self, content: str) -> List[str]:
         """Classify content into topics using zero-shot learning"""
-        topics = ["Politics", "Technology", "Business", "Sports", "Entertainment", 
-                 "Health", "Science", "Education", "Crime", "Environment"]
-        
         prompt = f"""
-        Classify this news article into the most relevant topics from this list: {topics}
+        Classify this news article into the most relevant topics from this list: {TOPICS}
         Return a JSON array of the top 3 most relevant topics.
         
         Article: {content[:1000]}
@@ -195,13 +304,10 @@ class AIContentAnalyzer:
         response = self.openai_service._make_request([
             {"role": "system", "content": "You are a topic classification expert. Return only a JSON array."},
             {"role": "user", "content": prompt}
-        ])
+        ], task="topics")
         
-        try:
-            classified_topics = json.loads(response)
-            return classified_topics if isinstance(classified_topics, list) else []
-        except:
-            return []
+        classified_topics = parse_json_reply(response)
+        return classified_topics if isinstance(classified_topics, list) else []
     
     def _generate_summary(self, content: str) -> str:
         """Generate 60-word summary using OpenAI"""
@@ -215,7 +321,7 @@ class AIContentAnalyzer:
         response = self.openai_service._make_request([
             {"role": "system", "content": "You are a news summarization expert. Create concise, factual summaries."},
             {"role": "user", "content": prompt}
-        ])
+        ], task="summary")
         
         return response or "Summary not available"
     
@@ -231,16 +337,18 @@ class AIContentAnalyzer:
         response = self.openai_service._make_request([
             {"role": "system", "content": "You are a keyword extraction expert. Return only a JSON array."},
             {"role": "user", "content": prompt}
-        ])
+        ], task="keywords")
         
-        try:
-            keywords = json.loads(response)
-            return keywords if isinstance(keywords, list) else []
-        except:
-            return []
+        keywords = parse_json_reply(response)
+        return keywords if isinstance(keywords, list) else []
     
     def _detect_language(self, content: str) -> str:
-        """Detect language using OpenAI"""
+        """Detect language from the script locally if confident, otherwise using OpenAI"""
+        if self.local_classifier:
+            local = self.local_classifier.language(content)
+            if local is not None:
+                return local
+        
         prompt = f"""
         Detect the language of this text. Return only the language name (e.g., "English", "Hindi", "Spanish").
         
@@ -250,12 +358,17 @@ class AIContentAnalyzer:
         response = self.openai_service._make_request([
             {"role": "system", "content": "You are a language detection expert. Return only the language name."},
             {"role": "user", "content": prompt}
-        ])
+        ], task="language")
         
         return response or "English"
     
     def _assess_quality(self, content: str) -> float:
-        """Assess content quality using AI"""
+        """Assess content quality locally for clear cases, otherwise using AI"""
+        if self.local_classifier:
+            local = self.local_classifier.quality(content)
+            if local is not None:
+                return local
+        
         prompt = f"""
         Assess the quality of this news article on a scale of 0-10.
         Consider: factual accuracy, writing quality, relevance, completeness.
@@ -267,9 +380,31 @@ class AIContentAnalyzer:
         response = self.openai_service._make_request([
             {"role": "system", "content": "You are a content quality assessor. Return only a number."},
             {"role": "user", "content": prompt}
-        ])
+        ], task="quality")
         
         try:
             return float(response) / 10.0  # Normalize to 0-1
         except:
             return 0.5
+
+def _validated_fields(response: Optional[str]) -> AnalysisFields:
+    """Fields of a structured reply; each is validated on its own so one bad value keeps the rest"""
+    valid = {}
+    for key, value in _parse_json_object(response).items():
+        if key not in AnalysisFields.model_fields or value is None:
+            continue
+        try:
+            AnalysisFields.model_validate({key: value})
+            valid[key] = value
+        except ValidationError:
+            logger.debug(f"[Analyzer] Discarding invalid '{key}' in structured reply: {value!r}")
+    return AnalysisFields.model_validate(valid)
+
+def _parse_json_object(response: Optional[str]) -> Dict[str, Any]:
+    """Decode a JSON object reply, tolerating a markdown code fence around it"""
+    if not response:
+        return {}
+    data = parse_json_reply(response)
+    if data is None:
+        logger.warning("[Analyzer] Structured reply was not valid JSON")
+    return data if isinstance(data, dict) else {}
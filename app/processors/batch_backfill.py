@@ -0,0 +1,278 @@
+"""Process a backlog of scraped articles through the OpenAI Batch API.
+
+Usage:
+    python -m app.processors.batch_backfill ARTICLES.json [--name NAME] [--timeout SECONDS] [--output RESULTS.json]
+    python -m app.processors.batch_backfill --resume NAME [--timeout SECONDS] [--output RESULTS.json]
+
+ARTICLES.json holds ScrapedArticle records, either as a JSON array or one
+object per line. If the batches are still running when --timeout passes,
+nothing is written and the command exits with status 3; finish the backfill
+later with --resume NAME.
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import json
+import logging
+
+from pydantic import BaseModel
+
+from app.ai.batch_client import (
+    CHAT_ENDPOINT, EMBEDDINGS_ENDPOINT, TERMINAL_STATES, BatchAPIClient, batch_line, chat_content, embedding_vectors, write_jsonl,
+)
+from app.ai.model_router import model_router
+from app.config import settings
+from app.scrapers.models import ScrapedArticle
+from .models import ContentChunk, ProcessedArticle
+from .pipeline import ContentProcessingPipeline
+
+logger = logging.getLogger(__name__)
+
+class BackfillPending(Exception):
+    """Raised when a backfill's batches are still running after the wait timeout"""
+    
+    def __init__(self, name: str, states: Dict[str, str]):
+        running = sum(1 for state in states.values() if state not in TERMINAL_STATES)
+        super().__init__(f"Backfill {name} still running ({running} of {len(states)} batches), "
+                         f"finish it with --resume {name}")
+        self.name = name
+        self.states = states
+
+class BatchFile(BaseModel):
+    """One submitted request file and its batch"""
+    endpoint: str
+    path: str
+    batch_id: Optional[str] = None
+
+class BackfillManifest(BaseModel):
+    """Everything needed to merge a backfill's results, saved next to its request files"""
+    name: str
+    created_at: datetime
+    articles: List[ScrapedArticle]
+    chunks: List[List[ContentChunk]]
+    files: List[BatchFile] = []
+
+class BatchBackfill:
+    """Processes a backlog of scraped articles through the OpenAI Batch API
+    
+    Instead of interactive calls per article, the structured analysis request
+    (which includes the summary) and the chunk embeddings of every article are
+    written to Batch API JSONL files and submitted. Once the batches finish,
+    the replies are merged through the same pipeline steps as interactive
+    processing: ProcessedArticle results, Chroma vectors, seen URLs and
+    near-duplicate fingerprints.
+    
+    State lives in BATCH_WORK_DIR/<name>/manifest.json, so a backfill
+    interrupted while waiting can be resumed with resume(name).
+    """
+    
+    def __init__(self, pipeline: ContentProcessingPipeline = None, batch_client: BatchAPIClient = None,
+                 work_dir: str = None, max_requests: int = None):
+        self._pipeline = pipeline
+        self.batch_client = batch_client or BatchAPIClient()
+        self.work_dir = Path(work_dir or settings.BATCH_WORK_DIR)
+        self.max_requests = max_requests or settings.BATCH_MAX_REQUESTS
+    
+    @property
+    def pipeline(self) -> ContentProcessingPipeline:
+        if self._pipeline is None:
+            self._pipeline = ContentProcessingPipeline()
+        return self._pipeline
+    
+    def run(self, articles: List[ScrapedArticle], name: str = None,
+            timeout: Optional[float] = None) -> List[ProcessedArticle]:
+        """Prepare, submit, wait for and merge a backfill; results are in input order
+        
+        Raises BackfillPending if the batches have not finished within the
+        timeout; the manifest is saved, so resume() can finish the backfill.
+        """
+        results: Dict[str, ProcessedArticle] = {}
+        pending = []
+        for article in articles:
+            skipped = self._skip_result(article)
+            if skipped:
+                results[article.url] = skipped
+            else:
+                pending.append(article)
+        
+        if pending:
+            manifest = self.prepare(pending, name)
+            self.submit(manifest)
+            self._wait_finished(manifest, timeout)
+            for processed in self.merge(manifest):
+                results[processed.original_article_link] = processed
+        return [results[article.url] for article in articles if article.url in results]
+    
+    def prepare(self, articles: List[ScrapedArticle], name: str = None) -> BackfillManifest:
+        """Chunk the articles and write their analysis and embedding requests to JSONL files
+        
+        Chunking splits oversized paragraphs at sentence boundaries rather
+        than asking the LLM, so preparing a backfill makes no interactive calls.
+        """
+        name = name or datetime.now().strftime("backfill-%Y%m%d-%H%M%S")
+        manifest = BackfillManifest(
+            name=name,
+            created_at=datetime.now(),
+            articles=articles,
+            chunks=[self.pipeline.chunk(article, use_ai=False) for article in articles],
+        )
+        
+        analyzer = self.pipeline.analyzer
+        analysis_lines = [
+            batch_line(f"analysis-{i}", CHAT_ENDPOINT, {
+                "model": model_router.models_for("analysis")[0],
+                "messages": analyzer.structured_messages(article.content),
+                "max_tokens": settings.OPENAI_MAX_TOKENS,
+                "temperature": settings.OPENAI_TEMPERATURE,
+                "response_format": {"type": "json_object"},
+            })
+            for i, article in enumerate(articles)
+        ]
+        # Only OpenAI vectors can come from a batch; other backends embed while merging
+        backend = self.pipeline.embedding_service.backend
+        embedding_lines = [
+            batch_line(f"embedding-{i}", EMBEDDINGS_ENDPOINT, {
+                "model": backend.model,
+                "input": [chunk.content for chunk in chunks],
+            })
+            for i, chunks in enumerate(manifest.chunks) if chunks
+        ] if backend.name == "openai" else []
+        
+        for kind, endpoint, lines in (("analysis", CHAT_ENDPOINT, analysis_lines),
+                                      ("embeddings", EMBEDDINGS_ENDPOINT, embedding_lines)):
+            # A batch takes at most max_requests lines, so large backfills span several files
+            for part, start in enumerate(range(0, len(lines), self.max_requests)):
+                path = self._dir(name) / f"{kind}-{part}.jsonl"
+                write_jsonl(path, lines[start:start + self.max_requests])
+                manifest.files.append(BatchFile(endpoint=endpoint, path=str(path)))
+        
+        self._save(manifest)
+        logger.info(f"📝 Backfill {name}: {len(analysis_lines)} analysis and {len(embedding_lines)} embedding "
+                    f"requests in {len(manifest.files)} files")
+        return manifest
+    
+    def submit(self, manifest: BackfillManifest) -> BackfillManifest:
+        """Start a batch for every file not submitted yet"""
+        for batch_file in manifest.files:
+            if batch_file.batch_id is None:
+                batch_file.batch_id = self.batch_client.submit(Path(batch_file.path), batch_file.endpoint,
+                                                               metadata={"backfill": manifest.name})
+                self._save(manifest)
+        return manifest
+    
+    def wait(self, manifest: BackfillManifest, timeout: Optional[float] = None) -> Dict[str, str]:
+        """Poll the backfill's batches until they finish"""
+        return self.batch_client.wait([f.batch_id for f in manifest.files if f.batch_id], timeout)
+    
+    def _wait_finished(self, manifest: BackfillManifest, timeout: Optional[float]):
+        """Wait for the batches and raise BackfillPending unless all of them have finished"""
+        states = self.wait(manifest, timeout)
+        if any(state not in TERMINAL_STATES for state in states.values()):
+            self._save(manifest)
+            raise BackfillPending(manifest.name, states)
+    
+    def merge(self, manifest: BackfillManifest) -> List[ProcessedArticle]:
+        """Turn batch replies into processed articles and store their vectors
+        
+        Articles whose analysis reply is missing get the non-AI fallback result
+        and are not marked seen, so a later run processes them again. Missing
+        embeddings are computed with interactive requests.
+        """
+        bodies = {}
+        for batch_file in manifest.files:
+            if batch_file.batch_id:
+                bodies.update(self.batch_client.results(batch_file.batch_id))
+        
+        pipeline = self.pipeline
+        results = []
+        fallbacks = 0
+        for i, (article, chunks) in enumerate(zip(manifest.articles, manifest.chunks)):
+            analysis_body = bodies.get(f"analysis-{i}")
+            if analysis_body is None:
+                fallbacks += 1
+                results.append(pipeline._fallback_processing(article))
+                continue
+            
+            analysis = pipeline.analyzer.analyze_reply(article.content, chat_content(analysis_body))
+            processed = pipeline.build_result(article, chunks, analysis)
+            embedding_body = bodies.get(f"embedding-{i}")
+            vectors = embedding_vectors(embedding_body) if embedding_body else None
+            if chunks and not pipeline.embed(article, chunks, embeddings=vectors):
+                logger.warning(f"⚠️ Could not store vectors for {article.url}")
+            pipeline.seen_index.mark_seen(article.url)
+            pipeline.remember(article, analysis)
+            results.append(processed)
+        
+        logger.info(f"✅ Backfill {manifest.name}: merged {len(results) - fallbacks} articles, "
+                    f"{fallbacks} without a batch reply")
+        return results
+    
+    def resume(self, name: str, timeout: Optional[float] = None) -> List[ProcessedArticle]:
+        """Finish a backfill whose process stopped after prepare or while waiting"""
+        manifest = self.load(name)
+        self.submit(manifest)
+        self._wait_finished(manifest, timeout)
+        return self.merge(manifest)
+    
+    def load(self, name: str) -> BackfillManifest:
+        return BackfillManifest.model_validate_json((self._dir(name) / "manifest.json").read_text(encoding='utf-8'))
+    
+    def _skip_result(self, article: ScrapedArticle) -> Optional[ProcessedArticle]:
+        """Result for an article that needs no AI work: already processed or a near-duplicate"""
+        pipeline = self.pipeline
+        if pipeline.seen_index.is_seen(article.url):
+            return pipeline._duplicate_result(article)
+        match = pipeline.find_near_duplicate(article)
+        if match:
+            pipeline.seen_index.mark_seen(article.url)
+            return pipeline._near_duplicate_result(article, match)
+        return None
+    
+    def _dir(self, name: str) -> Path:
+        return self.work_dir / name
+    
+    def _save(self, manifest: BackfillManifest):
+        path = self._dir(manifest.name) / "manifest.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(manifest.model_dump_json(), encoding='utf-8')
+
+def load_articles(path: Path) -> List[ScrapedArticle]:
+    """Read ScrapedArticle records from a JSON array or a JSON Lines file"""
+    text = path.read_text(encoding='utf-8').strip()
+    if text.startswith('['):
+        records = json.loads(text)
+    else:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [ScrapedArticle.model_validate(record) for record in records]
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("articles", type=Path, nargs="?", help="JSON or JSON Lines file of scraped articles")
+    parser.add_argument("--name", help="backfill name (default: backfill-<timestamp>)")
+    parser.add_argument("--resume", metavar="NAME", help="finish an earlier backfill from its manifest")
+    parser.add_argument("--timeout", type=float, help="seconds to wait for the batches")
+    parser.add_argument("--output", type=Path, help="write the processed articles here as JSON")
+    args = parser.parse_args(argv)
+    if bool(args.articles) == bool(args.resume):
+        parser.error("give either an articles file or --resume NAME")
+
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    backfill = BatchBackfill()
+    try:
+        if args.resume:
+            results = backfill.resume(args.resume, timeout=args.timeout)
+        else:
+            results = backfill.run(load_articles(args.articles), name=args.name, timeout=args.timeout)
+    except BackfillPending as e:
+        print(e)
+        raise SystemExit(3)
+
+    if args.output:
+        args.output.write_text(json.dumps([r.model_dump(mode="json") for r in results], ensure_ascii=False),
+                               encoding='utf-8')
+    succeeded = sum(1 for r in results if r.processing_status == "success")
+    print(f"{len(results)} articles processed, {succeeded} from batch replies")
+
+if __name__ == "__main__":
+    main()
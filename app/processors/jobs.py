@@ -0,0 +1,334 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+import threading
+import uuid
+import logging
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.database import SessionLocal
+from app.db.models import ProcessingJob, ProcessingJobItem
+from app.scrapers.dedup import SeenURLIndex, seen_url_index
+from app.scrapers.models import ScrapedArticle
+from app.scrapers.unified_scraper import UnifiedScraper
+from .models import ContentAnalysis, ContentChunk
+from .near_duplicates import NearDuplicateIndex, near_duplicate_index
+from .pipeline import ContentProcessingPipeline
+
+logger = logging.getLogger(__name__)
+
+# Checkpoints an item passes through, in order
+STAGES = ("pending", "scraped", "chunked", "analyzed", "embedded")
+
+class ProcessingJobRunner:
+    """Runs processing jobs item by item, checkpointing every pipeline stage
+    
+    Each URL of a job is a processing_job_items row. Workers claim rows with
+    FOR UPDATE SKIP LOCKED, so several workers or processes can share a job.
+    After each stage (scraped, chunked, analyzed, embedded) the stage output is
+    committed to the row. A job interrupted by a crash or redeploy resumes
+    from the last completed stage once the item's lease expires: when a run
+    ends with items still leased, another run is scheduled for the moment
+    the earliest lease runs out.
+    """
+    
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal, scraper: UnifiedScraper = None,
+                 pipeline: ContentProcessingPipeline = None, seen_index: SeenURLIndex = None,
+                 near_duplicates: NearDuplicateIndex = None, max_attempts: int = 3, lease_seconds: float = 600):
+        self.session_factory = session_factory
+        self._scraper = scraper
+        self._pipeline = pipeline
+        self.seen_index = seen_index or seen_url_index
+        self.near_duplicates = near_duplicates or near_duplicate_index
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._retries: Dict[str, threading.Timer] = {}
+        self._retries_lock = threading.Lock()
+    
+    @property
+    def scraper(self) -> UnifiedScraper:
+        if self._scraper is None:
+            self._scraper = UnifiedScraper()
+        return self._scraper
+    
+    @property
+    def pipeline(self) -> ContentProcessingPipeline:
+        # Created on first use: the pipeline opens OpenAI and Chroma clients
+        if self._pipeline is None:
+            self._pipeline = ContentProcessingPipeline(seen_index=self.seen_index,
+                                                       near_duplicates=self.near_duplicates)
+        return self._pipeline
+    
+    def create_job(self, urls: List[dict]) -> str:
+        """Persist a job with one pending item per URL; returns the job id"""
+        session = self.session_factory()
+        try:
+            job = ProcessingJob(status="pending", total_items=len(urls))
+            job.items = [
+                ProcessingJobItem(position=position, url=url_info['url'], platform=url_info['platform'],
+                                  stage="pending", status="pending", attempts=0)
+                for position, url_info in enumerate(urls)
+            ]
+            session.add(job)
+            session.commit()
+            logger.info(f"📋 Created processing job {job.id} with {len(urls)} URLs")
+            return str(job.id)
+        finally:
+            session.close()
+    
+    def run_job(self, job_id: str, workers: int = 1) -> Optional[Dict]:
+        """Process a job's remaining items and return its status"""
+        if not self._set_job_status(job_id, "running"):
+            return None
+        
+        def work():
+            while True:
+                claimed = self.claim_items(job_id, limit=1)
+                if not claimed:
+                    return
+                for item_id in claimed:
+                    if self.process_item(item_id) == "deferred":
+                        return
+        
+        if workers <= 1:
+            work()
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-worker") as executor:
+                for future in [executor.submit(work) for _ in range(workers)]:
+                    future.result()
+        
+        self._finish_job(job_id, workers)
+        return self.job_status(job_id)
+    
+    def resume_incomplete(self, workers: int = 1) -> List[str]:
+        """Run every job that has not finished, e.g. after a restart"""
+        session = self.session_factory()
+        try:
+            job_ids = [
+                str(row[0]) for row in
+                session.query(ProcessingJob.id)
+                .filter(ProcessingJob.status.in_(("pending", "running")))
+                .order_by(ProcessingJob.created_at)
+            ]
+        finally:
+            session.close()
+        
+        for job_id in job_ids:
+            logger.info(f"♻️ Resuming processing job {job_id}")
+            self.run_job(job_id, workers)
+        return job_ids
+    
+    def claim_items(self, job_id: str, limit: int = 1) -> List:
+        """Lease pending items, plus in-progress ones whose worker stopped responding"""
+        cutoff = datetime.now() - timedelta(seconds=self.lease_seconds)
+        session = self.session_factory()
+        try:
+            rows = (
+                session.query(ProcessingJobItem)
+                .filter(
+                    ProcessingJobItem.job_id == _uuid(job_id),
+                    or_(
+                        ProcessingJobItem.status == "pending",
+                        (ProcessingJobItem.status == "in_progress") & (ProcessingJobItem.claimed_at < cutoff),
+                    ),
+                )
+                .order_by(ProcessingJobItem.position)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            for row in rows:
+                row.status = "in_progress"
+                row.claimed_at = datetime.now()
+                row.attempts += 1
+            session.commit()
+            return [row.id for row in rows]
+        finally:
+            session.close()
+    
+    def process_item(self, item_id) -> str:
+        """Run an item's remaining stages, committing after each; returns its new status"""
+        session = self.session_factory()
+        try:
+            item = session.get(ProcessingJobItem, item_id)
+            try:
+                return self._advance(session, item)
+            except Exception as e:
+                logger.error(f"❌ Job item {item.url} failed at stage after '{item.stage}': {e}")
+                if not session.is_active:
+                    session.rollback()  # A failed flush leaves the session unusable until rolled back
+                item.last_error = str(e)
+                if item.attempts >= self.max_attempts:
+                    item.status = "failed"
+                    item.finished_at = datetime.now()
+                else:
+                    item.status = "pending"
+                    item.claimed_at = None
+                session.commit()
+                return item.status
+        finally:
+            session.close()
+    
+    def _advance(self, session: Session, item: ProcessingJobItem) -> str:
+        if item.stage == "pending":
+            if self.seen_index.is_seen(item.url):
+                logger.info(f"⏭️ Skipping already processed article: {item.url}")
+                return self._close_item(session, item, "duplicate")
+            
+            article = self.scraper.scrape_article_politely(item.url, item.platform)
+            if article.status == "circuit_open":
+                # The source is backing off; hand the item back without using up an attempt
+                item.status = "pending"
+                item.claimed_at = None
+                item.attempts = max(0, item.attempts - 1)
+                session.commit()
+                return "deferred"
+            if article.status != "success":
+                raise RuntimeError(f"scrape {article.status}")
+            self._checkpoint(session, item, "scraped", scraped=article.model_dump(mode="json"))
+        
+        article = ScrapedArticle(**item.scraped)
+        fingerprint = self.near_duplicates.fingerprint(article.content) if settings.NEAR_DUP_ENABLED else None
+        if item.stage == "scraped":
+            match = self.near_duplicates.find(fingerprint, exclude_url=item.url)
+            if match:
+                # A republished copy: link it to the original instead of running the AI stages again
+                logger.info(f"🔗 {item.url} is a near-duplicate of {match.url}")
+                item.duplicate_of = match.url
+                item.analysis = match.analysis.model_dump(mode="json") if match.analysis else None
+                self.seen_index.mark_seen(item.url)
+                return self._close_item(session, item, "near_duplicate")
+            chunks = self.pipeline.chunk(article)
+            self._checkpoint(session, item, "chunked", chunks=[chunk.model_dump(mode="json") for chunk in chunks])
+        
+        chunks = [ContentChunk(**chunk) for chunk in item.chunks]
+        if item.stage == "chunked":
+            analysis = self.pipeline.analyze(article)
+            self._checkpoint(session, item, "analyzed", analysis=analysis.model_dump(mode="json"))
+        
+        if item.stage == "analyzed":
+            if not self.pipeline.embed(article, chunks):
+                raise RuntimeError("embedding storage failed")
+            self.seen_index.mark_seen(item.url)
+            self.near_duplicates.add(item.url, fingerprint, ContentAnalysis(**item.analysis))
+            item.stage = "embedded"
+        
+        return self._close_item(session, item, "done")
+    
+    def _checkpoint(self, session: Session, item: ProcessingJobItem, stage: str, **outputs):
+        for field, value in outputs.items():
+            setattr(item, field, value)
+        item.stage = stage
+        item.last_error = None
+        session.commit()
+        logger.info(f"✔️ {item.url}: {stage}")
+    
+    def _close_item(self, session: Session, item: ProcessingJobItem, status: str) -> str:
+        item.status = status
+        item.last_error = None
+        item.finished_at = datetime.now()
+        session.commit()
+        return status
+    
+    def _set_job_status(self, job_id: str, status: str) -> bool:
+        session = self.session_factory()
+        try:
+            job = session.get(ProcessingJob, _uuid(job_id))
+            if job is None:
+                return False
+            job.status = status
+            session.commit()
+            return True
+        finally:
+            session.close()
+    
+    def _finish_job(self, job_id: str, workers: int = 1):
+        session = self.session_factory()
+        try:
+            job = session.get(ProcessingJob, _uuid(job_id))
+            statuses = [item.status for item in job.items]
+            leased = [item.claimed_at for item in job.items if item.status == "in_progress" and item.claimed_at]
+            if any(status in ("pending", "in_progress") for status in statuses):
+                # Deferred or still leased by another worker; a later run picks it up
+                job.status = "pending"
+            else:
+                job.status = "completed_with_errors" if "failed" in statuses else "completed"
+                job.finished_at = datetime.now()
+            session.commit()
+            logger.info(f"📋 Processing job {job_id}: {job.status}")
+        finally:
+            session.close()
+        
+        if leased:
+            # The lease holder may have died (e.g. the process crashed just before a restart),
+            # so look again once its lease runs out; if it is alive the retry finds nothing to claim
+            expires = min(leased) + timedelta(seconds=self.lease_seconds)
+            self._schedule_retry(job_id, workers, (expires - datetime.now()).total_seconds())
+    
+    def _schedule_retry(self, job_id: str, workers: int, delay: float):
+        def retry():
+            with self._retries_lock:
+                self._retries.pop(job_id, None)
+            logger.info(f"🔁 Retrying processing job {job_id} after its lease expired")
+            self.run_job(job_id, workers)
+        
+        delay = max(0.0, delay) + 1  # A second past the lease cutoff
+        with self._retries_lock:
+            if job_id in self._retries:
+                return
+            timer = threading.Timer(delay, retry)
+            timer.daemon = True
+            self._retries[job_id] = timer
+            timer.start()
+        logger.info(f"⏳ Processing job {job_id} has leased items, retrying in {delay:.0f}s")
+    
+    def job_status(self, job_id: str) -> Optional[Dict]:
+        """Job progress with per-item stage and status"""
+        session = self.session_factory()
+        try:
+            job = session.get(ProcessingJob, _uuid(job_id))
+            if job is None:
+                return None
+            
+            counts: Dict[str, int] = {}
+            stages = {stage: 0 for stage in STAGES}
+            items = []
+            for item in job.items:
+                counts[item.status] = counts.get(item.status, 0) + 1
+                stages[item.stage] += 1
+                analysis = ContentAnalysis(**item.analysis) if item.analysis else None
+                items.append({
+                    "url": item.url,
+                    "platform": item.platform,
+                    "stage": item.stage,
+                    "status": item.status,
+                    "attempts": item.attempts,
+                    "last_error": item.last_error,
+                    "duplicate_of": item.duplicate_of,
+                    "title": (item.scraped or {}).get("title"),
+                    "summary": analysis.ai_summary if analysis else None,
+                })
+            return {
+                "job_id": str(job.id),
+                "status": job.status,
+                "total_items": job.total_items,
+                "counts": counts,
+                "stages": stages,
+                "created_at": job.created_at.isoformat() if job.created_at else None,
+                "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+                "items": items,
+            }
+        finally:
+            session.close()
+
+def _uuid(job_id):
+    return job_id if isinstance(job_id, uuid.UUID) else uuid.UUID(str(job_id))
+
+# Global runner used by the articles API and startup recovery
+job_runner = ProcessingJobRunner(
+    max_attempts=settings.JOB_ITEM_MAX_ATTEMPTS,
+    lease_seconds=settings.JOB_ITEM_LEASE_SECONDS,
+)
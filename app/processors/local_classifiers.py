@@ -0,0 +1,173 @@
+from typing import Any, Dict, NamedTuple, Optional
+import re
+import threading
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+class LocalPrediction(NamedTuple):
+    """A local answer and how sure the classifier is of it (0-1)"""
+    value: Any
+    confidence: float
+
+# Unicode blocks of the scripts Indian news is published in and the languages written in each,
+# most common first; only a script with a single language identifies it
+SCRIPT_RANGES = (
+    (0x0900, 0x097F, ("Hindi", "Marathi", "Nepali", "Konkani")),    # Devanagari
+    (0x0980, 0x09FF, ("Bengali", "Assamese")),
+    (0x0A00, 0x0A7F, ("Punjabi",)),                                 # Gurmukhi
+    (0x0A80, 0x0AFF, ("Gujarati",)),
+    (0x0B00, 0x0B7F, ("Odia",)),
+    (0x0B80, 0x0BFF, ("Tamil",)),
+    (0x0C00, 0x0C7F, ("Telugu",)),
+    (0x0C80, 0x0CFF, ("Kannada",)),
+    (0x0D00, 0x0D7F, ("Malayalam",)),
+    (0x0600, 0x06FF, ("Urdu", "Kashmiri", "Sindhi")),               # Arabic script
+)
+
+# Latin script alone does not say English; these words (common, short, English-only) do
+ENGLISH_STOPWORDS = frozenset(
+    "the of and to in is was for that on with as by at from it his her are were has have be this an "
+    "which will said not but they their been who after its also had would".split()
+)
+
+POSITIVE_WORDS = frozenset(
+    "good great excellent positive success successful win wins won victory growth gain gains rise rises "
+    "improve improved improvement benefit boost record celebrate celebrated praise praised welcome welcomed "
+    "achieve achieved achievement progress recovery relief hope strong strengthen support approved "
+    "launch launched award awarded peace safe rescued".split()
+)
+
+NEGATIVE_WORDS = frozenset(
+    "bad terrible negative failure fail failed crash crashed loss losses decline fall falls fell drop "
+    "dropped death deaths dead killed kill murder attack attacked violence injured arrest arrested crisis "
+    "fear fears protest protests accused fraud scam corruption flood floods disaster collapse collapsed "
+    "conflict war threat warns warning shortage concern concerns criticism criticised slump".split()
+)
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+def detect_language(text: str) -> LocalPrediction:
+    """Language from the Unicode script of the letters; Latin text is English only if it reads like English
+
+    A script shared by several languages (Devanagari, Bengali, Arabic) gives
+    its most common language with zero confidence, leaving the choice to the LLM.
+    """
+    counts: Dict[tuple, int] = {}
+    latin = letters = 0
+    for char in text[:5000]:
+        if not char.isalpha():
+            continue
+        letters += 1
+        code = ord(char)
+        if code < 0x0250:
+            latin += 1
+            continue
+        for start, end, languages in SCRIPT_RANGES:
+            if start <= code <= end:
+                counts[languages] = counts.get(languages, 0) + 1
+                break
+    if not letters:
+        return LocalPrediction("English", 0.0)
+
+    if counts:
+        languages, count = max(counts.items(), key=lambda item: item[1])
+        if count > latin:
+            return LocalPrediction(languages[0], count / letters if len(languages) == 1 else 0.0)
+
+    words = WORD_PATTERN.findall(text[:5000].lower())
+    stopword_share = sum(1 for word in words if word in ENGLISH_STOPWORDS) / len(words) if words else 0.0
+    # Running English prose is 30-40% stopwords; other Latin-script languages share almost none of these
+    return LocalPrediction("English", (latin / letters) * min(1.0, stopword_share / 0.12))
+
+def analyze_sentiment(text: str) -> LocalPrediction:
+    """Lexicon sentiment; confident only when enough opinion words agree"""
+    words = WORD_PATTERN.findall(text.lower())
+    positive = sum(1 for word in words if word in POSITIVE_WORDS)
+    negative = sum(1 for word in words if word in NEGATIVE_WORDS)
+    hits = positive + negative
+    if not hits:
+        return LocalPrediction({"score": 0.0, "label": "neutral", "confidence": 0.0}, 0.0)
+
+    score = (positive - negative) / hits
+    label = "positive" if score > 0.3 else "negative" if score < -0.3 else "neutral"
+    # Agreement between the opinion words, discounted until there are enough of them to trust
+    confidence = abs(score) * min(1.0, hits / 8) if label != "neutral" else 0.0
+    return LocalPrediction({"score": round(score, 3), "label": label, "confidence": round(confidence, 3)},
+                           confidence)
+
+def assess_quality(text: str) -> LocalPrediction:
+    """Quality (0-1) for the clear cases: stubs and unreadable text score low with confidence"""
+    words = text.split()
+    sentences = [s for s in re.split(r"[.!?।]+", text) if s.strip()]
+    if len(words) < 60:
+        return LocalPrediction(0.2, 0.9)
+    words_per_sentence = len(words) / max(1, len(sentences))
+    if words_per_sentence > 80:
+        # A wall of text without sentences: scraped navigation, tables or a listing page
+        return LocalPrediction(0.2, 0.85)
+    return LocalPrediction(0.5, 0.0)
+
+class LocalClassifier:
+    """Answers language, sentiment and quality in-process when confident enough
+    
+    Each method returns None when the local prediction is below its
+    confidence threshold, and the caller then asks the LLM. Counts of local
+    answers and escalations per task show how many LLM calls were avoided.
+    """
+    
+    def __init__(self, language_threshold: float = 0.9, sentiment_threshold: float = 0.7,
+                 quality_threshold: float = 0.8):
+        self.thresholds = {
+            "language": language_threshold,
+            "sentiment": sentiment_threshold,
+            "quality": quality_threshold,
+        }
+        self._lock = threading.Lock()
+        self.answered = {task: 0 for task in self.thresholds}
+        self.escalated = {task: 0 for task in self.thresholds}
+    
+    def language(self, text: str) -> Optional[str]:
+        return self._decide("language", detect_language(text))
+    
+    def sentiment(self, text: str) -> Optional[Dict[str, Any]]:
+        return self._decide("sentiment", analyze_sentiment(text))
+    
+    def quality(self, text: str) -> Optional[float]:
+        return self._decide("quality", assess_quality(text))
+    
+    def _decide(self, task: str, prediction: LocalPrediction) -> Optional[Any]:
+        confident = prediction.confidence >= self.thresholds[task]
+        with self._lock:
+            if confident:
+                self.answered[task] += 1
+            else:
+                self.escalated[task] += 1
+        if confident:
+            logger.debug(f"[Local] {task}: {prediction.value} ({prediction.confidence:.2f})")
+            return prediction.value
+        return None
+    
+    def stats(self) -> Dict[str, Any]:
+        """LLM calls avoided overall and local/escalated counts per task"""
+        with self._lock:
+            return {
+                "llm_calls_avoided": sum(self.answered.values()),
+                "tasks": {
+                    task: {
+                        "local": self.answered[task],
+                        "escalated": self.escalated[task],
+                        "threshold": self.thresholds[task],
+                    }
+                    for task in self.thresholds
+                },
+            }
+
+# Global local classifier shared by every analyzer (None when disabled)
+local_classifier = LocalClassifier(
+    language_threshold=settings.LOCAL_LANGUAGE_MIN_CONFIDENCE,
+    sentiment_threshold=settings.LOCAL_SENTIMENT_MIN_CONFIDENCE,
+    quality_threshold=settings.LOCAL_QUALITY_MIN_CONFIDENCE,
+) if settings.LOCAL_CLASSIFIER_ENABLED else None
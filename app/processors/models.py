@@ -1,6 +1,6 @@
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Dict, Any, Literal, Optional
 import json
 
 class ContentChunk(BaseModel):
@@ -30,6 +30,18 @@ class ContentAnalysis(BaseModel):
     sentiment_label: str = "neutral"
     confidence_score: float = 0.0
 
+class AnalysisFields(BaseModel):
+    """Schema of the single-request AI analysis reply; a missing or invalid field stays None"""
+    sentiment_score: Optional[float] = Field(None, ge=-1, le=1)
+    sentiment_label: Optional[Literal["positive", "negative", "neutral"]] = None
+    sentiment_confidence: Optional[float] = Field(None, ge=0, le=1)
+    entities: Optional[List[str]] = None
+    topics: Optional[List[str]] = None
+    summary: Optional[str] = Field(None, min_length=1)
+    keywords: Optional[List[str]] = None
+    language: Optional[str] = Field(None, min_length=1)
+    quality: Optional[float] = Field(None, ge=0, le=10)
+
 class ProcessedArticle(BaseModel):
     """Final processed article with chunks and analysis"""
     original_article_link: str
@@ -39,6 +51,9 @@ class ProcessedArticle(BaseModel):
     analysis: ContentAnalysis
     processed_at: datetime
     processing_status: str = "success"
+    # Set for near-duplicates: the article whose analysis was reused, and its story if any
+    duplicate_of: Optional[str] = None
+    story_id: Optional[str] = None
     
     model_config = ConfigDict(
         json_encoders={
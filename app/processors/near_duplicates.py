@@ -0,0 +1,195 @@
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Set
+import hashlib
+import re
+import threading
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.database import SessionLocal
+from app.db.models import ContentFingerprint, Source
+from app.scrapers.utils import canonicalize_url
+from .models import ContentAnalysis
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def shingles(text: str, size: int = 2) -> Counter:
+    """Overlapping word n-grams of the normalized text, with counts"""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return Counter([' '.join(words)]) if words else Counter()
+    return Counter(' '.join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+def simhash(text: str, shingle_size: int = 2) -> int:
+    """64-bit SimHash: similar texts get fingerprints a small Hamming distance apart"""
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, count in shingles(text, shingle_size).items():
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+class NearDuplicate(NamedTuple):
+    """An earlier article whose content matches closely enough to reuse its analysis"""
+    url: str
+    distance: int
+    analysis: Optional[ContentAnalysis]
+    story_id: Optional[str]
+
+class NearDuplicateIndex:
+    """SimHash fingerprints of processed articles with an LSH lookup
+    
+    A 64-bit fingerprint is split into max_distance + 1 bands. Two fingerprints
+    within max_distance bits of each other must agree on at least one whole
+    band, so a lookup only compares against articles sharing a band bucket
+    instead of scanning every fingerprint. Fingerprints and the analysis they
+    produced are persisted in content_fingerprints and loaded on first use.
+    Like the seen-URL index, database errors fail open.
+    """
+    
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal, max_distance: int = 5,
+                 min_words: int = 50, shingle_size: int = 2):
+        self.session_factory = session_factory
+        self.max_distance = max_distance
+        self.min_words = min_words
+        self.shingle_size = shingle_size
+        self.bands = max_distance + 1
+        self._band_bits = -(-FINGERPRINT_BITS // self.bands)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._fingerprints: Dict[str, int] = {}
+        self._buckets: Dict[tuple, Set[str]] = defaultdict(set)
+    
+    def fingerprint(self, text: str) -> Optional[int]:
+        """SimHash of the text, or None when it is too short to compare reliably"""
+        if len(WORD_PATTERN.findall(text or "")) < self.min_words:
+            return None
+        return simhash(text, self.shingle_size)
+    
+    def candidates(self, fingerprint: int) -> Set[str]:
+        """URLs sharing at least one band with the fingerprint"""
+        self._ensure_loaded()
+        with self._lock:
+            found = set()
+            for key in self._band_keys(fingerprint):
+                found.update(self._buckets.get(key, ()))
+            return found
+    
+    def find(self, fingerprint: Optional[int], exclude_url: str = None) -> Optional[NearDuplicate]:
+        """Closest indexed article within max_distance bits, with its stored analysis"""
+        if fingerprint is None:
+            return None
+        
+        exclude = canonicalize_url(exclude_url) if exclude_url else None
+        best_url, best_distance = None, self.max_distance + 1
+        for url in self.candidates(fingerprint):
+            if url == exclude:
+                continue
+            distance = hamming_distance(fingerprint, self._fingerprints[url])
+            if distance < best_distance:
+                best_url, best_distance = url, distance
+        if best_url is None:
+            return None
+        return self._load_match(best_url, best_distance)
+    
+    def add(self, url: str, fingerprint: Optional[int], analysis: ContentAnalysis = None):
+        """Index a processed article's fingerprint and persist it with its analysis"""
+        if fingerprint is None:
+            return
+        canonical = canonicalize_url(url)
+        self._ensure_loaded()
+        self._index(canonical, fingerprint)
+        
+        try:
+            session = self.session_factory()
+            try:
+                row = session.query(ContentFingerprint).filter(ContentFingerprint.canonical_url == canonical).first()
+                if row is None:
+                    row = ContentFingerprint(canonical_url=canonical, url=url)
+                    session.add(row)
+                row.fingerprint = _to_signed(fingerprint)
+                row.analysis = analysis.model_dump(mode="json") if analysis else None
+                session.commit()
+            finally:
+                session.close()
+        except Exception as e:
+            logger.warning(f"Could not persist content fingerprint for {url}: {e}")
+    
+    def _load_match(self, canonical: str, distance: int) -> NearDuplicate:
+        analysis, story_id, url = None, None, canonical
+        try:
+            session = self.session_factory()
+            try:
+                row = session.query(ContentFingerprint).filter(ContentFingerprint.canonical_url == canonical).first()
+                if row is not None:
+                    url = row.url
+                    analysis = ContentAnalysis(**row.analysis) if row.analysis else None
+                source = session.query(Source.story_id).filter(Source.url.in_({url, canonical})).first()
+                story_id = str(source[0]) if source else None
+            finally:
+                session.close()
+        except Exception as e:
+            logger.warning(f"Could not load near-duplicate details for {canonical}: {e}")
+        return NearDuplicate(url=url, distance=distance, analysis=analysis, story_id=story_id)
+    
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                session = self.session_factory()
+                try:
+                    rows = session.query(ContentFingerprint.canonical_url, ContentFingerprint.fingerprint)
+                    count = 0
+                    for canonical, fingerprint in rows.yield_per(10000):
+                        self._index_locked(canonical, fingerprint & (2 ** FINGERPRINT_BITS - 1))
+                        count += 1
+                finally:
+                    session.close()
+                if count:
+                    logger.info(f"Loaded {count} content fingerprints into the near-duplicate index")
+            except Exception as e:
+                logger.warning(f"Could not load content fingerprints, starting empty: {e}")
+    
+    def _index(self, canonical: str, fingerprint: int):
+        with self._lock:
+            self._index_locked(canonical, fingerprint)
+    
+    def _index_locked(self, canonical: str, fingerprint: int):
+        previous = self._fingerprints.get(canonical)
+        if previous is not None:
+            for key in self._band_keys(previous):
+                self._buckets[key].discard(canonical)
+        self._fingerprints[canonical] = fingerprint
+        for key in self._band_keys(fingerprint):
+            self._buckets[key].add(canonical)
+    
+    def _band_keys(self, fingerprint: int) -> List[tuple]:
+        mask = (1 << self._band_bits) - 1
+        return [(band, fingerprint >> (band * self._band_bits) & mask) for band in range(self.bands)]
+
+def _to_signed(fingerprint: int) -> int:
+    # BIGINT columns are signed; keep the same 64 bits
+    return fingerprint - 2 ** FINGERPRINT_BITS if fingerprint >= 2 ** (FINGERPRINT_BITS - 1) else fingerprint
+
+# Global index shared by the processing pipeline and jobs
+near_duplicate_index = NearDuplicateIndex(
+    max_distance=settings.NEAR_DUP_MAX_DISTANCE,
+    min_words=settings.NEAR_DUP_MIN_WORDS,
+)
@@ -1,10 +1,13 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from app.processors.semantic_chunker import SemanticChunker
 from app.scrapers.models import ScrapedArticle
-from .models import ProcessedArticle
+from app.scrapers.dedup import SeenURLIndex, seen_url_index
+from .models import ContentAnalysis, ContentChunk, ProcessedArticle
 from .analyzer import AIContentAnalyzer
+from .near_duplicates import NearDuplicate, NearDuplicateIndex, near_duplicate_index
+from app.config import settings
 import logging
 from app.ai.embedding_service import EmbeddingService
 
@@ -13,47 +16,121 @@ logger = logging.getLogger(__name__)
 class ContentProcessingPipeline:
     """Main pipeline for processing scraped articles"""
     
-    def __init__(self, chunk_size: int = 300, overlap: int = 50):
+    def __init__(self, chunk_size: int = 300, overlap: int = 50, seen_index: SeenURLIndex = None,
+                 near_duplicates: NearDuplicateIndex = None):
         self.chunker = SemanticChunker(chunk_size)
         self.analyzer = AIContentAnalyzer()
         self.embedding_service = EmbeddingService()
+        self.seen_index = seen_index or seen_url_index
+        self.near_duplicates = near_duplicates or near_duplicate_index
     
     def process_article(self, article: ScrapedArticle) -> ProcessedArticle:
         """Process a single article through the pipeline"""
+        if self.seen_index.is_seen(article.url):
+            logger.info(f"⏭️ Skipping already processed article: {article.url}")
+            return self._duplicate_result(article)
+        
+        fingerprint = None
+        if settings.NEAR_DUP_ENABLED:
+            fingerprint = self.near_duplicates.fingerprint(article.content)
+            match = self.near_duplicates.find(fingerprint, exclude_url=article.url)
+            if match:
+                self.seen_index.mark_seen(article.url)
+                return self._near_duplicate_result(article, match)
+        
         try:
             logger.info(f"Processing article: {article.title}")
             
             # Step 1: Chunk the content
-            chunks = self.chunker.chunk_text(article.content)
-            logger.info(f"Created {len(chunks)} chunks")
+            chunks = self.chunk(article)
             
             # Step 2: Analyze the content
-            analysis = self.analyzer.analyze(article.content)
-            logger.info(f"Analysis completed - {analysis.word_count} words, {analysis.sentence_count} sentences")
+            analysis = self.analyze(article)
             
             # Step 3: Create processed article
-            processed_article = ProcessedArticle(
-                original_article_link=article.url,
-                title=article.title,
-                clean_content=article.content,
-                chunks=chunks,
-                analysis=analysis,
-                processed_at=datetime.now()
-            )
+            processed_article = self.build_result(article, chunks, analysis)
             
             # Store embeddings
-            self.embedding_service.store_article_chunks(
-                article_id=processed_article.original_article_link,
-                chunks=processed_article.chunks
-            )
+            self.embed(article, processed_article.chunks)
             
+            self.seen_index.mark_seen(article.url)
+            self.near_duplicates.add(article.url, fingerprint, analysis)
             logger.info(f"Successfully processed article: {article.title}")
             return processed_article
             
         except Exception as e:
             logger.error(f"Error processing article {article.title}: {e}")
             return self._fallback_processing(article)
+    
+    def chunk(self, article: ScrapedArticle, use_ai: bool = True) -> List[ContentChunk]:
+        """Split the article content into semantic chunks; use_ai=False never calls the LLM"""
+        chunks = self.chunker.chunk_text(article.content, use_ai=use_ai)
+        logger.info(f"Created {len(chunks)} chunks")
+        return chunks
+    
+    def analyze(self, article: ScrapedArticle) -> ContentAnalysis:
+        """Run AI analysis over the article content"""
+        analysis = self.analyzer.analyze(article.content)
+        logger.info(f"Analysis completed - {analysis.word_count} words, {analysis.sentence_count} sentences")
+        return analysis
+    
+    def embed(self, article: ScrapedArticle, chunks: List[ContentChunk],
+              embeddings: Optional[List[List[float]]] = None) -> bool:
+        """Store chunk embeddings in the vector store; returns False if that failed"""
+        return self.embedding_service.store_article_chunks(article_id=article.url, chunks=chunks,
+                                                           embeddings=embeddings)
+    
+    def build_result(self, article: ScrapedArticle, chunks: List[ContentChunk],
+                     analysis: ContentAnalysis) -> ProcessedArticle:
+        """Assemble the processed article from the stage outputs"""
+        return ProcessedArticle(
+            original_article_link=article.url,
+            title=article.title,
+            clean_content=article.content,
+            chunks=chunks,
+            analysis=analysis,
+            processed_at=datetime.now()
+        )
         
+    def _duplicate_result(self, article: ScrapedArticle) -> ProcessedArticle:
+        """Result for an article that was already processed, without AI work"""
+        return ProcessedArticle(
+            original_article_link=article.url,
+            title=article.title,
+            clean_content=article.content,
+            chunks=[],
+            analysis=ContentAnalysis(
+                word_count=len(article.content.split()),
+                sentence_count=len(article.content.split('.')),
+                readability_score=0.0,
+                sentiment_score=0.0
+            ),
+            processed_at=datetime.now(),
+            processing_status="duplicate"
+        )
+    
+    def find_near_duplicate(self, article: ScrapedArticle) -> Optional[NearDuplicate]:
+        """Look up an already processed article with nearly the same content"""
+        if not settings.NEAR_DUP_ENABLED:
+            return None
+        return self.near_duplicates.find(self.near_duplicates.fingerprint(article.content), exclude_url=article.url)
+    
+    def remember(self, article: ScrapedArticle, analysis: ContentAnalysis):
+        """Fingerprint a processed article so later copies can reuse its analysis"""
+        if settings.NEAR_DUP_ENABLED:
+            self.near_duplicates.add(article.url, self.near_duplicates.fingerprint(article.content), analysis)
+    
+    def _near_duplicate_result(self, article: ScrapedArticle, match: NearDuplicate) -> ProcessedArticle:
+        """Result for a republished copy, linked to the original instead of re-analyzed"""
+        logger.info(f"🔗 {article.url} is a near-duplicate of {match.url} ({match.distance} bits apart)")
+        result = self._duplicate_result(article)
+        if match.analysis:
+            result.analysis = match.analysis
+        result.processing_status = "near_duplicate"
+        result.duplicate_of = match.url
+        result.story_id = match.story_id
+        return result
+    
     def _fallback_processing(self, article: ScrapedArticle) -> ProcessedArticle:
         """Fallback processing without AI"""
         # Use basic chunker and analyzer
@@ -14,8 +14,12 @@ class SemanticChunker:
         self.max_chunk_size = max_chunk_size
         self.openai_service = OpenAIService()
     
-    def chunk_text(self, text: str) -> List[ContentChunk]:
-        """Split text semantically using AI"""
+    def chunk_text(self, text: str, use_ai: bool = True) -> List[ContentChunk]:
+        """Split text semantically using AI
+        
+        With use_ai=False oversized blocks are split at sentence boundaries
+        instead, so chunking never makes a blocking LLM call.
+        """
         
         logger.info("[Chunker] Starting semantic chunking")
         # First, try to split at natural boundaries
@@ -27,6 +31,8 @@ class SemanticChunker:
         for chunk in natural_chunks:
             if len(chunk.split()) <= self.max_chunk_size:
                 final_chunks.append(chunk)
+            elif not use_ai:
+                final_chunks.extend(self._sentence_split(chunk))
             else:
                 logger.info(f"[Chunker] Chunk too large, using AI to split (words: {len(chunk.split())})")
                 ai_chunks = self._ai_split_chunk(chunk)
@@ -70,7 +76,7 @@ class SemanticChunker:
         response = self.openai_service._make_request([
             {"role": "system", "content": "You are a text chunking expert. Return only a JSON array."},
             {"role": "user", "content": prompt}
-        ])
+        ], task="chunking")
         
         try:
             import json
@@ -80,6 +86,27 @@ class SemanticChunker:
             # Fallback to simple splitting
             return self._simple_split(chunk)
     
+    def _sentence_split(self, text: str) -> List[str]:
+        """Pack whole sentences into chunks of at most max_chunk_size words"""
+        chunks = []
+        current = []
+        for sentence in re.split(r'(?<=[.!?।])\s+', text):
+            words = sentence.split()
+            if len(words) > self.max_chunk_size:
+                # A single run-on sentence longer than a chunk is cut by word count
+                chunks.extend(self._simple_split(' '.join(current + words)))
+                current = []
+                continue
+            if current and len(current) + len(words) > self.max_chunk_size:
+                chunks.append(' '.join(current))
+                current = []
+            current.extend(words)
+        
+        if current:
+            chunks.append(' '.join(current))
+        
+        return chunks
+    
     def _simple_split(self, text: str) -> List[str]:
         """Simple fallback splitting"""
         words = text.split()
@@ -3,11 +3,20 @@ from .factory import ScraperFactory
 from .selenium_base import SeleniumBaseScraper
 from .ndtv_scraper import NDTVScraper
 from .models import ScrapedArticle
+from .driver_pool import DriverPool
+from .discovery import DiscoveredURL, DiscoveryAdapter
+from .frontier import CrawlFrontier
+from .tabs import TabScheduler
 
 __all__ = [
     'UnifiedScraper',
     'ScraperFactory', 
     'SeleniumBaseScraper',
     'NDTVScraper',
-    'ScrapedArticle'
+    'ScrapedArticle',
+    'DriverPool',
+    'DiscoveredURL',
+    'DiscoveryAdapter',
+    'CrawlFrontier',
+    'TabScheduler'
 ]
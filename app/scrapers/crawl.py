@@ -0,0 +1,45 @@
+"""Crawl the persistent URL frontier and process every article it yields.
+
+Usage:
+    python -m app.scrapers.crawl [--discover [PLATFORM ...]] [--batch-size N] [--max-batches N] [--scrape-only]
+
+--discover first enqueues new URLs from the platforms' sitemaps and RSS feeds
+(all discoverable platforms when none are named). Crawled articles go through
+the content processing pipeline unless --scrape-only is given. Run it again at
+any time: URLs left by an interrupted crawl or waiting out a retry backoff are
+picked up once they are due.
+"""
+from typing import List
+import argparse
+import logging
+
+from .frontier import CrawlFrontier
+from ..config import settings
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--discover", nargs="*", metavar="PLATFORM",
+                        help="run URL discovery first (default: every discoverable platform)")
+    parser.add_argument("--batch-size", type=int, default=20, help="URLs claimed per batch")
+    parser.add_argument("--max-batches", type=int, help="stop after this many batches")
+    parser.add_argument("--scrape-only", action="store_true", help="scrape without running the AI pipeline")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    frontier = CrawlFrontier()
+    if args.discover is not None:
+        added = frontier.discover(args.discover or None)
+        print(f"{added} new URLs discovered")
+
+    on_article = None
+    if not args.scrape_only:
+        # Imported here so a scrape-only crawl does not open the OpenAI and Chroma clients
+        from ..processors.pipeline import ContentProcessingPipeline
+        on_article = ContentProcessingPipeline().process_article
+
+    totals = frontier.run(batch_size=args.batch_size, max_batches=args.max_batches, on_article=on_article)
+    print(f"{totals['done']} done, {totals['failed']} failed, {totals['deferred']} deferred; "
+          f"frontier: {frontier.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional
+import hashlib
+import math
+import threading
+import time
+import logging
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .utils import canonicalize_url
+from ..config import settings
+from ..db.models import SeenURL, Source
+
+logger = logging.getLogger(__name__)
+
+# Refreshes re-read rows this far before the last one, for transactions that were open across it
+REFRESH_OVERLAP = timedelta(minutes=1)
+
+def _default_session() -> Session:
+    # Imported on first use, so loading the scrapers does not create the database engine
+    from ..db.database import SessionLocal
+    return SessionLocal()
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)"""
+    
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+    
+    def add(self, item: str):
+        """Add an item to the filter"""
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+    
+    def _positions(self, item: str):
+        # Double hashing: k positions derived from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.num_bits for i in range(self.num_hashes)]
+
+class SeenURLIndex:
+    """Persistent index of already-processed article URLs
+    
+    Lookups go through an in-memory Bloom filter first, so the common case of a
+    new URL never touches the database. Bloom hits are confirmed against the
+    seen_urls table, which is backfilled with the canonical form of every
+    sources.url. URLs recorded by this process are found at once; rows written
+    by other processes (other workers, story ingestion) reach the filter at the
+    next refresh, so for up to refresh_interval such a URL can still read as
+    unseen. Database errors fail open: a URL is treated as unseen rather than
+    blocking ingestion.
+    """
+    
+    def __init__(self, session_factory: Callable[[], Session] = _default_session,
+                 capacity: int = 1_000_000, error_rate: float = 0.001, refresh_interval: float = 300):
+        self.session_factory = session_factory
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self.bloom: Optional[BloomFilter] = None
+        self._lock = threading.Lock()
+        self._last_refresh: Optional[datetime] = None
+        self._last_refresh_at: Optional[float] = None
+    
+    def is_seen(self, url: str) -> bool:
+        """Whether this article (in any URL variant) was already processed"""
+        canonical = canonicalize_url(url)
+        self._ensure_fresh()
+        if self.bloom is not None and canonical not in self.bloom:
+            return False
+        
+        try:
+            session = self.session_factory()
+            try:
+                if session.query(SeenURL.id).filter(SeenURL.canonical_url == canonical).first():
+                    return True
+                # Without a filter (it failed to load) sources may not be backfilled into seen_urls
+                return session.query(Source.id).filter(Source.url.in_({url, canonical})).first() is not None
+            finally:
+                session.close()
+        except Exception as e:
+            logger.warning(f"Seen-URL lookup failed, treating {url} as new: {e}")
+            return False
+    
+    def mark_seen(self, url: str):
+        """Record a URL as processed"""
+        canonical = canonicalize_url(url)
+        self._ensure_fresh()
+        if self.bloom is not None:
+            self.bloom.add(canonical)
+        
+        try:
+            session = self.session_factory()
+            try:
+                if not session.query(SeenURL.id).filter(SeenURL.canonical_url == canonical).first():
+                    session.add(SeenURL(canonical_url=canonical, url=url))
+                    session.commit()
+            finally:
+                session.close()
+        except Exception as e:
+            logger.warning(f"Could not persist seen URL {url}: {e}")
+    
+    def warm(self):
+        """Rebuild the Bloom filter from everything in the database"""
+        with self._lock:
+            self.bloom = BloomFilter(self.capacity, self.error_rate)
+            self._last_refresh = None
+            self._load_since(None)
+    
+    def _ensure_fresh(self):
+        """Warm on first use, then pick up rows added by other writers periodically"""
+        if self._last_refresh_at is not None and time.monotonic() - self._last_refresh_at < self.refresh_interval:
+            return
+        
+        if self.bloom is None:
+            self.warm()
+        else:
+            with self._lock:
+                self._load_since(self._last_refresh)
+    
+    def _load_since(self, since: Optional[datetime]):
+        self._last_refresh_at = time.monotonic()
+        try:
+            session = self.session_factory()
+            try:
+                # Rows are stamped by the database's clock, so the next refresh starts from its time too
+                started = session.query(func.now()).scalar()
+                seen = session.query(SeenURL.canonical_url)
+                sources = session.query(Source.url)
+                if since is not None:
+                    seen = seen.filter(SeenURL.first_seen_at >= since - REFRESH_OVERLAP)
+                    sources = sources.filter(Source.created_at >= since - REFRESH_OVERLAP)
+                known = {row[0] for row in seen.yield_per(10000)}
+                
+                # Story sources store raw URLs; index their canonical form so lookups can confirm them
+                backfill = {}
+                for (url,) in sources.yield_per(10000):
+                    canonical = canonicalize_url(url)
+                    if canonical not in known:
+                        backfill.setdefault(canonical, url)
+                if backfill:
+                    existing = {
+                        row[0] for row in
+                        session.query(SeenURL.canonical_url).filter(SeenURL.canonical_url.in_(list(backfill)))
+                    }
+                    session.add_all(
+                        SeenURL(canonical_url=canonical, url=url)
+                        for canonical, url in backfill.items() if canonical not in existing
+                    )
+                    session.commit()
+                loaded = self._add_all(known) + self._add_all(backfill)
+            finally:
+                session.close()
+            self._last_refresh = started
+            if loaded:
+                logger.info(f"Loaded {loaded} URLs into the seen-URL Bloom filter")
+        except Exception as e:
+            logger.warning(f"Could not load seen URLs, relying on database lookups: {e}")
+            # Without a complete filter every lookup must go to the database
+            self.bloom = None if since is None else self.bloom
+    
+    def _add_all(self, urls: Iterable[str]) -> int:
+        count = 0
+        for url in urls:
+            self.bloom.add(url)
+            count += 1
+        return count
+
+# Global seen-URL index shared by scrapers and the processing pipeline
+seen_url_index = SeenURLIndex(
+    capacity=settings.SEEN_URL_BLOOM_CAPACITY,
+    error_rate=settings.SEEN_URL_BLOOM_ERROR_RATE,
+)
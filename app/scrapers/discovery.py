@@ -0,0 +1,147 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from xml.etree import ElementTree
+from pydantic import BaseModel
+import logging
+
+from .http_client import fetch_html
+
+logger = logging.getLogger(__name__)
+
+class DiscoveredURL(BaseModel):
+    """An article URL found by a discovery adapter"""
+    url: str
+    platform: str
+    section: Optional[str] = None
+    published_at: Optional[datetime] = None
+    discovered_via: str = "sitemap"
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from an element tag"""
+    return tag.rsplit('}', 1)[-1]
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse ISO-8601 (sitemaps, Atom) or RFC-822 (RSS) dates as aware datetimes"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+class DiscoveryAdapter(ABC):
+    """Finds article URLs for one platform"""
+    
+    platform: str = ""
+    # Relative weight per section when ordering the crawl frontier (default 1.0)
+    section_weights: Dict[str, float] = {}
+    
+    @abstractmethod
+    def discover(self) -> List[DiscoveredURL]:
+        """Return article URLs currently listed by the source"""
+        pass
+    
+    def section_for(self, url: str) -> Optional[str]:
+        """Derive the section from the first path segment of an article URL"""
+        segments = [segment for segment in urlsplit(url).path.split('/') if segment]
+        return segments[0] if len(segments) > 1 else None
+    
+    def section_weight(self, section: Optional[str]) -> float:
+        return self.section_weights.get(section or "", 1.0)
+
+class SitemapRSSDiscovery(DiscoveryAdapter):
+    """Discovery from XML sitemaps (including sitemap indexes) and RSS/Atom feeds"""
+    
+    sitemap_urls: List[str] = []
+    feed_urls: List[str] = []
+    # How deep to follow sitemap indexes
+    max_sitemap_depth: int = 2
+    
+    def discover(self) -> List[DiscoveredURL]:
+        found: Dict[str, DiscoveredURL] = {}
+        for sitemap_url in self.sitemap_urls:
+            for item in self._crawl_sitemap(sitemap_url, depth=0):
+                found.setdefault(item.url, item)
+        for feed_url in self.feed_urls:
+            try:
+                for item in self.parse_feed(fetch_html(feed_url)):
+                    found.setdefault(item.url, item)
+            except Exception as e:
+                logger.error(f"Error reading feed {feed_url}: {e}")
+        logger.info(f"🧭 Discovered {len(found)} {self.platform} URLs")
+        return list(found.values())
+    
+    def _crawl_sitemap(self, sitemap_url: str, depth: int) -> List[DiscoveredURL]:
+        try:
+            xml = fetch_html(sitemap_url)
+        except Exception as e:
+            logger.error(f"Error reading sitemap {sitemap_url}: {e}")
+            return []
+        
+        urls, child_sitemaps = self.parse_sitemap(xml)
+        if depth < self.max_sitemap_depth:
+            for child in child_sitemaps:
+                urls.extend(self._crawl_sitemap(child, depth + 1))
+        return urls
+    
+    def parse_sitemap(self, xml: str):
+        """Parse a urlset or sitemapindex; returns (article URLs, child sitemap URLs)"""
+        root = ElementTree.fromstring(xml.encode('utf-8'))
+        urls, children = [], []
+        for entry in root:
+            fields = {}
+            for child in entry.iter():
+                name = _local_name(child.tag)
+                if child.text and name not in fields:
+                    fields[name] = child.text.strip()
+            loc = fields.get('loc')
+            if not loc:
+                continue
+            
+            if _local_name(root.tag) == 'sitemapindex':
+                children.append(loc)
+            else:
+                urls.append(DiscoveredURL(
+                    url=loc,
+                    platform=self.platform,
+                    section=self.section_for(loc),
+                    # Google News sitemaps carry publication_date; plain ones only lastmod
+                    published_at=_parse_datetime(fields.get('publication_date') or fields.get('lastmod')),
+                    discovered_via="sitemap"
+                ))
+        return urls, children
+    
+    def parse_feed(self, xml: str) -> List[DiscoveredURL]:
+        """Parse RSS <item> or Atom <entry> elements"""
+        root = ElementTree.fromstring(xml.encode('utf-8'))
+        urls = []
+        for entry in root.iter():
+            if _local_name(entry.tag) not in ('item', 'entry'):
+                continue
+            
+            link, published, category = None, None, None
+            for child in entry:
+                name = _local_name(child.tag)
+                if name == 'link':
+                    link = link or (child.text or '').strip() or child.get('href')
+                elif name in ('pubDate', 'published', 'updated'):
+                    published = published or _parse_datetime(child.text)
+                elif name == 'category':
+                    category = category or (child.text or child.get('term') or '').strip() or None
+            if link:
+                urls.append(DiscoveredURL(
+                    url=link,
+                    platform=self.platform,
+                    section=self.section_for(link) or category,
+                    published_at=published,
+                    discovered_via="rss"
+                ))
+        return urls
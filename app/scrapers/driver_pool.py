@@ -0,0 +1,248 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional
+import os
+import queue
+import threading
+import time
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+    """Resolve the Chrome driver binary once per process"""
+    return ChromeDriverManager().install()
+
+def create_chrome_driver() -> webdriver.Chrome:
+    """Start a headless Chrome driver with anti-detection options"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")  # Run in background
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    # Return from get() at DOMContentLoaded; scrapers wait for their own readiness signal
+    chrome_options.page_load_strategy = "eager"
+    # Never prompt for or run notifications, popups, geolocation, camera/mic or downloads
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.notifications": 2,
+        "profile.managed_default_content_settings.popups": 2,
+        "profile.managed_default_content_settings.geolocation": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+        "profile.managed_default_content_settings.automatic_downloads": 2,
+    })
+    chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+    # Network events feed the per-page request and blocked-bytes report
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    service = Service(_chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+def _process_tree(pid: int) -> List[int]:
+    """A process and all of its descendants, from the parent ids in /proc"""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces, so the fields are read after its closing paren
+                parent = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+def _process_memory_kb(pid: int) -> Optional[int]:
+    """Proportional set size of a process in KB, or its RSS on kernels without smaps_rollup"""
+    for path, field in ((f'/proc/{pid}/smaps_rollup', 'Pss:'), (f'/proc/{pid}/status', 'VmRSS:')):
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith(field):
+                        return int(line.split()[1])
+        except (OSError, ValueError):
+            continue
+    return None
+
+class PooledDriver:
+    """A Chrome driver owned by the pool, with usage counters"""
+
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.pages_served = 0
+        self.created_at = time.monotonic()
+
+    def memory_mb(self) -> Optional[float]:
+        """Memory used by the browser's processes (chromedriver, Chrome and its renderers), in MB
+
+        Reads proportional set sizes from /proc, so memory shared between the
+        Chrome processes is counted once; None where /proc is unavailable.
+        """
+        try:
+            pid = self.driver.service.process.pid
+        except AttributeError:
+            return None
+        if not os.path.isdir('/proc'):
+            return None
+        sizes = [size for size in map(_process_memory_kb, _process_tree(pid)) if size is not None]
+        return sum(sizes) / 1024 if sizes else None
+
+    def quit(self):
+        """Quit the underlying browser, ignoring errors from dead sessions"""
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting driver: {e}")
+
+class DriverPool:
+    """Bounded pool of warm Chrome drivers shared by all Selenium scrapers"""
+
+    def __init__(self, max_size: int = 2, max_pages: int = 50, max_memory_mb: float = 512,
+                 checkout_timeout: float = 60.0, driver_factory=create_chrome_driver):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.checkout_timeout = checkout_timeout
+        self.driver_factory = driver_factory
+        self._idle: "queue.LifoQueue[PooledDriver]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._created = 0
+        self._recycled = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledDriver:
+        """Check out a healthy driver, starting a new one if none is idle"""
+        if self._closed:
+            raise RuntimeError("Driver pool has been shut down")
+
+        timeout = self.checkout_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No Chrome driver available after {timeout}s (pool size {self.max_size})")
+
+        try:
+            while True:
+                try:
+                    pooled = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._create()
+
+                if self._is_healthy(pooled):
+                    return pooled
+                logger.warning("🔁 Discarding unhealthy Chrome driver")
+                self._discard(pooled)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, pooled: PooledDriver, discard: bool = False, pages: int = 1):
+        """Return a driver to the pool, recycling it if it is worn out"""
+        try:
+            pooled.pages_served += pages
+            if discard or self._closed or self._should_recycle(pooled):
+                self._discard(pooled)
+            else:
+                self._idle.put(pooled)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None, pages: int = 1):
+        """Context manager yielding a checked-out webdriver; pages counts towards recycling"""
+        pooled = self.acquire(timeout)
+        failed = False
+        try:
+            yield pooled.driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.release(pooled, discard=failed and not self._is_healthy(pooled), pages=pages)
+
+    def warm(self, count: Optional[int] = None):
+        """Start drivers ahead of time so the first scrapes skip browser startup"""
+        count = min(count or self.max_size, self.max_size)
+        drivers = []
+        try:
+            for _ in range(count):
+                drivers.append(self.acquire())
+            logger.info(f"🔥 Warmed {count} Chrome drivers")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not warm the driver pool: {e}")
+        finally:
+            for pooled in drivers:
+                pooled.pages_served -= 1  # Warming does not count as a page
+                self.release(pooled)
+
+    def shutdown(self):
+        """Quit all idle drivers; checked-out drivers are quit on release"""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        logger.info("🛑 Chrome driver pool shut down")
+
+    def stats(self) -> Dict[str, int]:
+        """Get pool statistics"""
+        return {
+            "max_size": self.max_size,
+            "idle": self._idle.qsize(),
+            "created": self._created,
+            "recycled": self._recycled,
+        }
+
+    def _create(self) -> PooledDriver:
+        logger.info("🚀 Starting new Chrome driver for pool")
+        pooled = PooledDriver(self.driver_factory())
+        with self._lock:
+            self._created += 1
+        return pooled
+
+    def _discard(self, pooled: PooledDriver):
+        with self._lock:
+            self._recycled += 1
+        pooled.quit()
+
+    def _is_healthy(self, pooled: PooledDriver) -> bool:
+        try:
+            return pooled.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _should_recycle(self, pooled: PooledDriver) -> bool:
+        if pooled.pages_served >= self.max_pages:
+            logger.info(f"♻️ Recycling Chrome driver after {pooled.pages_served} pages")
+            return True
+
+        memory = pooled.memory_mb()
+        if memory is not None and memory > self.max_memory_mb:
+            logger.info(f"♻️ Recycling Chrome driver using {memory:.0f}MB")
+            return True
+        return False
+
+# Global driver pool shared by all scrapers
+driver_pool = DriverPool(
+    max_size=settings.SCRAPER_DRIVER_POOL_SIZE,
+    max_pages=settings.SCRAPER_DRIVER_MAX_PAGES,
+    max_memory_mb=settings.SCRAPER_DRIVER_MAX_MEMORY_MB,
+    checkout_timeout=settings.SCRAPER_DRIVER_CHECKOUT_TIMEOUT,
+)
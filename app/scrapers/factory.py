@@ -1,6 +1,8 @@
-from typing import Dict, Type
+from typing import Dict, Optional, Type
 from .selenium_base import SeleniumBaseScraper
 from .ndtv_scraper import NDTVScraper
+from .discovery import DiscoveryAdapter
+from .ndtv_discovery import NDTVDiscovery
 
 class ScraperFactory:
     """Factory for creating scrapers"""
@@ -12,6 +14,10 @@ class ScraperFactory:
         # 'times_of_india': TimesOfIndiaScraper,
     }
     
+    _discovery: Dict[str, Type[DiscoveryAdapter]] = {
+        'ndtv': NDTVDiscovery,
+    }
+    
     @classmethod
     def get_scraper(cls, platform: str) -> SeleniumBaseScraper:
         """Get a scraper instance for the specified platform"""
@@ -20,8 +26,9 @@ class ScraperFactory:
         if platform not in cls._scrapers:
             raise ValueError(f"Unsupported platform: {platform}. Available: {list(cls._scrapers.keys())}")
         
-        scraper_class = cls._scrapers[platform]
-        return scraper_class()
+        scraper = cls._scrapers[platform]()
+        scraper.platform = platform
+        return scraper
     
     @classmethod
     def get_available_platforms(cls) -> list:
@@ -29,6 +36,24 @@ class ScraperFactory:
         return list(cls._scrapers.keys())
     
     @classmethod
-    def register_scraper(cls, platform: str, scraper_class: Type[SeleniumBaseScraper]):
-        """Register a new scraper"""
-        cls._scrapers[platform.lower()] = scraper_class 
\ No newline at end of file
+    def register_scraper(cls, platform: str, scraper_class: Type[SeleniumBaseScraper],
+                         discovery_class: Optional[Type[DiscoveryAdapter]] = None):
+        """Register a new scraper, optionally with its URL discovery adapter"""
+        cls._scrapers[platform.lower()] = scraper_class
+        if discovery_class:
+            cls._discovery[platform.lower()] = discovery_class
+    
+    @classmethod
+    def get_discovery(cls, platform: str) -> DiscoveryAdapter:
+        """Get the URL discovery adapter for the specified platform"""
+        platform = platform.lower()
+        
+        if platform not in cls._discovery:
+            raise ValueError(f"No discovery adapter for platform: {platform}. Available: {list(cls._discovery.keys())}")
+        
+        return cls._discovery[platform]()
+    
+    @classmethod
+    def get_discoverable_platforms(cls) -> list:
+        """Get list of platforms that support URL discovery"""
+        return list(cls._discovery.keys()) 
\ No newline at end of file
@@ -0,0 +1,253 @@
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+import math
+import logging
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from .discovery import DiscoveredURL, DiscoveryAdapter
+from .factory import ScraperFactory
+from .models import ScrapedArticle
+from .unified_scraper import UnifiedScraper
+from .utils import canonicalize_url
+from ..config import settings
+from ..db.models import FrontierURL
+
+logger = logging.getLogger(__name__)
+
+def _default_session() -> Session:
+    # Imported on first use, so loading the scrapers does not create the database engine
+    from ..db.database import SessionLocal
+    return SessionLocal()
+
+class CrawlFrontier:
+    """Persistent, priority-ordered queue of article URLs for whole-day ingestion
+    
+    URLs come from each platform's discovery adapter (sitemaps and RSS feeds).
+    They are stored in the crawl_frontier table and handed to UnifiedScraper in
+    batches. Every URL's outcome is committed as soon as it finishes, so after
+    a crash the next run only has to reclaim rows whose lease expired. Failed
+    URLs wait out an exponential backoff before they are claimed again.
+    """
+    
+    def __init__(self, session_factory: Callable[[], Session] = _default_session, scraper: UnifiedScraper = None,
+                 half_life_hours: float = None, max_attempts: int = 3, lease_seconds: float = 900,
+                 retry_backoff_seconds: float = None):
+        self.session_factory = session_factory
+        self.scraper = scraper or UnifiedScraper()
+        self.half_life_hours = half_life_hours or settings.FRONTIER_HALF_LIFE_HOURS
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retry_backoff_seconds = (settings.FRONTIER_RETRY_BACKOFF_SECONDS if retry_backoff_seconds is None
+                                      else retry_backoff_seconds)
+    
+    def priority(self, item: DiscoveredURL, weight: float = 1.0) -> float:
+        """Freshness score that stays comparable across discovery runs
+        
+        Ordering by published_time + half_life * log2(weight) is the same as
+        ordering by weight * 2^(-age / half_life) at any moment, so scores
+        computed on different days never need re-ranking.
+        """
+        published = item.published_at or datetime.now(timezone.utc)
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=timezone.utc)
+        half_life = self.half_life_hours * 3600
+        return published.timestamp() + half_life * math.log2(max(weight, 1e-6))
+    
+    def discover(self, platforms: List[str] = None) -> int:
+        """Run discovery for the given (default: all) platforms and enqueue new URLs"""
+        added = 0
+        for platform in platforms or ScraperFactory.get_discoverable_platforms():
+            try:
+                adapter = ScraperFactory.get_discovery(platform)
+                added += self.add(adapter.discover(), adapter)
+            except Exception as e:
+                logger.error(f"Discovery failed for {platform}: {e}")
+        return added
+    
+    def add(self, items: Iterable[DiscoveredURL], adapter: DiscoveryAdapter = None) -> int:
+        """Enqueue URLs that are not in the frontier yet; returns how many were added"""
+        by_canonical = {}
+        for item in items:
+            by_canonical.setdefault(canonicalize_url(item.url), item)
+        if not by_canonical:
+            return 0
+        
+        session = self.session_factory()
+        try:
+            existing = {
+                row[0] for row in
+                session.query(FrontierURL.canonical_url).filter(FrontierURL.canonical_url.in_(list(by_canonical)))
+            }
+            new_rows = [
+                FrontierURL(
+                    canonical_url=canonical,
+                    url=item.url,
+                    platform=item.platform,
+                    section=item.section,
+                    published_at=item.published_at,
+                    priority=self.priority(item, adapter.section_weight(item.section) if adapter else 1.0),
+                    status="pending",
+                    attempts=0,
+                )
+                for canonical, item in by_canonical.items() if canonical not in existing
+            ]
+            session.add_all(new_rows)
+            session.commit()
+            logger.info(f"🧭 Added {len(new_rows)} URLs to the crawl frontier")
+            return len(new_rows)
+        finally:
+            session.close()
+    
+    def claim_batch(self, size: int) -> List[Dict]:
+        """Lease the highest-priority pending URLs; safe with concurrent crawlers"""
+        now = datetime.now()
+        session = self.session_factory()
+        try:
+            rows = (
+                session.query(FrontierURL)
+                .filter(
+                    FrontierURL.status == "pending",
+                    or_(FrontierURL.not_before.is_(None), FrontierURL.not_before <= now),
+                )
+                .order_by(FrontierURL.priority.desc())
+                .limit(size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            claimed = []
+            for row in rows:
+                row.status = "in_progress"
+                row.claimed_at = now
+                row.attempts += 1
+                claimed.append({"id": row.id, "url": row.url, "platform": row.platform})
+            session.commit()
+            return claimed
+        finally:
+            session.close()
+    
+    def complete(self, item_id):
+        """Checkpoint a URL as done"""
+        session = self.session_factory()
+        try:
+            row = session.get(FrontierURL, item_id)
+            if row is not None:
+                row.status = "done"
+                row.last_error = None
+                row.not_before = None
+                row.finished_at = datetime.now()
+                session.commit()
+        finally:
+            session.close()
+    
+    def fail(self, item_id, error: str):
+        """Requeue a URL after a backoff, or mark it failed once it has used up its attempts
+        
+        The backoff doubles with each attempt, so a failing URL is not claimed
+        again in the same crawl pass and a flaky source gets time to recover.
+        """
+        session = self.session_factory()
+        try:
+            row = session.get(FrontierURL, item_id)
+            if row is None:
+                return
+            row.last_error = error
+            if row.attempts >= self.max_attempts:
+                row.status = "failed"
+                row.finished_at = datetime.now()
+            else:
+                row.status = "pending"
+                row.claimed_at = None
+                backoff = self.retry_backoff_seconds * 2 ** max(0, row.attempts - 1)
+                row.not_before = datetime.now() + timedelta(seconds=backoff)
+            session.commit()
+        finally:
+            session.close()
+    
+    def release(self, item_id):
+        """Return a claimed URL to the queue without using up an attempt"""
+        session = self.session_factory()
+        try:
+            row = session.get(FrontierURL, item_id)
+            if row is not None:
+                row.status = "pending"
+                row.claimed_at = None
+                row.attempts = max(0, row.attempts - 1)
+                session.commit()
+        finally:
+            session.close()
+    
+    def recover_stale(self) -> int:
+        """Return URLs leased by a crashed run to the queue"""
+        cutoff = datetime.now() - timedelta(seconds=self.lease_seconds)
+        session = self.session_factory()
+        try:
+            recovered = (
+                session.query(FrontierURL)
+                .filter(FrontierURL.status == "in_progress", FrontierURL.claimed_at < cutoff)
+                .update({"status": "pending", "claimed_at": None}, synchronize_session=False)
+            )
+            session.commit()
+            if recovered:
+                logger.info(f"♻️ Recovered {recovered} URLs from an interrupted crawl")
+            return recovered
+        finally:
+            session.close()
+    
+    def run(self, batch_size: int = 20, max_batches: Optional[int] = None,
+            on_article: Callable[[ScrapedArticle], None] = None) -> Dict[str, int]:
+        """Crawl until the frontier is empty (or max_batches), checkpointing each URL"""
+        self.recover_stale()
+        totals = {"done": 0, "failed": 0, "deferred": 0}
+        batches = 0
+        
+        while max_batches is None or batches < max_batches:
+            batch = self.claim_batch(batch_size)
+            if not batch:
+                break
+            batches += 1
+            logger.info(f"🕷️ Crawling frontier batch {batches} ({len(batch)} URLs)")
+            
+            urls = [{"url": item["url"], "platform": item["platform"]} for item in batch]
+            deferred = 0
+            for index, article in self.scraper.iter_scrape_articles(urls):
+                item = batch[index]
+                if article.status == "circuit_open":
+                    # The source is backing off; leave the URL for a later run
+                    self.release(item["id"])
+                    deferred += 1
+                    continue
+                if article.status not in ("success", "duplicate"):
+                    self.fail(item["id"], f"scrape {article.status}")
+                    totals["failed"] += 1
+                    continue
+                
+                try:
+                    if on_article and article.status == "success":
+                        on_article(article)
+                except Exception as e:
+                    logger.error(f"Error handling crawled article {article.url}: {e}")
+                    self.fail(item["id"], str(e))
+                    totals["failed"] += 1
+                    continue
+                
+                self.complete(item["id"])
+                totals["done"] += 1
+            
+            totals["deferred"] += deferred
+            if deferred == len(batch):
+                logger.warning("⏸️ Every source in the batch is throttled, stopping the crawl")
+                break
+        
+        logger.info(f"🕷️ Crawl finished: {totals}")
+        return totals
+    
+    def stats(self) -> Dict[str, int]:
+        """Count frontier URLs by status"""
+        session = self.session_factory()
+        try:
+            rows = session.query(FrontierURL.status, func.count(FrontierURL.id)).group_by(FrontierURL.status)
+            return {status: count for status, count in rows}
+        finally:
+            session.close()
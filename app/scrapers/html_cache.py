@@ -0,0 +1,204 @@
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+import gzip
+import hashlib
+import sqlite3
+import threading
+import time
+import logging
+
+from .utils import normalize_page_url
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+class CacheEntry(NamedTuple):
+    """A cached page and the validators needed to re-check it"""
+    url: str
+    html: str
+    source: str  # "http" or "browser"
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+class HTMLCache:
+    """On-disk cache of raw article HTML, keyed by page URL
+    
+    Keys only drop what cannot change the page (case, fragments, tracking
+    parameters). Mobile and AMP mirrors serve different HTML, so they are
+    cached separately even though dedup treats them as one article.
+    
+    Page bodies are stored gzip-compressed under their content hash, so the same
+    HTML reached through different URLs is kept once. A SQLite index maps URLs
+    to bodies and tracks validators for conditional GETs and access times for
+    LRU eviction.
+    """
+    
+    def __init__(self, cache_dir: str, ttl: float = 3600, max_bytes: int = 500 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+    
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Get the cached page for a URL, fresh or not"""
+        key = self._key(url)
+        with self._lock:
+            row = self._db().execute(
+                "SELECT content_hash, source, etag, last_modified, fetched_at FROM entries WHERE url_key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db().execute("UPDATE entries SET accessed_at = ? WHERE url_key = ?", (time.time(), key))
+            self._db().commit()
+        
+        content_hash, source, etag, last_modified, fetched_at = row
+        try:
+            html = gzip.decompress(self._object_path(content_hash).read_bytes()).decode('utf-8')
+        except (OSError, EOFError) as e:
+            logger.warning(f"Cached body missing for {url}: {e}")
+            self.invalidate(url)
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return CacheEntry(normalize_page_url(url), html, source, etag, last_modified, fetched_at)
+    
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Whether an entry is within the TTL and can be served without the network"""
+        return time.time() - entry.fetched_at < self.ttl
+    
+    def conditional_headers(self, entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """Headers for a conditional GET that revalidates a stale entry"""
+        headers = {}
+        if entry and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry and entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+    
+    def put(self, url: str, html: str, source: str = "http", etag: str = None, last_modified: str = None):
+        """Store a page body and its validators"""
+        body = html.encode('utf-8')
+        content_hash = hashlib.sha256(body).hexdigest()
+        key = self._key(url)
+        path = self._object_path(content_hash)
+        now = time.time()
+        
+        with self._lock:
+            # Drop the previous version first so its body is released if unshared
+            self._delete_entry(key)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix('.tmp')
+                tmp.write_bytes(gzip.compress(body))
+                tmp.replace(path)
+            
+            self._db().execute(
+                "INSERT INTO entries "
+                "(url_key, url, content_hash, size, source, etag, last_modified, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, normalize_page_url(url), content_hash, path.stat().st_size,
+                 source, etag, last_modified, now, now)
+            )
+            self._db().commit()
+        self.evict()
+    
+    def refresh(self, url: str):
+        """Mark an entry as freshly validated after a 304 Not Modified"""
+        self.revalidated += 1
+        with self._lock:
+            self._db().execute("UPDATE entries SET fetched_at = ? WHERE url_key = ?", (time.time(), self._key(url)))
+            self._db().commit()
+    
+    def invalidate(self, url: str):
+        """Forget a URL; its body is removed once nothing references it"""
+        with self._lock:
+            self._delete_entry(self._key(url))
+            self._db().commit()
+    
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        with self._lock:
+            db = self._db()
+            total = self._total_bytes()
+            if total <= self.max_bytes:
+                return
+            
+            rows = db.execute("SELECT url_key FROM entries ORDER BY accessed_at ASC").fetchall()
+            evicted = 0
+            for (key,) in rows:
+                total -= self._delete_entry(key)
+                evicted += 1
+                if total <= self.max_bytes:
+                    break
+            db.commit()
+            logger.info(f"🧹 Evicted {evicted} cached pages")
+    
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        with self._lock:
+            entries = self._db().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            total = self._total_bytes()
+        return {
+            "entries": entries,
+            "bytes": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+        }
+    
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(normalize_page_url(url).encode('utf-8')).hexdigest()
+    
+    def _object_path(self, content_hash: str) -> Path:
+        return self.cache_dir / "objects" / content_hash[:2] / f"{content_hash}.html.gz"
+    
+    def _total_bytes(self) -> int:
+        row = self._db().execute(
+            "SELECT SUM(size) FROM (SELECT MAX(size) AS size FROM entries GROUP BY content_hash)"
+        ).fetchone()
+        return row[0] or 0
+    
+    def _delete_entry(self, key: str) -> int:
+        """Delete an index row and, if unreferenced, its body; returns bytes freed"""
+        db = self._db()
+        row = db.execute("SELECT content_hash, size FROM entries WHERE url_key = ?", (key,)).fetchone()
+        if row is None:
+            return 0
+        
+        content_hash, size = row
+        db.execute("DELETE FROM entries WHERE url_key = ?", (key,))
+        if db.execute("SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)).fetchone():
+            return 0
+        
+        self._object_path(content_hash).unlink(missing_ok=True)
+        return size
+    
+    def _db(self) -> sqlite3.Connection:
+        """Open the index lazily so importing the module does not touch disk"""
+        if self._conn is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.cache_dir / "index.sqlite3"), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "url_key TEXT PRIMARY KEY, url TEXT NOT NULL, content_hash TEXT NOT NULL, "
+                "size INTEGER NOT NULL, source TEXT NOT NULL, etag TEXT, last_modified TEXT, "
+                "fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_accessed ON entries (accessed_at)")
+            self._conn.commit()
+        return self._conn
+
+# Global HTML cache shared by all scrapers (None when disabled)
+html_cache = HTMLCache(
+    settings.SCRAPER_CACHE_DIR,
+    ttl=settings.SCRAPER_CACHE_TTL,
+    max_bytes=int(settings.SCRAPER_CACHE_MAX_MB * 1024 * 1024),
+) if settings.SCRAPER_CACHE_ENABLED else None
@@ -0,0 +1,57 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import logging
+
+from .html_cache import HTMLCache
+from .utils import rotate_session_headers
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-IN,en;q=0.9,hi;q=0.8',
+    'Connection': 'keep-alive',
+}
+
+def create_session(pool_size: int = 10) -> requests.Session:
+    """Create a keep-alive session with a pooled connection adapter"""
+    session = requests.Session()
+    retries = Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    rotate_session_headers(session)
+    return session
+
+def fetch_html(url: str, session: requests.Session = None, timeout: float = None, cache: HTMLCache = None) -> str:
+    """Fetch server-rendered HTML for a URL, raising on HTTP errors
+    
+    With a cache, fresh entries are served from disk and stale ones are
+    revalidated with a conditional GET.
+    """
+    entry = cache.get(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        logger.info(f"💾 Serving cached HTML: {url}")
+        return entry.html
+    
+    session = session or http_session
+    rotate_session_headers(session)
+    headers = cache.conditional_headers(entry) if cache else {}
+    response = session.get(url, headers=headers, timeout=timeout or settings.SCRAPER_HTTP_TIMEOUT)
+    
+    if response.status_code == 304 and entry:
+        logger.info(f"💾 Not modified, serving cached HTML: {url}")
+        cache.refresh(url)
+        return entry.html
+    
+    response.raise_for_status()
+    if cache:
+        cache.put(url, response.text, source="http",
+                  etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'))
+    return response.text
+
+# Global keep-alive session shared by all scrapers
+http_session = create_session(settings.SCRAPER_HTTP_POOL_SIZE)
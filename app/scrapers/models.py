@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 class ScrapedArticle(BaseModel):
     """Data Model for Scraped Articles"""
@@ -15,6 +15,9 @@ class ScrapedArticle(BaseModel):
     language: Optional[str] = None
     scraped_at: datetime
     status: str = "success"
+    fetched_via: Optional[str] = None  # "http" or "browser"
+    timings: Dict[str, float] = {}
+    network: Dict[str, float] = {}  # Requests, bytes and blocked resources for browser fetches
 
     # Pydantic v2 configuration
     model_config = ConfigDict(
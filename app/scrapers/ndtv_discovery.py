@@ -0,0 +1,25 @@
+from .discovery import SitemapRSSDiscovery
+
+class NDTVDiscovery(SitemapRSSDiscovery):
+    """Discovers NDTV articles from its news sitemap and section RSS feeds"""
+    
+    platform = "ndtv"
+    sitemap_urls = [
+        'https://www.ndtv.com/sitemap/google-news-sitemap',
+    ]
+    feed_urls = [
+        'https://feeds.feedburner.com/ndtvnews-top-stories',
+        'https://feeds.feedburner.com/ndtvnews-india-news',
+        'https://feeds.feedburner.com/ndtvnews-world-news',
+        'https://feeds.feedburner.com/ndtvprofit-latest',
+    ]
+    section_weights = {
+        'india-news': 1.5,
+        'world-news': 1.2,
+        'business': 1.0,
+        'cities': 1.0,
+        'sports': 0.8,
+        'entertainment': 0.6,
+        'photos': 0.2,
+        'videos': 0.2,
+    }
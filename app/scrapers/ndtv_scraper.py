@@ -1,12 +1,22 @@
 from bs4 import BeautifulSoup
+from typing import Any, Callable, Dict, List, Optional
 from .selenium_base import SeleniumBaseScraper
+from .parsing import DEFAULT_PRUNE_TAGS
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Containers holding the article body, in order of preference
+CONTENT_CLASSES = ('sp-descp', 'Art-exp_wr')
+
 class NDTVScraper(SeleniumBaseScraper):
     """NDTV scraper using Selenium"""
     
+    ready_selectors = ['.sp-descp', '.Art-exp_wr']
+    # Menus, related stories and footers are dropped; the byline nav is kept for metadata
+    prune_tags = DEFAULT_PRUNE_TAGS + ('nav', 'aside', 'footer')
+    prune_keep_markers = ('pst-by',)
+    
     def __init__(self):
         super().__init__("NDTV")
     
@@ -36,26 +46,34 @@ class NDTVScraper(SeleniumBaseScraper):
         for selector in selectors:
             elements = soup.select(selector)
             if elements:
-                content_parts = []
-                for elem in elements:
-                    # Get all paragraphs
-                    paragraphs = elem.find_all('p')
-                    for p in paragraphs:
-                        text = p.get_text(strip=True)
-                        content_parts.append(text)
-                
-                if content_parts:
-                    return ' '.join(content_parts)
+                content = self._join_paragraphs(elements)
+                if content:
+                    return content
         
         return ""
     
+    def _join_paragraphs(self, elements: List) -> str:
+        """Join the text of all paragraphs inside the given containers"""
+        content_parts = []
+        for elem in elements:
+            # Get all paragraphs
+            paragraphs = elem.find_all('p')
+            for p in paragraphs:
+                text = p.get_text(strip=True)
+                content_parts.append(text)
+        return ' '.join(content_parts)
+    
     def extract_metadata(self, soup: BeautifulSoup) -> dict:
         """Extract metadata from NDTV"""
+        # Find the navigation section with metadata
+        nav_section = soup.find('nav', {'class': 'pst-by'})
+        return self._metadata_from(soup, nav_section, lambda name: soup.find('meta', {'name': name}))
+    
+    def _metadata_from(self, soup: BeautifulSoup, nav_section, find_meta: Callable[[str], Optional[Any]]) -> dict:
+        """Build metadata from the byline nav, meta tags and fallback selectors"""
         metadata = {}
         
         try:
-            # Find the navigation section with metadata
-            nav_section = soup.find('nav', {'class': 'pst-by'})
             if nav_section:
                 # Extract Author
                 author_spans = nav_section.find_all('span', {'class': 'pst-by_txt'})
@@ -66,7 +84,7 @@ class NDTVScraper(SeleniumBaseScraper):
                         break
                 
                 # Extract Language from meta tag, default to "English"
-                lang_meta = soup.find('meta', {'name': 'inLanguage'})
+                lang_meta = find_meta('inLanguage')
                 if lang_meta:
                     metadata['language'] = lang_meta.get('content', 'English')
                 else:
@@ -74,7 +92,7 @@ class NDTVScraper(SeleniumBaseScraper):
                 
                 # Extract Published Date from multiple sources
                 # 1. Try meta tag first (most accurate)
-                publish_meta = soup.find('meta', {'name': 'publish-date'})
+                publish_meta = find_meta('publish-date')
                 if publish_meta:
                     metadata['published_date'] = publish_meta.get('content', '')
                 else:
@@ -123,15 +141,10 @@ class NDTVScraper(SeleniumBaseScraper):
             for selector in image_selectors:
                 elem = soup.select_one(selector)
                 if elem:
-                    # Get image URL from src attribute
-                    image_url = elem.get('src') or elem.get('data-src')
+                    # Meta tags carry the URL in content, images in src
+                    image_url = elem.get('content') or elem.get('src') or elem.get('data-src')
                     if image_url:
-                        # Handle relative URLs
-                        if image_url.startswith('//'):
-                            image_url = 'https:' + image_url
-                        elif image_url.startswith('/'):
-                            image_url = 'https://www.ndtv.com' + image_url
-                        return image_url
+                        return self._absolute_image_url(image_url)
             
             # Try meta tags for Open Graph images
             og_image = soup.find('meta', {'property': 'og:image'})
@@ -150,4 +163,77 @@ class NDTVScraper(SeleniumBaseScraper):
         except Exception as e:
             logger.error(f"Error extracting image: {e}")
         
-        return ""
\ No newline at end of file
+        return ""
+    
+    def _absolute_image_url(self, image_url: str) -> str:
+        """Handle relative image URLs"""
+        if image_url.startswith('//'):
+            return 'https:' + image_url
+        if image_url.startswith('/'):
+            return 'https://www.ndtv.com' + image_url
+        return image_url
+    
+    def extract_all(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        """Extract all fields from a single walk over the parsed tree
+        
+        Falls back to the per-field selector methods only for fields the walk
+        could not resolve, so results match the individual extractors.
+        """
+        h1s = []
+        metas = {}
+        containers = {cls: [] for cls in CONTENT_CLASSES}
+        nav_section = None
+        
+        for tag in soup.find_all(True):
+            if tag.name == 'meta':
+                for attr in ('name', 'property'):
+                    key = tag.get(attr)
+                    if key and key not in metas:
+                        metas[key] = tag
+            elif tag.name == 'h1':
+                h1s.append(tag)
+            
+            classes = tag.get('class')
+            if classes:
+                if tag.name == 'nav' and nav_section is None and 'pst-by' in classes:
+                    nav_section = tag
+                for cls in CONTENT_CLASSES:
+                    if cls in classes:
+                        containers[cls].append(tag)
+        
+        title = self._title_from_headings(h1s)
+        if not title and not h1s:
+            title = self.extract_title(soup)
+        
+        content = ""
+        for cls in CONTENT_CLASSES:
+            content = self._join_paragraphs(containers[cls])
+            if content:
+                break
+        
+        metadata = self._metadata_from(soup, nav_section, lambda name: metas.get(name))
+        
+        image_url = ""
+        for key in ('og:image', 'twitter:image'):
+            if key in metas and metas[key].get('content'):
+                image_url = self._absolute_image_url(metas[key]['content'])
+                break
+        if not image_url:
+            image_url = self.extract_image(soup)
+        
+        return {
+            'title': title,
+            'content': content,
+            'metadata': metadata,
+            'image_url': image_url,
+        }
+    
+    def _title_from_headings(self, h1s: List) -> str:
+        """Apply the h1 title selectors' priority to pre-collected headings"""
+        for marker in ('title', 'headline'):
+            for h1 in h1s:
+                if marker in ' '.join(h1.get('class', [])):
+                    return h1.get_text(strip=True)
+        if h1s:
+            return h1s[0].get_text(strip=True)
+        return ""
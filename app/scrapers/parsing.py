@@ -0,0 +1,101 @@
+from bs4 import BeautifulSoup
+from functools import lru_cache
+from typing import Iterable, Pattern
+import importlib.util
+import re
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tags that never carry article text and are dropped before parsing
+DEFAULT_PRUNE_TAGS = ('script', 'style', 'noscript', 'svg', 'iframe', 'template')
+
+# BeautifulSoup tree builders and the module each one needs
+PARSER_BACKENDS = {
+    'lxml': 'lxml',
+    'html5lib': 'html5lib',
+    'html.parser': None,
+}
+
+@lru_cache(maxsize=None)
+def resolve_parser(name: str = None) -> str:
+    """Pick the configured parser backend, falling back to html.parser if it is not installed"""
+    name = name or settings.SCRAPER_HTML_PARSER
+    if name not in PARSER_BACKENDS:
+        logger.warning(f"Unknown HTML parser '{name}', using html.parser")
+        return 'html.parser'
+
+    module = PARSER_BACKENDS[name]
+    if module and importlib.util.find_spec(module) is None:
+        logger.warning(f"HTML parser '{name}' is not installed, using html.parser")
+        return 'html.parser'
+    return name
+
+# Elements whose content is raw text: only their own end tag closes them
+RAW_TEXT_TAGS = ('script', 'style')
+
+@lru_cache(maxsize=32)
+def _prune_pattern(tags: tuple) -> Pattern:
+    names = '|'.join(re.escape(tag) for tag in tags)
+    return re.compile(rf'<!--.*?-->|<(/?)({names})\b([^>]*)>', re.IGNORECASE | re.DOTALL)
+
+def prune_html(html: str, tags: Iterable[str] = DEFAULT_PRUNE_TAGS, keep_markers: Iterable[str] = ()) -> str:
+    """Drop HTML comments and whole elements of the given tags from raw HTML before it is parsed
+
+    Opening and closing tags are paired by depth, so nested elements (an svg
+    inside an svg) are dropped as one. Elements whose opening tag contains one
+    of keep_markers (e.g. a class name an extractor relies on) are left in
+    place, and an element that is never closed is kept rather than dropping
+    the rest of the page.
+    """
+    tags = tuple(tag.lower() for tag in tags)
+    if not tags:
+        return html
+
+    keep_markers = tuple(keep_markers)
+    parts = []
+    pos = 0
+    open_tags = []  # Names of the elements open inside the one being dropped or kept, outermost first
+    start = 0
+    keep = False
+    for match in _prune_pattern(tags).finditer(html):
+        closing, name, attrs = match.groups()
+        if name is None:
+            # A comment outside a pruned element; its content never reaches the parser
+            if not open_tags:
+                parts.append(html[pos:match.start()])
+                pos = match.end()
+            continue
+
+        name = name.lower()
+        self_closing = not closing and attrs.rstrip().endswith('/')
+        if not open_tags:
+            if closing:
+                continue  # A stray end tag; the parser ignores it
+            keep = bool(keep_markers) and any(marker in attrs for marker in keep_markers)
+            start = match.start()
+            if not self_closing:
+                open_tags.append(name)
+        elif open_tags[0] in RAW_TEXT_TAGS:
+            if closing and name == open_tags[0]:
+                open_tags.clear()
+        elif closing:
+            if name in open_tags:
+                del open_tags[len(open_tags) - 1 - open_tags[::-1].index(name):]
+        elif not self_closing:
+            open_tags.append(name)
+
+        if not open_tags and not keep:
+            parts.append(html[pos:start])
+            pos = match.end()
+
+    # An element still open here is left in place along with the rest of the page
+    parts.append(html[pos:])
+    return ''.join(parts)
+
+def parse_html(html: str, parser: str = None, prune_tags: Iterable[str] = DEFAULT_PRUNE_TAGS,
+               keep_markers: Iterable[str] = ()) -> BeautifulSoup:
+    """Prune and parse HTML with the configured backend"""
+    return BeautifulSoup(prune_html(html, prune_tags, keep_markers), resolve_parser(parser))
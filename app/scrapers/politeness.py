@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+from typing import Dict
+from urllib.parse import urlparse
+import threading
+import time
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+def get_domain(url: str) -> str:
+    """Get the host a URL points at, without a leading www."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+class DomainThrottle:
+    """Caps in-flight requests and spaces out request starts per domain"""
+    
+    def __init__(self, max_per_domain: int = 2, min_interval: float = 0.5):
+        self.max_per_domain = max_per_domain
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._in_flight: Dict[str, int] = {}
+        self._next_start: Dict[str, float] = {}
+    
+    @contextmanager
+    def slot(self, url: str, count: int = 1):
+        """Hold count of the domain's request slots, waiting for politeness first
+        
+        A group of requests sent together (pages loading in tabs of one
+        browser) takes one slot and one start interval per request, so it
+        counts against the domain's limits like the same number of single
+        requests. count is capped at max_per_domain.
+        """
+        domain = get_domain(url)
+        count = max(1, min(count, self.max_per_domain))
+        with self._released:
+            while self._in_flight.get(domain, 0) + count > self.max_per_domain:
+                self._released.wait()
+            self._in_flight[domain] = self._in_flight.get(domain, 0) + count
+        try:
+            wait = self._reserve_start(domain, count)
+            if wait > 0:
+                time.sleep(wait)
+            yield
+        finally:
+            with self._released:
+                self._in_flight[domain] -= count
+                self._released.notify_all()
+    
+    def _reserve_start(self, domain: str, count: int = 1) -> float:
+        """Book the next count start times for a domain; returns seconds to wait until the last one"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(domain, now))
+            self._next_start[domain] = start + count * self.min_interval
+            return start + (count - 1) * self.min_interval - now
+
+# Global throttle shared by all scraping entry points
+domain_throttle = DomainThrottle(
+    max_per_domain=settings.SCRAPER_PER_DOMAIN_CONCURRENCY,
+    min_interval=settings.SCRAPER_DOMAIN_MIN_INTERVAL,
+)
@@ -0,0 +1,211 @@
+from typing import Callable, Dict, Optional, Tuple
+import threading
+import time
+import logging
+
+from .politeness import get_domain
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """Raised when a domain's circuit breaker is refusing new work"""
+    
+    def __init__(self, domain: str, retry_after: float):
+        super().__init__(f"Circuit open for {domain}, retry in {retry_after:.0f}s")
+        self.domain = domain
+        self.retry_after = retry_after
+
+class DomainState:
+    """Token bucket, AIMD rate and circuit breaker for one domain"""
+    
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = now
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.probes_in_flight = 0
+        self.consecutive_failures = 0
+        self.latency_ewma: Optional[float] = None
+        self.error_ewma = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.rejected = 0
+    
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+class AdaptiveRateController:
+    """Shared per-domain request pacing that reacts to how the source is coping
+    
+    Each domain gets a token bucket whose refill rate follows AIMD: it grows
+    additively while requests succeed within the target latency and halves on
+    an error or a slow response. After failure_threshold consecutive failures
+    the domain's circuit opens and new work is refused for cooldown seconds.
+    It is then half-open, and a limited number of probe requests decide
+    whether it closes again or re-opens.
+    """
+    
+    def __init__(self, initial_rate: float = 1.0, min_rate: float = 0.1, max_rate: float = 4.0,
+                 increase: float = 0.1, decrease: float = 0.5, target_latency: float = 8.0,
+                 failure_threshold: int = 5, cooldown: float = 60.0, half_open_probes: int = 1,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.target_latency = target_latency
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._domains: Dict[str, DomainState] = {}
+    
+    def acquire(self, url: str, timeout: Optional[float] = None) -> bool:
+        """Wait for a token for the URL's domain; raises CircuitOpenError if the breaker is open
+        
+        Returns True if the request is a half-open probe; pass that on to
+        record() so only the probe's outcome closes or re-opens the breaker.
+        """
+        domain = get_domain(url)
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            with self._lock:
+                wait, probe = self._try_acquire(domain)
+            if wait <= 0:
+                return probe
+            if deadline is not None and self.clock() + wait > deadline:
+                raise TimeoutError(f"No request token for {domain} within {timeout}s")
+            self.sleep(wait)
+    
+    def record(self, url: str, latency: float, success: bool, probe: bool = False):
+        """Feed a request outcome back into the domain's rate and breaker
+        
+        Requests admitted before the breaker opened can finish while it is
+        half-open; only the probe acquire() handed out decides the breaker.
+        """
+        domain = get_domain(url)
+        with self._lock:
+            state = self._state(domain)
+            now = self.clock()
+            state.requests += 1
+            state.latency_ewma = latency if state.latency_ewma is None else 0.8 * state.latency_ewma + 0.2 * latency
+            state.error_ewma = 0.8 * state.error_ewma + (0.0 if success else 0.2)
+            was_probe = probe and state.state == HALF_OPEN
+            if was_probe:
+                state.probes_in_flight = max(0, state.probes_in_flight - 1)
+            
+            if not success:
+                state.failures += 1
+                state.consecutive_failures += 1
+                state.rate = max(self.min_rate, state.rate * self.decrease)
+                if was_probe or state.consecutive_failures >= self.failure_threshold:
+                    self._open(domain, state, now)
+                return
+            
+            state.consecutive_failures = 0
+            if latency > self.target_latency:
+                state.rate = max(self.min_rate, state.rate * self.decrease)
+            else:
+                state.rate = min(self.max_rate, state.rate + self.increase)
+            if was_probe:
+                state.state = CLOSED
+                state.opened_at = None
+                logger.info(f"✅ Circuit closed for {domain}, resuming at {state.rate:.2f} req/s")
+    
+    def reset(self, domain: str) -> bool:
+        """Close a domain's breaker and restore its initial rate; False if the domain is unknown"""
+        with self._lock:
+            if domain not in self._domains:
+                return False
+            self._domains[domain] = DomainState(self.initial_rate, self._burst(), self.clock())
+            logger.info(f"🔄 Rate control reset for {domain}")
+            return True
+    
+    def snapshot(self) -> Dict[str, Dict]:
+        """Current rate, breaker state and error figures for every domain seen"""
+        with self._lock:
+            now = self.clock()
+            result = {}
+            for domain, state in self._domains.items():
+                self._advance(state, now)
+                result[domain] = {
+                    "state": state.state,
+                    "rate_per_s": round(state.rate, 3),
+                    "throttled": state.state != CLOSED or state.rate < self.initial_rate,
+                    "retry_after_s": round(self._retry_after(state, now), 1) if state.state == OPEN else None,
+                    "consecutive_failures": state.consecutive_failures,
+                    "error_rate": round(state.error_ewma, 3),
+                    "latency_s": round(state.latency_ewma, 3) if state.latency_ewma is not None else None,
+                    "requests": state.requests,
+                    "failures": state.failures,
+                    "rejected": state.rejected,
+                }
+            return result
+    
+    def _try_acquire(self, domain: str) -> Tuple[float, bool]:
+        """Take a token if possible; returns 0 on success or seconds to wait, and whether it is a probe"""
+        state = self._state(domain)
+        now = self.clock()
+        self._advance(state, now)
+        
+        if state.state == OPEN:
+            state.rejected += 1
+            raise CircuitOpenError(domain, self._retry_after(state, now))
+        if state.state == HALF_OPEN:
+            if state.probes_in_flight >= self.half_open_probes:
+                state.rejected += 1
+                raise CircuitOpenError(domain, 0)
+            state.probes_in_flight += 1
+            return 0, True
+        
+        state.refill(now)
+        if state.tokens >= 1:
+            state.tokens -= 1
+            return 0, False
+        return (1 - state.tokens) / state.rate, False
+    
+    def _advance(self, state: DomainState, now: float):
+        """Move an open breaker to half-open once its cooldown has passed"""
+        if state.state == OPEN and now - state.opened_at >= self.cooldown:
+            state.state = HALF_OPEN
+            state.probes_in_flight = 0
+    
+    def _open(self, domain: str, state: DomainState, now: float):
+        state.state = OPEN
+        state.opened_at = now
+        state.tokens = 0
+        state.updated_at = now
+        logger.warning(f"🚫 Circuit open for {domain} after {state.consecutive_failures} failures, "
+                       f"pausing for {self.cooldown:.0f}s")
+    
+    def _retry_after(self, state: DomainState, now: float) -> float:
+        return max(0.0, self.cooldown - (now - state.opened_at))
+    
+    def _state(self, domain: str) -> DomainState:
+        if domain not in self._domains:
+            self._domains[domain] = DomainState(self.initial_rate, self._burst(), self.clock())
+        return self._domains[domain]
+    
+    def _burst(self) -> float:
+        return max(1.0, self.initial_rate)
+
+# Global controller shared by all scraping entry points
+rate_controller = AdaptiveRateController(
+    initial_rate=settings.SCRAPER_RATE_INITIAL,
+    min_rate=settings.SCRAPER_RATE_MIN,
+    max_rate=settings.SCRAPER_RATE_MAX,
+    target_latency=settings.SCRAPER_TARGET_LATENCY,
+    failure_threshold=settings.SCRAPER_BREAKER_FAILURES,
+    cooldown=settings.SCRAPER_BREAKER_COOLDOWN,
+)
@@ -0,0 +1,119 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# CDP wildcard patterns for resources article extraction never needs
+BLOCKED_IMAGES = ('*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico')
+BLOCKED_FONTS = ('*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot')
+BLOCKED_MEDIA = ('*.mp4', '*.webm', '*.m3u8', '*.mp3')
+BLOCKED_TRACKERS = (
+    '*doubleclick.net*',
+    '*googlesyndication.com*',
+    '*googletagmanager.com*',
+    '*googletagservices.com*',
+    '*google-analytics.com*',
+    '*adservice.google.*',
+    '*amazon-adsystem.com*',
+    '*scorecardresearch.com*',
+    '*facebook.net*',
+    '*taboola.com*',
+    '*outbrain.com*',
+    '*chartbeat.com*',
+    '*hotjar.com*',
+    '*criteo.com*',
+    '*moatads.com*',
+)
+DEFAULT_BLOCKED_PATTERNS = BLOCKED_IMAGES + BLOCKED_FONTS + BLOCKED_MEDIA + BLOCKED_TRACKERS
+
+# Typical transfer size per resource type, used to estimate what a blocked request would have cost
+TYPICAL_RESOURCE_BYTES = {
+    'Image': 60_000,
+    'Font': 40_000,
+    'Media': 500_000,
+    'Script': 35_000,
+    'Stylesheet': 20_000,
+    'XHR': 5_000,
+    'Fetch': 5_000,
+}
+DEFAULT_RESOURCE_BYTES = 10_000
+
+def apply_resource_blocking(driver, blocked: Iterable[str], allowed: Iterable[str] = ()) -> bool:
+    """Install URL blocking rules on a driver through the DevTools protocol
+
+    Allowlisted patterns take precedence. Chrome versions whose setBlockedURLs
+    only takes a flat block list get the block patterns minus any that are
+    themselves allowlisted. Returns False if the driver has no CDP support.
+    """
+    allowed = list(allowed)
+    blocked = [pattern for pattern in blocked if pattern not in allowed]
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        if allowed:
+            try:
+                patterns = [{'urlPattern': p, 'block': False} for p in allowed]
+                patterns += [{'urlPattern': p, 'block': True} for p in blocked]
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urlPatterns': patterns})
+                return True
+            except Exception as e:
+                logger.debug(f"Ordered block patterns unsupported, falling back to a flat list: {e}")
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked})
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Could not enable resource blocking: {e}")
+        return False
+
+def drain_network_events(driver) -> List[Dict]:
+    """Read and clear the driver's performance log, returning Network.* events"""
+    try:
+        entries = driver.get_log('performance')
+    except Exception:
+        return []
+
+    events = []
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, TypeError, ValueError):
+            continue
+        if message.get('method', '').startswith('Network.'):
+            events.append(message)
+    return events
+
+def summarize_network(events: Iterable[Dict], load_seconds: Optional[float] = None) -> Dict[str, float]:
+    """Per-page request, byte and blocking counts from DevTools network events
+
+    Blocked requests never transfer anything, so their cost is estimated from
+    TYPICAL_RESOURCE_BYTES and, given the page load time, converted into an
+    estimate of seconds saved at the throughput the page actually achieved.
+    """
+    types = {}
+    requests = 0
+    transferred = 0
+    blocked = Counter()
+    for event in events:
+        method, params = event.get('method'), event.get('params', {})
+        request_id = params.get('requestId')
+        if method == 'Network.requestWillBeSent':
+            requests += 1
+            types[request_id] = params.get('type', 'Other')
+        elif method == 'Network.loadingFinished':
+            transferred += params.get('encodedDataLength', 0)
+        elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+            blocked[params.get('type') or types.get(request_id, 'Other')] += 1
+
+    estimated_saved = sum(TYPICAL_RESOURCE_BYTES.get(kind, DEFAULT_RESOURCE_BYTES) * count
+                          for kind, count in blocked.items())
+    stats = {
+        'requests': requests,
+        'bytes': transferred,
+        'blocked': sum(blocked.values()),
+        'est_bytes_saved': estimated_saved,
+    }
+    for kind, count in blocked.items():
+        stats[f'blocked_{kind.lower()}'] = count
+    if load_seconds and transferred:
+        stats['est_seconds_saved'] = round(estimated_saved / (transferred / load_seconds), 3)
+    return stats
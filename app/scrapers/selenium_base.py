@@ -1,87 +1,369 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from typing import Any, Dict, Iterator, List, Optional
+import json
 import time
 import logging
 from abc import ABC, abstractmethod
 from .models import ScrapedArticle
+from .driver_pool import DriverPool, driver_pool
+from .html_cache import HTMLCache, html_cache
+from .http_client import fetch_html
+from .parsing import DEFAULT_PRUNE_TAGS, parse_html
+from .structured_data import ARTICLE_TYPES, article_fields, extract_json_ld, find_article
+from .resource_blocking import DEFAULT_BLOCKED_PATTERNS, apply_resource_blocking, drain_network_events, summarize_network
+from .politeness import get_domain
+from .tabs import TabResult, TabScheduler
+from ..config import settings
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+FETCH_MODES = ("auto", "http", "browser")
+
 class SeleniumBaseScraper(ABC):
     """Base class for all Selenium-based scrapers"""
     
-    def __init__(self, source_name: str):
+    # "auto" tries plain HTTP first and falls back to Chrome; "http"/"browser" force one
+    fetch_mode: str = "auto"
+    # CSS selectors whose presence means the article body is in the DOM
+    ready_selectors: List[str] = []
+    # Treat an embedded JSON-LD block as a readiness signal too
+    ready_on_json_ld: bool = True
+    # Seconds to wait for readiness before extracting whatever has loaded
+    ready_timeout: float = 10.0
+    
+    # Elements dropped from the raw HTML before parsing, unless their tag contains a keep marker
+    prune_tags = DEFAULT_PRUNE_TAGS
+    prune_keep_markers = ()
+    
+    # Read embedded schema.org JSON-LD before falling back to the CSS selectors
+    use_structured_data: bool = True
+    structured_data_types = ARTICLE_TYPES
+    # Fields that must come out of structured data for the selector path to be skipped
+    structured_required_fields = ('title', 'content', 'image_url', 'published_date', 'author')
+    
+    # CDP URL patterns blocked while rendering; allowed patterns override them
+    blocked_resources = DEFAULT_BLOCKED_PATTERNS
+    allowed_resources = ()
+    
+    # Tabs driven at once inside one pooled Chrome when scraping a batch; SCRAPER_TABS_PER_HOST overrides per host
+    tabs_per_browser: int = 1
+    
+    def __init__(self, source_name: str, pool: DriverPool = None, cache: HTMLCache = None):
         self.source_name = source_name
-        self.driver = None
-        self.setup_driver()
-    
-    def setup_driver(self):
-        """Setup Chrome driver with anti-detection options"""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")  # Run in background
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        # Use webdriver-manager to automatically get Chrome driver
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        # Key of per-platform settings such as SCRAPER_FETCH_MODES; ScraperFactory sets its platform name
+        self.platform = source_name.lower()
+        # Drivers are borrowed per page from the shared pool instead of owned
+        self.driver_pool = pool or driver_pool
+        self.html_cache = cache or html_cache
     
     def scrape_article(self, url: str) -> ScrapedArticle:
         """Main method to scrape a single article"""
         try:
-            logger.info(f"🌐 Loading: {url}")
-            self.driver.get(url)
+            timings = {}
+            article = self._scrape_http(url, timings)
+            if article:
+                return article
             
-            # Wait for page to load
-            time.sleep(3)
+            network = {}
+            html = self.fetch_browser(url, timings, network)
+            article = self._build_article(url, html, timings, fetched_via="browser")
+            article.network = network
+            return article
+        
+        except Exception as e:
+            logger.error(f"❌ Error scraping {url}: {e}")
+            return self._failed_article(url)
+    
+    def scrape_articles(self, urls: List[str]) -> List[ScrapedArticle]:
+        """Scrape several articles, in input order, rendering the ones that need Chrome in tabs of one browser
+        
+        A failure only affects its own URL.
+        """
+        if len(urls) <= 1 or self.get_tab_count(urls[0]) <= 1:
+            return [self.scrape_article(url) for url in urls]
+        
+        articles: Dict[str, ScrapedArticle] = {}
+        timings = {url: {} for url in urls}
+        browser_urls = []
+        for url in urls:
+            try:
+                article = self._scrape_http(url, timings[url])
+            except Exception as e:
+                logger.error(f"❌ Error scraping {url}: {e}")
+                article = self._failed_article(url)
+            if article:
+                articles[url] = article
+            else:
+                browser_urls.append(url)
+        
+        if browser_urls:
+            network = {}
+            try:
+                for result in self.fetch_browser_many(browser_urls, timings, network):
+                    if result.error:
+                        logger.error(f"❌ Error scraping {result.url}: {result.error}")
+                        continue
+                    try:
+                        articles[result.url] = self._build_article(result.url, result.html, timings[result.url],
+                                                                   fetched_via="browser")
+                    except Exception as e:
+                        # Keep consuming the generator so the other tabs still get extracted
+                        logger.error(f"❌ Error extracting {result.url}: {e}")
+                        articles[result.url] = self._failed_article(result.url)
+            except Exception as e:
+                logger.error(f"❌ Browser batch failed for {self.source_name}: {e}")
+            for url in browser_urls:
+                if url in articles:
+                    # Network figures cover the whole batch: the tabs share one browser
+                    articles[url].network = network
+        
+        return [articles.get(url) or self._failed_article(url) for url in urls]
+    
+    def _scrape_http(self, url: str, timings: Dict[str, float]) -> Optional[ScrapedArticle]:
+        """Try the HTTP-first path; returns None when the page has to be rendered in Chrome"""
+        mode = self.get_fetch_mode()
+        if mode not in ("auto", "http"):
+            return None
+        
+        try:
+            html = self.fetch_http(url, timings)
+            article = self._build_article(url, html, timings, fetched_via="http")
+            if mode == "http" or self.is_complete(article):
+                return article
+            logger.info(f"↪️ HTTP extraction incomplete, falling back to Chrome: {url}")
+        except Exception as e:
+            if mode == "http":
+                raise
+            logger.warning(f"⚠️ HTTP fetch failed, falling back to Chrome: {url} ({e})")
+        return None
+    
+    def _failed_article(self, url: str) -> ScrapedArticle:
+        return ScrapedArticle(
+            title="",
+            content="",
+            source=self.source_name,
+            url=url,
+            image_url="",
+            scraped_at=datetime.now(),
+            status="failed"
+        )
+    
+    def get_tab_count(self, url: str) -> int:
+        """Resolve how many tabs to drive for a host, letting SCRAPER_TABS_PER_HOST override the class default"""
+        overrides = {}
+        for item in settings.SCRAPER_TABS_PER_HOST.split(','):
+            if ':' in item:
+                host, count = item.rsplit(':', 1)
+                try:
+                    overrides[get_domain('//' + host.strip())] = int(count)
+                except ValueError:
+                    logger.warning(f"Ignoring invalid tab count '{item.strip()}' in SCRAPER_TABS_PER_HOST")
+        
+        return max(1, overrides.get(get_domain(url), self.tabs_per_browser))
+    
+    def get_fetch_mode(self) -> str:
+        """Resolve the fetch mode, letting SCRAPER_FETCH_MODES (keyed by platform name) override the class default"""
+        overrides = {}
+        for item in settings.SCRAPER_FETCH_MODES.split(','):
+            if ':' in item:
+                platform, mode = item.split(':', 1)
+                overrides[platform.strip().lower()] = mode.strip().lower()
+        
+        mode = overrides.get(self.platform, self.fetch_mode)
+        if mode not in FETCH_MODES:
+            logger.warning(f"Unknown fetch mode '{mode}' for {self.source_name}, using 'auto'")
+            return "auto"
+        return mode
+    
+    def fetch_http(self, url: str, timings: Dict[str, float]) -> str:
+        """Fetch server-rendered HTML over the shared keep-alive session"""
+        logger.info(f"📡 Fetching: {url}")
+        start = time.perf_counter()
+        html = fetch_html(url, cache=self.html_cache)
+        timings['http_fetch'] = time.perf_counter() - start
+        return html
+    
+    def fetch_browser(self, url: str, timings: Dict[str, float], network: Dict[str, float] = None) -> str:
+        """Render the page in a pooled Chrome driver and return its HTML
+        
+        Per-page request, byte and blocked-resource counts are written to network.
+        """
+        if self.html_cache:
+            entry = self.html_cache.get(url)
+            if entry and entry.source == "browser" and self.html_cache.is_fresh(entry):
+                logger.info(f"💾 Serving cached rendered HTML: {url}")
+                return entry.html
+        
+        logger.info(f"🌐 Loading: {url}")
+        with self.driver_pool.driver() as driver:
+            # Pooled drivers are shared between scrapers, so rules are set per page
+            self.apply_blocking(driver)
+            drain_network_events(driver)  # Drop events left over from the previous page
             
-            # Get page source after JavaScript execution
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
+            start = time.perf_counter()
+            driver.get(url)
+            timings['page_load'] = time.perf_counter() - start
             
-            # Extract data using platform-specific methods
-            title = self.extract_title(soup)
-            content = self.extract_content(soup)
-            metadata = self.extract_metadata(soup)
-            image_url = self.extract_image(soup)
+            # Wait until the article content is present instead of a fixed sleep
+            self.wait_until_ready(driver)
+            timings['page_ready'] = time.perf_counter() - start
+            logger.info(f"⏱️ Page ready in {timings['page_ready']:.2f}s: {url}")
             
-            # Clean text
-            title = self.clean_text(title)
-            content = self.clean_text(content)
+            # Get page source after JavaScript execution
+            html = driver.page_source
             
-            return ScrapedArticle(
-                title=title,
-                content=content,
-                source=self.source_name,
-                url=url,
-                image_url=image_url,
-                published_date=metadata.get('published_date'),
-                author=metadata.get('author'),
-                category=metadata.get('category'),
-                language=metadata.get('language'),
-                scraped_at=datetime.now(),
-                status="success"
-            )
+            stats = summarize_network(drain_network_events(driver), timings['page_ready'])
+            if network is not None:
+                network.update(stats)
+            logger.info(f"📉 {stats['requests']} requests, {stats['bytes'] / 1024:.0f}KB transferred, "
+                        f"{stats['blocked']} blocked (~{stats['est_bytes_saved'] / 1024:.0f}KB saved): {url}")
+        
+        if self.html_cache:
+            self.html_cache.put(url, html, source="browser")
+        return html
+    
+    def fetch_browser_many(self, urls: List[str], timings: Dict[str, Dict[str, float]],
+                           network: Dict[str, float] = None) -> Iterator[TabResult]:
+        """Render several pages in tabs of one pooled Chrome, yielding each as it becomes ready
+        
+        Request and byte counts for the whole batch are written to network.
+        """
+        pending = []
+        for url in urls:
+            entry = self.html_cache.get(url) if self.html_cache else None
+            if entry and entry.source == "browser" and self.html_cache.is_fresh(entry):
+                logger.info(f"💾 Serving cached rendered HTML: {url}")
+                yield TabResult(url, entry.html, None, 0.0, True)
+            else:
+                pending.append(url)
+        if not pending:
+            return
+        
+        tabs = min(self.get_tab_count(pending[0]), len(pending))
+        logger.info(f"🗂️ Loading {len(pending)} pages in {tabs} tabs")
+        start = time.perf_counter()
+        with self.driver_pool.driver(pages=len(pending)) as driver:
+            drain_network_events(driver)
+            scheduler = TabScheduler(driver, tabs, self._readiness_script(), ready_timeout=self.ready_timeout,
+                                     on_new_tab=self.apply_blocking)
+            for result in scheduler.run(pending):
+                if result.html is not None:
+                    timings[result.url]['page_ready'] = result.load_seconds
+                    if self.html_cache:
+                        self.html_cache.put(result.url, result.html, source="browser")
+                yield result
             
-        except Exception as e:
-            logger.error(f"❌ Error scraping {url}: {e}")
-            return ScrapedArticle(
-                title="",
-                content="",
-                source=self.source_name,
-                url=url,
-                image_url="",
-                scraped_at=datetime.now(),
-                status="failed"
+            stats = summarize_network(drain_network_events(driver), time.perf_counter() - start)
+            if network is not None:
+                network.update(stats, pages=len(pending), tabs=tabs)
+            logger.info(f"📉 {len(pending)} pages: {stats['requests']} requests, {stats['bytes'] / 1024:.0f}KB "
+                        f"transferred, {stats['blocked']} blocked")
+    
+    def apply_blocking(self, driver):
+        """Set this scraper's resource blocking rules on the driver's current tab"""
+        if settings.SCRAPER_BLOCK_RESOURCES:
+            apply_resource_blocking(driver, self.blocked_resources, self.allowed_resources)
+        else:
+            apply_resource_blocking(driver, ())
+    
+    def scrape_cached(self, url: str) -> ScrapedArticle:
+        """Re-run the extractors on cached HTML without touching the network"""
+        entry = self.html_cache.get(url) if self.html_cache else None
+        if entry is None:
+            logger.warning(f"No cached HTML for {url}")
+            return self._failed_article(url)
+        return self._build_article(url, entry.html, {}, fetched_via="cache")
+    
+    def is_complete(self, article: ScrapedArticle) -> bool:
+        """Whether an extracted article has enough content to skip the browser"""
+        return bool(article.title and article.content)
+    
+    def _build_article(self, url: str, html: str, timings: Dict[str, float], fetched_via: str) -> ScrapedArticle:
+        """Extract fields from structured data first, then run the platform selectors for anything missing"""
+        start = time.perf_counter()
+        fields = self.extract_structured(html) if self.use_structured_data else {}
+        
+        missing = [field for field in self.structured_required_fields if not fields.get(field)]
+        if missing:
+            # Extract data using platform-specific methods
+            soup = self.parse(html)
+            selected = self.extract_all(soup)
+            selected = {
+                'title': selected['title'],
+                'content': selected['content'],
+                'image_url': selected['image_url'],
+                **selected['metadata'],
+            }
+            for key, value in selected.items():
+                if value and not fields.get(key):
+                    fields[key] = value
+        timings['extract'] = time.perf_counter() - start
+        
+        # Clean text
+        title = self.clean_text(fields.get('title', ''))
+        content = self.clean_text(fields.get('content', ''))
+        
+        return ScrapedArticle(
+            title=title,
+            content=content,
+            source=self.source_name,
+            url=url,
+            image_url=fields.get('image_url', ''),
+            published_date=fields.get('published_date'),
+            author=fields.get('author'),
+            category=fields.get('category'),
+            language=fields.get('language'),
+            scraped_at=datetime.now(),
+            status="success",
+            fetched_via=fetched_via,
+            timings=dict(timings)
+        )
+    
+    def extract_structured(self, html: str) -> Dict[str, str]:
+        """Read article fields from the page's JSON-LD without building a DOM"""
+        article = find_article(extract_json_ld(html), self.structured_data_types)
+        return article_fields(article) if article else {}
+    
+    def wait_until_ready(self, driver) -> bool:
+        """Wait for the readiness strategy to pass; returns False on timeout"""
+        script = self._readiness_script()
+        try:
+            WebDriverWait(driver, self.ready_timeout, poll_frequency=0.1).until(
+                lambda d: d.execute_script(script)
             )
+            return True
+        except TimeoutException:
+            logger.warning(f"⚠️ Page not ready after {self.ready_timeout}s, extracting anyway")
+            return False
+    
+    def _readiness_script(self) -> str:
+        """Build the JS condition checked while waiting for the page"""
+        if not self.ready_selectors and not self.ready_on_json_ld:
+            return "return document.readyState === 'complete';"
+        
+        selectors = list(self.ready_selectors)
+        if self.ready_on_json_ld:
+            selectors.append('script[type="application/ld+json"]')
+        return f"return {json.dumps(selectors)}.some(s => document.querySelector(s) !== null);"
+    
+    def parse(self, html: str) -> BeautifulSoup:
+        """Prune and parse HTML with the configured parser backend"""
+        return parse_html(html, prune_tags=self.prune_tags, keep_markers=self.prune_keep_markers)
+    
+    def extract_all(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        """Extract title, content, metadata and image together
+        
+        Scrapers can override this with a single-pass implementation.
+        """
+        return {
+            'title': self.extract_title(soup),
+            'content': self.extract_content(soup),
+            'metadata': self.extract_metadata(soup),
+            'image_url': self.extract_image(soup),
+        }
     
     @abstractmethod
     def extract_title(self, soup: BeautifulSoup) -> str:
@@ -110,9 +392,4 @@ class SeleniumBaseScraper(ABC):
         
         # Remove extra whitespace
         text = ' '.join(text.split())
-        return text.strip()
-    
-    def __del__(self):
-        """Cleanup driver"""
-        if self.driver:
-            self.driver.quit() 
\ No newline at end of file
+        return text.strip() 
\ No newline at end of file
@@ -0,0 +1,89 @@
+from html import unescape
+from typing import Any, Dict, Iterable, List, Optional
+import json
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# schema.org types that describe a single news story
+ARTICLE_TYPES = ('NewsArticle', 'Article', 'ReportageNewsArticle', 'AnalysisNewsArticle', 'LiveBlogPosting')
+
+# Matches only the JSON-LD script blocks, so no DOM has to be built to read them
+JSON_LD_PATTERN = re.compile(
+    r'<script\b[^>]*\btype\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+def extract_json_ld(html: str) -> List[Dict[str, Any]]:
+    """Decode every JSON-LD object embedded in the page, flattening lists and @graph"""
+    if 'ld+json' not in html:
+        return []
+
+    objects = []
+    for match in JSON_LD_PATTERN.finditer(html):
+        raw = match.group(1).strip()
+        if raw.startswith('<![CDATA['):
+            raw = raw[9:].rsplit(']]>', 1)[0]
+        try:
+            data = json.loads(raw.rstrip(';'), strict=False)
+        except ValueError as e:
+            logger.debug(f"Skipping invalid JSON-LD block: {e}")
+            continue
+        objects.extend(_flatten(data))
+    return objects
+
+def _flatten(data: Any) -> Iterable[Dict[str, Any]]:
+    if isinstance(data, list):
+        for item in data:
+            yield from _flatten(item)
+    elif isinstance(data, dict):
+        yield data
+        if isinstance(data.get('@graph'), list):
+            yield from _flatten(data['@graph'])
+
+def find_article(objects: List[Dict[str, Any]], types: Iterable[str] = ARTICLE_TYPES) -> Optional[Dict[str, Any]]:
+    """Pick the first object whose @type is one of the article types"""
+    wanted = set(types)
+    for obj in objects:
+        declared = obj.get('@type')
+        declared = declared if isinstance(declared, list) else [declared]
+        if wanted.intersection(declared):
+            return obj
+    return None
+
+def article_fields(article: Dict[str, Any]) -> Dict[str, str]:
+    """Map a schema.org article to ScrapedArticle field names, skipping empty values"""
+    fields = {
+        'title': _text(article.get('headline') or article.get('name')),
+        'content': _text(article.get('articleBody')),
+        'image_url': _url(article.get('image') or article.get('thumbnailUrl')),
+        'published_date': _first(article.get('datePublished') or article.get('dateModified')),
+        'author': _names(article.get('author')),
+        'category': _first(article.get('articleSection')),
+        'language': _first(article.get('inLanguage')),
+    }
+    return {key: value for key, value in fields.items() if value}
+
+def _first(value: Any) -> str:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get('name')
+    return str(value).strip() if value else ""
+
+def _text(value: Any) -> str:
+    # Publishers often entity-encode text inside JSON-LD
+    return unescape(_first(value))
+
+def _url(value: Any) -> str:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = value.get('url') or value.get('contentUrl')
+    return str(value).strip() if value else ""
+
+def _names(value: Any) -> str:
+    people = value if isinstance(value, list) else [value]
+    names = [_first(person) for person in people if person]
+    return ', '.join(name for name in names if name)
@@ -0,0 +1,152 @@
+from collections import deque
+from typing import Callable, Iterator, List, NamedTuple, Optional
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Marks the outgoing document; the new page will not have the flag, so stale DOMs never look ready
+NAVIGATE_SCRIPT = "window.__tabPending = true; window.location.href = arguments[0];"
+
+class TabResult(NamedTuple):
+    """Outcome of loading one URL in a tab"""
+    url: str
+    html: Optional[str]
+    error: Optional[str]
+    load_seconds: float
+    ready: bool
+
+class _Tab:
+    def __init__(self, handle: str):
+        self.handle = handle
+        self.url: Optional[str] = None
+        self.started_at = 0.0
+
+class TabScheduler:
+    """Loads many URLs through several tabs of one Chrome session
+    
+    WebDriver runs one command at a time per session, so instead of blocking
+    in driver.get() the scheduler starts navigation in every free tab with a
+    script and then polls the tabs round-robin. When a tab's page passes the
+    readiness check (or times out), its HTML is returned and the tab gets the
+    next URL. A tab that errors is closed and replaced, and only its URL fails.
+    """
+    
+    def __init__(self, driver, tabs: int, ready_script: str, ready_timeout: float = 10.0,
+                 poll_interval: float = 0.05, on_new_tab: Callable[[object], None] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.driver = driver
+        self.tabs = max(1, tabs)
+        self.ready_timeout = ready_timeout
+        self.poll_interval = poll_interval
+        self.on_new_tab = on_new_tab
+        self.clock = clock
+        self.sleep = sleep
+        self.state_script = (
+            "if (window.__tabPending) return 'pending';"
+            f"return (function() {{ {ready_script} }})() ? 'ready' : 'loading';"
+        )
+    
+    def run(self, urls: List[str]) -> Iterator[TabResult]:
+        """Yield a TabResult per URL, in completion order"""
+        queue = deque(urls)
+        tabs = [_Tab(self.driver.current_window_handle)]
+        self._prepare(tabs[0])
+        for _ in range(min(self.tabs, len(urls)) - 1):
+            tab = self._open_tab()
+            if tab:
+                tabs.append(tab)
+        
+        try:
+            while queue or any(tab.url for tab in tabs):
+                if not tabs:
+                    # Every tab died and none could be reopened; the browser is gone
+                    raise RuntimeError("No usable browser tabs left")
+                
+                progressed = False
+                for tab in list(tabs):
+                    if tab.url is None:
+                        if queue:
+                            url = queue.popleft()
+                            try:
+                                self._navigate(tab, url)
+                            except Exception as e:
+                                yield TabResult(url, None, f"navigation failed: {e}", 0.0, False)
+                                self._replace(tabs, tab)
+                            progressed = True
+                        continue
+                    
+                    try:
+                        result = self._poll(tab)
+                    except Exception as e:
+                        result = TabResult(tab.url, None, f"tab failed: {e}", self.clock() - tab.started_at, False)
+                        self._replace(tabs, tab)
+                    if result:
+                        tab.url = None
+                        progressed = True
+                        yield result
+                
+                if not progressed:
+                    self.sleep(self.poll_interval)
+        finally:
+            self._close_extra_tabs(tabs)
+    
+    def _navigate(self, tab: _Tab, url: str):
+        self.driver.switch_to.window(tab.handle)
+        tab.url = url
+        tab.started_at = self.clock()
+        self.driver.execute_script(NAVIGATE_SCRIPT, url)
+    
+    def _poll(self, tab: _Tab) -> Optional[TabResult]:
+        """Check a loading tab; returns a result once it is ready or has timed out"""
+        self.driver.switch_to.window(tab.handle)
+        state = self.driver.execute_script(self.state_script)
+        elapsed = self.clock() - tab.started_at
+        if state == 'ready':
+            return TabResult(tab.url, self.driver.page_source, None, elapsed, True)
+        if elapsed < self.ready_timeout:
+            return None
+        
+        if state == 'pending':
+            # Navigation never committed, so the DOM is still the previous page
+            return TabResult(tab.url, None, f"no response after {self.ready_timeout}s", elapsed, False)
+        logger.warning(f"⚠️ Tab not ready after {self.ready_timeout}s, extracting anyway: {tab.url}")
+        return TabResult(tab.url, self.driver.page_source, None, elapsed, False)
+    
+    def _open_tab(self) -> Optional[_Tab]:
+        try:
+            self.driver.switch_to.new_window('tab')
+            tab = _Tab(self.driver.current_window_handle)
+            self._prepare(tab)
+            return tab
+        except Exception as e:
+            logger.warning(f"⚠️ Could not open browser tab: {e}")
+            return None
+    
+    def _prepare(self, tab: _Tab):
+        if self.on_new_tab:
+            self.on_new_tab(self.driver)
+    
+    def _replace(self, tabs: List[_Tab], tab: _Tab):
+        """Close a failed tab and open a fresh one in its place"""
+        tabs.remove(tab)
+        try:
+            self.driver.switch_to.window(tab.handle)
+            self.driver.close()
+        except Exception:
+            pass
+        replacement = self._open_tab()
+        if replacement:
+            tabs.append(replacement)
+    
+    def _close_extra_tabs(self, tabs: List[_Tab]):
+        """Leave the session with a single tab so it can go back to the pool"""
+        try:
+            handles = self.driver.window_handles
+            for handle in handles[1:]:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            if handles:
+                self.driver.switch_to.window(handles[0])
+        except Exception as e:
+            logger.debug(f"Error closing browser tabs: {e}")
@@ -1,7 +1,14 @@
-from typing import List
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, List, Tuple
 from .factory import ScraperFactory
 from .models import ScrapedArticle
+from .politeness import DomainThrottle, domain_throttle, get_domain
+from .rate_control import AdaptiveRateController, CircuitOpenError, rate_controller
+from .dedup import SeenURLIndex, seen_url_index
+from .utils import canonicalize_url
+from ..config import settings
 from datetime import datetime
+import time
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,8 +16,19 @@ logger = logging.getLogger(__name__)
 class UnifiedScraper:
     """Unified interface for all scrapers"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = None, throttle: DomainThrottle = None,
+                 seen_index: SeenURLIndex = None, skip_seen: bool = True,
+                 controller: AdaptiveRateController = None):
         self.factory = ScraperFactory()
+        self.max_workers = max_workers or settings.SCRAPER_MAX_CONCURRENCY
+        self.throttle = throttle or domain_throttle
+        self.controller = controller or rate_controller
+        self.seen_index = seen_index or seen_url_index
+        self.skip_seen = skip_seen
+    
+    def is_duplicate(self, url: str) -> bool:
+        """Whether the article was already processed under this or another URL variant"""
+        return self.skip_seen and self.seen_index.is_seen(url)
     
     def scrape_article(self, url: str, platform: str) -> ScrapedArticle:
         """Scrape a single article from a specific platform"""
@@ -29,19 +47,174 @@ class UnifiedScraper:
                 status="failed"
             )
     
-    def scrape_multiple_articles(self, urls: List[dict]) -> List[ScrapedArticle]:
-        """Scrape multiple articles from different platforms"""
-        articles = []
+    def scrape_article_politely(self, url: str, platform: str) -> ScrapedArticle:
+        """Scrape a single article under the shared per-domain rate control"""
+        return self._scrape_politely({'url': url, 'platform': platform})
+    
+    def scrape_multiple_articles(self, urls: List[dict], concurrent: bool = True) -> List[ScrapedArticle]:
+        """Scrape multiple articles from different platforms, in input order"""
+        articles = [None] * len(urls)
+        if not concurrent:
+            pending, duplicates = self._partition(urls)
+            for index, article in duplicates:
+                articles[index] = article
+            for index, url_info in pending:
+                articles[index] = self._scrape_politely(url_info)
+            return articles
+        
+        for index, article in self.iter_scrape_articles(urls):
+            articles[index] = article
+        
+        return articles
+    
+    def iter_scrape_articles(self, urls: List[dict]) -> Iterator[Tuple[int, ScrapedArticle]]:
+        """Scrape concurrently, yielding (input index, article) as each URL finishes"""
+        pending, duplicates = self._partition(urls)
+        yield from duplicates
+        if not pending:
+            return
         
-        for url_info in urls:
-            url = url_info['url']
-            platform = url_info['platform']
+        units = self._group_for_tabs(pending)
+        workers = min(self.max_workers, len(units))
+        logger.info(f"Scraping {len(pending)} articles in {len(units)} units with {workers} workers")
+        remaining = iter(units)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as executor:
+            futures = {}
             
+            def submit_next():
+                # Only a bounded window is in flight, so unconsumed results never pile up
+                unit = next(remaining, None)
+                if unit is not None:
+                    futures[executor.submit(self._scrape_unit, unit)] = unit
+            
+            for _ in range(workers * 2):
+                submit_next()
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    futures.pop(future)
+                    submit_next()
+                    yield from future.result()
+    
+    def _group_for_tabs(self, pending: List[Tuple[int, dict]]) -> List[List[Tuple[int, dict]]]:
+        """Batch same-host URLs up to the scraper's tab count so they share one browser"""
+        units, open_groups, tab_counts = [], {}, {}
+        for index, url_info in pending:
+            key = (url_info['platform'].lower(), get_domain(url_info['url']))
+            if key not in tab_counts:
+                try:
+                    tab_count = self.factory.get_scraper(key[0]).get_tab_count(url_info['url'])
+                except Exception:
+                    tab_count = 1  # Unknown platforms fail later, one URL at a time
+                # Each tab counts as one request against the domain's concurrency limit
+                tab_counts[key] = min(tab_count, self.throttle.max_per_domain)
+            if tab_counts[key] <= 1:
+                units.append([(index, url_info)])
+                continue
+            
+            group = open_groups.get(key)
+            if group is None:
+                group = open_groups[key] = []
+                units.append(group)
+            group.append((index, url_info))
+            if len(group) >= tab_counts[key]:
+                del open_groups[key]
+        return units
+    
+    def _scrape_unit(self, unit: List[Tuple[int, dict]]) -> List[Tuple[int, ScrapedArticle]]:
+        if len(unit) == 1:
+            index, url_info = unit[0]
+            return [(index, self._scrape_politely(url_info))]
+        return self._scrape_tab_group(unit)
+    
+    def _partition(self, urls: List[dict]) -> Tuple[List[Tuple[int, dict]], List[Tuple[int, ScrapedArticle]]]:
+        """Split URLs into ones to scrape and duplicates (within the batch or already processed)"""
+        pending, duplicates = [], []
+        batch = set()
+        for index, url_info in enumerate(urls):
+            canonical = canonicalize_url(url_info['url'])
+            if canonical in batch or self.is_duplicate(url_info['url']):
+                logger.info(f"⏭️ Skipping already seen article: {url_info['url']}")
+                duplicates.append((index, self._duplicate_article(url_info)))
+            else:
+                batch.add(canonical)
+                pending.append((index, url_info))
+        return pending, duplicates
+    
+    def _duplicate_article(self, url_info: dict) -> ScrapedArticle:
+        return self._unscraped_article(url_info, "duplicate")
+    
+    def _unscraped_article(self, url_info: dict, status: str) -> ScrapedArticle:
+        return ScrapedArticle(
+            title="",
+            content="",
+            source=url_info['platform'],
+            url=url_info['url'],
+            image_url="",
+            scraped_at=datetime.now(),
+            status=status
+        )
+    
+    def _scrape_politely(self, url_info: dict) -> ScrapedArticle:
+        """Scrape one URL inside its domain's rate limit and politeness slot, recording timings"""
+        url = url_info['url']
+        platform = url_info['platform']
+        
+        queued_at = time.perf_counter()
+        try:
+            probe = self.controller.acquire(url)
+        except CircuitOpenError as e:
+            logger.warning(f"⏸️ Not scraping {url}: {e}")
+            return self._unscraped_article(url_info, "circuit_open")
+        
+        with self.throttle.slot(url):
+            started_at = time.perf_counter()
             logger.info(f"Scraping {platform}: {url}")
-            article = self.scrape_article(url, platform)
-            articles.append(article)
+            article = None
+            try:
+                article = self.scrape_article(url, platform)
+            finally:
+                self.controller.record(url, time.perf_counter() - started_at,
+                                       success=article is not None and article.status == "success", probe=probe)
         
-        return articles
+        article.timings['queue_wait'] = started_at - queued_at
+        article.timings['total'] = time.perf_counter() - started_at
+        return article
+    
+    def _scrape_tab_group(self, unit: List[Tuple[int, dict]]) -> List[Tuple[int, ScrapedArticle]]:
+        """Scrape same-host URLs in tabs of one browser, rate limiting and recording each URL"""
+        results, admitted = [], []
+        queued_at = time.perf_counter()
+        for index, url_info in unit:
+            try:
+                probe = self.controller.acquire(url_info['url'])
+                admitted.append((index, url_info, probe))
+            except CircuitOpenError as e:
+                logger.warning(f"⏸️ Not scraping {url_info['url']}: {e}")
+                results.append((index, self._unscraped_article(url_info, "circuit_open")))
+        if not admitted:
+            return results
+        
+        platform = admitted[0][1]['platform']
+        urls = [url_info['url'] for _, url_info, _ in admitted]
+        # One slot and one start interval per tab, so the group is as polite as single requests
+        with self.throttle.slot(urls[0], count=len(urls)):
+            started_at = time.perf_counter()
+            logger.info(f"Scraping {len(urls)} {platform} articles in tabs")
+            try:
+                articles = self.factory.get_scraper(platform).scrape_articles(urls)
+            except Exception as e:
+                logger.error(f"Error scraping {platform} tab group: {e}")
+                articles = [self._unscraped_article(url_info, "failed") for _, url_info, _ in admitted]
+            elapsed = time.perf_counter() - started_at
+        
+        for (index, url_info, probe), article in zip(admitted, articles):
+            self.controller.record(url_info['url'], article.timings.get('page_ready', elapsed),
+                                   success=article.status == "success", probe=probe)
+            article.timings['queue_wait'] = started_at - queued_at
+            article.timings['total'] = elapsed
+            results.append((index, article))
+        return results
     
     def get_available_platforms(self) -> List[str]:
         """Get list of available platforms"""
@@ -54,4 +227,4 @@ class UnifiedScraper:
             return article.status == "success"
         except Exception as e:
             logger.error(f"Platform test failed for {platform}: {e}")
-            return False 
\ No newline at end of file
+            return False
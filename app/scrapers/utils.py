@@ -1,4 +1,5 @@
 import random
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 # List of realistic user agents
 USER_AGENTS = [
@@ -18,3 +19,66 @@ def rotate_session_headers(session):
     session.headers.update({
         'User-Agent': get_random_user_agent()
     })
+
+# Query parameters that only track the visit and never change the page
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'ref', 'ref_src', 'mc_cid', 'mc_eid', 'pfrom', 'from'}
+
+# Query parameters that select an AMP or alternate rendering of the same article
+AMP_PARAMS = {'amp', 'amp_js_v', 'usqp', 'outputtype'}
+
+# Host prefixes for mobile/AMP mirrors of the same article
+MIRROR_HOST_PREFIXES = ('www.', 'm.', 'amp.', 'mobile.')
+
+# Path suffixes used by AMP versions of article pages
+AMP_PATH_SUFFIXES = ('/amp/1', '/amp', '.amp')
+
+def canonicalize_url(url):
+    """Normalize a URL so the same article always maps to the same key
+    
+    Scheme, mirror hosts (www., m., amp.), AMP paths, tracking parameters,
+    fragments and trailing slashes are normalized away.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    for prefix in MIRROR_HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    
+    path = parts.path or '/'
+    if path.startswith('/amp/'):
+        path = path[len('/amp'):]
+    for suffix in AMP_PATH_SUFFIXES:
+        if path.endswith(suffix) and len(path) > len(suffix):
+            path = path[:-len(suffix)]
+            break
+    if len(path) > 1:
+        path = path.rstrip('/')
+    
+    query = [
+        (key, value) for key, value in _untracked_query(parts.query)
+        if key.lower() not in AMP_PARAMS
+    ]
+    return urlunsplit(('https', host, path, urlencode(sorted(query)), ''))
+
+def normalize_page_url(url):
+    """Normalize a URL only as far as it still names the same page
+    
+    Unlike canonicalize_url, mirror hosts, AMP paths and rendering parameters
+    are kept, since they serve different HTML; only scheme and host case,
+    default ports, fragments and tracking parameters are normalized away.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != {'http': 80, 'https': 443}.get(scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path or '/', urlencode(_untracked_query(parts.query)), ''))
+
+def _untracked_query(query):
+    return [
+        (key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ]
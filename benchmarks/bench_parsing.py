@@ -0,0 +1,83 @@
+"""Compare the original and optimized HTML parsing paths on recorded NDTV pages.
+
+Usage:
+    python -m benchmarks.bench_parsing [--fixtures tests/fixtures/ndtv] [--repeat 20]
+
+The baseline path is what scrape_article used to do: parse the full page with
+html.parser and call the four extractors one after another. The optimized
+path prunes the raw HTML, parses it with the configured backend and runs the
+scraper's single-pass extract_all.
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.scrapers.ndtv_scraper import NDTVScraper
+from app.scrapers.parsing import parse_html
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "ndtv"
+
+
+def baseline(scraper, html):
+    soup = BeautifulSoup(html, 'html.parser')
+    return {
+        'title': scraper.extract_title(soup),
+        'content': scraper.extract_content(soup),
+        'metadata': scraper.extract_metadata(soup),
+        'image_url': scraper.extract_image(soup),
+    }
+
+
+def optimized(scraper, html, parser):
+    soup = parse_html(html, parser=parser, prune_tags=scraper.prune_tags,
+                      keep_markers=scraper.prune_keep_markers)
+    return scraper.extract_all(soup)
+
+
+def measure(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    scraper = NDTVScraper()
+    pages = sorted(args.fixtures.glob("*.html"))
+    variants = {
+        "baseline (html.parser, 4 passes)": lambda html: baseline(scraper, html),
+        "pruned html.parser, one pass": lambda html: optimized(scraper, html, 'html.parser'),
+        "pruned lxml, one pass": lambda html: optimized(scraper, html, 'lxml'),
+    }
+
+    print(f"{len(pages)} pages, median of {args.repeat} runs (ms)")
+    totals = {name: 0.0 for name in variants}
+    for page in pages:
+        html = page.read_text(encoding="utf-8")
+        expected = baseline(scraper, html)
+        row = []
+        for name, run in variants.items():
+            if run(html) != expected:
+                print(f"  ! {name} output differs from baseline on {page.name}")
+            elapsed = measure(lambda: run(html), args.repeat)
+            totals[name] += elapsed
+            row.append(f"{elapsed * 1000:8.2f}")
+        print(f"{page.name:40s}" + "".join(row))
+
+    base = totals["baseline (html.parser, 4 passes)"]
+    for name, total in totals.items():
+        print(f"{name:40s} {total * 1000:8.2f} ms total  {base / total:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
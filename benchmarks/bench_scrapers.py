@@ -0,0 +1,153 @@
+"""Benchmark scraper parsing and extraction on the recorded fixture corpus.
+
+Usage:
+    python -m benchmarks.bench_scrapers [--platform ndtv] [--repeat 20]
+                                        [--save-baseline PATH] [--baseline PATH] [--tolerance 0.25]
+
+Every page in tests/fixtures/<platform> is parsed and run through each
+extract_* method, extract_all, the selector and JSON-LD extraction paths,
+and the full _build_article path without any network access. The report covers pages per second, per-method median and
+p95 latency, and peak tracemalloc memory per stage. --save-baseline writes
+it as JSON. --baseline compares the run against a saved file and exits
+non-zero when a stage's median latency or peak memory grows by more than the
+tolerance. Baselines are machine-specific, so record one on the machine that
+runs the comparison.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from app.scrapers.factory import ScraperFactory
+
+FIXTURES_ROOT = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+EXTRACTORS = ("extract_title", "extract_content", "extract_metadata", "extract_image", "extract_all")
+
+
+def load_corpus(platform: str, root: Path = FIXTURES_ROOT) -> Dict[str, str]:
+    """Read every recorded page for a platform, keyed by file name"""
+    pages = {page.name: page.read_text(encoding="utf-8") for page in sorted((root / platform).glob("*.html"))}
+    if not pages:
+        raise FileNotFoundError(f"No fixture pages in {root / platform}")
+    return pages
+
+
+def time_calls(func: Callable[[], object], repeat: int) -> List[float]:
+    func()  # Warm-up: selector compilation and lazy imports are not part of the hot path
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """Peak bytes allocated by Python while running func once"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_benchmark(scraper, pages: Dict[str, str], repeat: int = 20) -> Dict:
+    """Measure each stage over the corpus and return a JSON-serialisable report"""
+    stages: Dict[str, Dict[str, Callable[[], object]]] = {}
+    for name, html in pages.items():
+        soup = scraper.parse(html)
+        stages.setdefault("parse", {})[name] = lambda html=html: scraper.parse(html)
+        for method in EXTRACTORS:
+            stages.setdefault(method, {})[name] = lambda soup=soup, method=method: getattr(scraper, method)(soup)
+        # The two extraction strategies _build_article chooses between, each from raw HTML
+        stages.setdefault("selector_path", {})[name] = lambda html=html: scraper.extract_all(scraper.parse(html))
+        stages.setdefault("structured_data", {})[name] = lambda html=html: scraper.extract_structured(html)
+        stages.setdefault("end_to_end", {})[name] = (
+            lambda name=name, html=html: scraper._build_article(f"fixture://{name}", html, {}, fetched_via="fixture")
+        )
+
+    report = {"pages": len(pages), "repeat": repeat, "stages": {}}
+    for stage, calls in stages.items():
+        samples, per_page_medians, peaks = [], [], []
+        for call in calls.values():
+            page_samples = time_calls(call, repeat)
+            samples.extend(page_samples)
+            per_page_medians.append(statistics.median(page_samples))
+            peaks.append(peak_memory(call))
+        corpus_seconds = sum(per_page_medians)
+        report["stages"][stage] = {
+            "pages_per_s": round(len(calls) / corpus_seconds, 2) if corpus_seconds else None,
+            "median_ms": round(statistics.median(samples) * 1000, 4),
+            "p95_ms": round(percentile(samples, 0.95) * 1000, 4),
+            "peak_kb": round(max(peaks) / 1024, 1),
+        }
+    return report
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float = 0.25) -> List[str]:
+    """List every stage that got slower or hungrier than the baseline allows"""
+    regressions = []
+    for stage, current in report["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous:
+            continue
+        # p95 is too noisy at small repeat counts to gate on
+        for metric in ("median_ms", "peak_kb"):
+            before, after = previous.get(metric), current.get(metric)
+            if before and after and after > before * (1 + tolerance):
+                regressions.append(f"{stage} {metric}: {before} -> {after} (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_report(report: Dict, baseline: Dict = None):
+    print(f"{report['pages']} pages, {report['repeat']} runs per page")
+    print(f"{'stage':20s}{'pages/s':>10s}{'median ms':>12s}{'p95 ms':>10s}{'peak KB':>10s}{'vs base':>10s}")
+    for stage, row in report["stages"].items():
+        previous = (baseline or {}).get("stages", {}).get(stage)
+        change = f"{(row['median_ms'] / previous['median_ms'] - 1) * 100:+.0f}%" if previous else ""
+        print(f"{stage:20s}{row['pages_per_s'] or 0:10.1f}{row['median_ms']:12.3f}{row['p95_ms']:10.3f}"
+              f"{row['peak_kb']:10.1f}{change:>10s}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--platform", default="ndtv")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_ROOT)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    scraper = ScraperFactory.get_scraper(args.platform)
+    report = run_benchmark(scraper, load_corpus(args.platform, args.fixtures), args.repeat)
+    report["platform"] = args.platform
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    print_report(report, baseline)
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.save_baseline}")
+
+    if baseline:
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"  ! regression: {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
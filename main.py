@@ -1,11 +1,14 @@
 from fastapi import FastAPI
 import uvicorn
 import logging
+import threading
 from datetime import datetime
 from app.config import settings
 from app.utils import setup_logging
 from app.api import router as api_router
 from app.api.stories import router as stories_router
+from app.scrapers.driver_pool import driver_pool
+from app.processors.jobs import job_runner
 
 # Setup logging
 setup_logging()
@@ -30,10 +33,18 @@ async def startup_event():
     logger.info(f"Environment: {settings.APP_ENV}")
     logger.info(f"Debug mode: {settings.DEBUG}")
     logger.info(f"Startup time: {datetime.now()}")
+    if settings.JOBS_RESUME_ON_STARTUP:
+        # Pick up processing jobs interrupted by the last shutdown or crash
+        threading.Thread(target=job_runner.resume_incomplete, args=(settings.JOB_WORKERS,),
+                         name="job-resume", daemon=True).start()
+    if settings.SCRAPER_DRIVER_WARM_ON_STARTUP:
+        # Chrome takes seconds to launch, so start the pooled drivers before the first scrape needs them
+        threading.Thread(target=driver_pool.warm, name="driver-warm", daemon=True).start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("🛑 Saransh AI News App shutting down...")
+    driver_pool.shutdown()
 
 if __name__ == "__main__":
     # Development configuration with auto-reload
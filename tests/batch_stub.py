@@ -0,0 +1,143 @@
+"""Local stand-in for the OpenAI Files and Batch APIs.
+
+Speaks just enough of the HTTP API for the real openai client to upload a
+request file, create a batch, poll it and download its output. Each batch
+reports "in_progress" for the first `polls_before_complete` retrievals and
+then completes, answering chat requests with `chat_reply(body)` and
+embedding requests with `embed(text)`. Custom ids listed in `fail_ids`
+come back as failed requests in the error file.
+"""
+import itertools
+import json
+import re
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def default_embed(text):
+    return [float(len(text)), 1.0, 0.0]
+
+
+class BatchStubServer:
+    def __init__(self, chat_reply, embed=default_embed, polls_before_complete=1, fail_ids=()):
+        self.chat_reply = chat_reply
+        self.embed = embed
+        self.polls_before_complete = polls_before_complete
+        self.fail_ids = set(fail_ids)
+        self.files = {}
+        self.batches = {}
+        self.polls = {}
+        self.uploaded = []
+        self._ids = itertools.count(1)
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _new_id(self, prefix):
+        return f"{prefix}-{next(self._ids)}"
+
+    def _file(self, content, purpose, filename):
+        file_id = self._new_id("file")
+        self.files[file_id] = content
+        return {"id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+                "filename": filename, "purpose": purpose, "status": "processed"}
+
+    def _batch(self, batch_id):
+        batch = self.batches[batch_id]
+        self.polls[batch_id] = self.polls.get(batch_id, 0) + 1
+        if batch["status"] == "in_progress" and self.polls[batch_id] > self.polls_before_complete:
+            self._complete(batch)
+        return batch
+
+    def _complete(self, batch):
+        outputs, errors = [], []
+        for raw in self.files[batch["input_file_id"]].decode().splitlines():
+            request = json.loads(raw)
+            custom_id = request["custom_id"]
+            if custom_id in self.fail_ids:
+                errors.append({"id": self._new_id("req"), "custom_id": custom_id, "response": None,
+                               "error": {"code": "server_error", "message": "stub failure"}})
+                continue
+            body = request["body"]
+            if request["url"] == "/v1/embeddings":
+                # Reversed with explicit indexes, as the API does not promise order
+                data = [{"object": "embedding", "index": i, "embedding": self.embed(text)}
+                        for i, text in enumerate(body["input"])][::-1]
+                reply = {"object": "list", "data": data, "model": body["model"]}
+            else:
+                reply = {"object": "chat.completion", "model": body["model"],
+                         "choices": [{"index": 0, "message": {"role": "assistant", "content": self.chat_reply(body)}}]}
+            outputs.append({"id": self._new_id("req"), "custom_id": custom_id,
+                            "response": {"status_code": 200, "body": reply}, "error": None})
+        batch["status"] = "completed"
+        batch["output_file_id"] = self._file(_jsonl(outputs), "batch_output", "output.jsonl")["id"]
+        if errors:
+            batch["error_file_id"] = self._file(_jsonl(errors), "batch_output", "errors.jsonl")["id"]
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, payload, status=200, raw=False):
+                body = payload if raw else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/octet-stream" if raw else "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body(self):
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def do_POST(self):
+                if self.path == "/v1/files":
+                    head = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode()
+                    message = BytesParser(policy=HTTP).parsebytes(head + self._body())
+                    parts = {part.get_param("name", header="content-disposition"): part
+                             for part in message.iter_parts()}
+                    content = parts["file"].get_payload(decode=True)
+                    stub.uploaded.append(content)
+                    return self._send(stub._file(content, parts["purpose"].get_content().strip(),
+                                                 parts["file"].get_filename()))
+                if self.path == "/v1/batches":
+                    params = json.loads(self._body())
+                    batch_id = stub._new_id("batch")
+                    stub.batches[batch_id] = {
+                        "id": batch_id, "object": "batch", "endpoint": params["endpoint"],
+                        "input_file_id": params["input_file_id"], "completion_window": params["completion_window"],
+                        "status": "in_progress", "created_at": int(time.time()),
+                        "metadata": params.get("metadata"), "output_file_id": None, "error_file_id": None,
+                    }
+                    return self._send(stub.batches[batch_id])
+                self._send({"error": {"message": "not found"}}, status=404)
+
+            def do_GET(self):
+                match = re.fullmatch(r"/v1/batches/([\w-]+)", self.path)
+                if match and match.group(1) in stub.batches:
+                    return self._send(stub._batch(match.group(1)))
+                match = re.fullmatch(r"/v1/files/([\w-]+)/content", self.path)
+                if match and match.group(1) in stub.files:
+                    return self._send(stub.files[match.group(1)], raw=True)
+                self._send({"error": {"message": "not found"}}, status=404)
+
+        return Handler
+
+
+def _jsonl(lines):
+    return "".join(json.dumps(line) + "\n" for line in lines).encode()
@@ -0,0 +1,167 @@
+"""Fakes shared by several test modules: OpenAI clients, the analyzer and processing-job collaborators."""
+import asyncio
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.ai.openai_service import OpenAIService
+from app.ai.rate_limiter import RequestRateLimiter
+from app.processors.analyzer import AIContentAnalyzer
+from app.processors.jobs import ProcessingJobRunner
+from app.processors.models import ContentAnalysis, ContentChunk
+from app.scrapers.models import ScrapedArticle
+
+ARTICLE = "The city council approved a new metro line on Tuesday. Work will begin next year."
+
+FULL_REPLY = {
+    "sentiment_score": 0.4,
+    "sentiment_label": "positive",
+    "sentiment_confidence": 0.8,
+    "entities": ["City Council"],
+    "topics": ["Politics", "Business"],
+    "summary": "The council approved a metro line; work starts next year.",
+    "keywords": ["metro", "council"],
+    "language": "English",
+    "quality": 7,
+}
+
+
+class FakeOpenAI:
+    """Answers the structured prompt with `reply` and each per-field prompt with a fixed value"""
+
+    def __init__(self, reply=None):
+        self.reply = reply
+        self.calls = []
+
+    def _make_request(self, messages, max_retries=3, response_format=None, task=None):
+        system = messages[0]["content"]
+        self.calls.append(system)
+        if response_format:
+            return self.reply if isinstance(self.reply, str) else json.dumps(self.reply)
+        if "sentiment" in system:
+            return '{"score": -0.2, "label": "negative", "confidence": 0.6}'
+        if "language" in system:
+            return "Hindi"
+        if "quality" in system:
+            return "4"
+        if "summarization" in system:
+            return "Fallback summary"
+        return '["fallback"]'
+
+
+def make_analyzer(reply, mode="structured"):
+    analyzer = AIContentAnalyzer(mode=mode)
+    analyzer.openai_service = FakeOpenAI(reply)
+    analyzer.local_classifier = None
+    return analyzer
+
+
+class WordEncoding:
+    def encode(self, text):
+        return text.split()
+
+
+class FakeCompletions:
+    def __init__(self, failures=(), delay=0.01):
+        self.failures = list(failures)
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                raise self.failures.pop(0)
+            message = SimpleNamespace(content=f"reply to {kwargs['messages'][-1]['content']}")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)],
+                                   usage=SimpleNamespace(total_tokens=10))
+        finally:
+            self.in_flight -= 1
+
+
+class FakeEmbeddings:
+    """Embeds each text as [len(text), 0.5, -1.25]; replies list inputs in reverse with their index"""
+
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.inputs = []
+        self.models = []
+
+    async def create(self, model, input):
+        self.inputs.append(list(input))
+        self.models.append(model)
+        await asyncio.sleep(0)
+        if self.failures:
+            raise self.failures.pop(0)
+        data = [SimpleNamespace(index=i, embedding=[float(len(text)), 0.5, -1.25]) for i, text in enumerate(input)]
+        return SimpleNamespace(data=data[::-1])
+
+
+def make_service(completions, limiter=None, embeddings=None):
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions),
+                             embeddings=embeddings or FakeEmbeddings())
+    service = OpenAIService(limiter=limiter or RequestRateLimiter(10_000, 10_000_000),
+                            async_client_factory=lambda: client)
+    service._encoding = WordEncoding()
+    service.cache = None
+    service.vector_cache = None
+    return service
+
+
+class FakeSeenIndex:
+    def __init__(self, seen=()):
+        self.seen = set(seen)
+
+    def is_seen(self, url):
+        return url in self.seen
+
+    def mark_seen(self, url):
+        self.seen.add(url)
+
+
+class FakeScraper:
+    def __init__(self, statuses=None):
+        self.statuses = statuses or {}
+        self.calls = []
+
+    def scrape_article_politely(self, url, platform):
+        self.calls.append(url)
+        return ScrapedArticle(title=f"Title {url}", content="Some content. More content.", source=platform,
+                              url=url, scraped_at=datetime.now(), status=self.statuses.get(url, "success"))
+
+
+class FakePipeline:
+    def __init__(self, fail_analysis_times=0):
+        self.calls = []
+        self.fail_analysis_times = fail_analysis_times
+
+    def chunk(self, article):
+        self.calls.append(("chunk", article.url))
+        return [ContentChunk(id="c0", content=article.content, chunk_index=0, word_count=4,
+                             start_position=0, end_position=len(article.content))]
+
+    def analyze(self, article):
+        self.calls.append(("analyze", article.url))
+        if self.fail_analysis_times:
+            self.fail_analysis_times -= 1
+            raise RuntimeError("rate limited")
+        return ContentAnalysis(word_count=4, sentence_count=2, readability_score=0.0, sentiment_score=0.0,
+                               ai_summary="A summary")
+
+    def embed(self, article, chunks):
+        self.calls.append(("embed", article.url))
+        return True
+
+
+def make_runner(db_session, scraper=None, pipeline=None, seen=None, **kwargs):
+    return ProcessingJobRunner(session_factory=lambda: db_session, scraper=scraper or FakeScraper(),
+                               pipeline=pipeline or FakePipeline(), seen_index=seen or FakeSeenIndex(), **kwargs)
+
+
+def urls(*paths):
+    return [{"url": f"https://www.ndtv.com/{path}", "platform": "ndtv"} for path in paths]
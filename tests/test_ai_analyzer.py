@@ -0,0 +1,79 @@
+"""Tests for the single-request structured mode of AIContentAnalyzer."""
+import json
+
+import pytest
+
+from app.config import settings
+from app.processors import analyzer as analyzer_module
+from tests.fakes import ARTICLE, FULL_REPLY, FakeOpenAI, make_analyzer
+
+
+@pytest.fixture(autouse=True)
+def no_openai_client(monkeypatch):
+    monkeypatch.setattr(analyzer_module, "OpenAIService", FakeOpenAI)
+
+
+def test_structured_mode_uses_one_request():
+    analyzer = make_analyzer(FULL_REPLY)
+    analysis = analyzer.analyze(ARTICLE)
+    assert len(analyzer.openai_service.calls) == 1
+    assert analysis.sentiment_label == "positive"
+    assert analysis.key_topics == ["Politics", "Business"]
+    assert analysis.quality_score == 0.7
+    assert analysis.confidence_score == 0.8
+
+
+def test_structured_request_caps_the_article_text(monkeypatch):
+    monkeypatch.setattr(settings, "ANALYZER_MAX_CONTENT_CHARS", 20)
+    prompt = make_analyzer(FULL_REPLY).structured_messages("x" * 20 + "TAIL")[1]["content"]
+    assert "x" * 20 in prompt
+    assert "TAIL" not in prompt
+
+
+def test_partial_reply_only_fills_missing_fields():
+    reply = dict(FULL_REPLY, quality=42, language=None)
+    del reply["keywords"]
+    analyzer = make_analyzer(reply)
+    analysis = analyzer.analyze(ARTICLE)
+    assert len(analyzer.openai_service.calls) == 4
+    assert analysis.keywords == ["fallback"]
+    assert analysis.language == "Hindi"
+    assert analysis.quality_score == 0.4
+    assert analysis.ai_summary == FULL_REPLY["summary"]
+
+
+def test_unparseable_reply_falls_back_to_every_field():
+    analyzer = make_analyzer("Sorry, I can't help with that.")
+    analysis = analyzer.analyze(ARTICLE)
+    assert len(analyzer.openai_service.calls) == 8
+    assert analysis.sentiment_label == "negative"
+    assert analysis.ai_summary == "Fallback summary"
+
+
+def test_fenced_json_reply_is_accepted():
+    analyzer = make_analyzer("```json\n" + json.dumps(FULL_REPLY) + "\n```")
+    assert analyzer.analyze(ARTICLE).entities == ["City Council"]
+    assert len(analyzer.openai_service.calls) == 1
+
+
+def test_per_field_mode_is_still_available():
+    analyzer = make_analyzer(FULL_REPLY, mode="per_field")
+    analysis = analyzer.analyze(ARTICLE)
+    assert len(analyzer.openai_service.calls) == 7
+    assert analysis.language == "Hindi"
+
+
+class FencedOpenAI(FakeOpenAI):
+    """Wraps every JSON per-field reply in a markdown code fence"""
+
+    def _make_request(self, messages, **kwargs):
+        reply = super()._make_request(messages, **kwargs)
+        return f"```json\n{reply}\n```" if reply.startswith(("{", "[")) else reply
+
+
+def test_per_field_mode_accepts_fenced_json_replies():
+    analyzer = make_analyzer(FULL_REPLY, mode="per_field")
+    analyzer.openai_service = FencedOpenAI()
+    analysis = analyzer.analyze(ARTICLE)
+    assert analysis.sentiment_label == "negative"
+    assert analysis.entities == analysis.key_topics == analysis.keywords == ["fallback"]
@@ -0,0 +1,117 @@
+"""Tests for the streaming /articles/process/stream endpoint."""
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.api.articles as articles_api
+from app.processors.models import ContentAnalysis, ProcessedArticle
+from app.scrapers.models import ScrapedArticle
+from app.scrapers.politeness import DomainThrottle
+from app.scrapers.rate_control import AdaptiveRateController
+from app.scrapers.unified_scraper import UnifiedScraper
+
+
+def on_event_loop():
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class FakeScraper:
+    statuses = {}
+    loop_calls = []
+
+    def is_duplicate(self, url):
+        self.loop_calls.append(on_event_loop())
+        return self.statuses.get(url) == "duplicate"
+
+    def scrape_article_politely(self, url, platform):
+        return ScrapedArticle(title=url, content="Body.", source=platform, url=url, scraped_at=datetime.now())
+
+    def iter_scrape_articles(self, urls):
+        self.loop_calls.append(on_event_loop())
+        # Finish in reverse order to show results are streamed as they complete
+        for index in reversed(range(len(urls))):
+            url = urls[index]["url"]
+            yield index, ScrapedArticle(title=url, content="Body.", source="ndtv", url=url,
+                                        scraped_at=datetime.now(), status=self.statuses.get(url, "success"))
+
+
+class FakePipeline:
+    def process_article(self, article):
+        if article.url.endswith("boom"):
+            raise RuntimeError("analysis failed")
+        return ProcessedArticle(
+            original_article_link=article.url, title=article.title, clean_content=article.content, chunks=[],
+            analysis=ContentAnalysis(word_count=1, sentence_count=1, readability_score=0.0, sentiment_score=0.0,
+                                     ai_summary="Summary"),
+            processed_at=datetime.now())
+
+
+@pytest.fixture()
+def stream_client(monkeypatch):
+    monkeypatch.setattr(articles_api, "UnifiedScraper", FakeScraper)
+    monkeypatch.setattr(articles_api, "ContentProcessingPipeline", FakePipeline)
+    monkeypatch.setattr(FakeScraper, "statuses", {"https://www.ndtv.com/dup": "duplicate"})
+    monkeypatch.setattr(FakeScraper, "loop_calls", [])
+    app = FastAPI()
+    app.include_router(articles_api.router, prefix="/api/v1")
+    return TestClient(app)
+
+
+URLS = {"urls": ["https://www.ndtv.com/a", "https://www.ndtv.com/dup", "https://www.ndtv.com/boom"]}
+
+
+def test_ndjson_stream_emits_progress_and_articles_in_completion_order(stream_client):
+    response = stream_client.post("/api/v1/articles/process/stream", json=URLS)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+
+    assert events[0] == {"event": "start", "total": 3}
+    articles = [e for e in events if e["event"] == "article"]
+    assert [a["index"] for a in articles] == [2, 0]
+    assert articles[0]["data"]["processing_status"] == "failed"
+    assert articles[1]["data"]["summary"] == "Summary"
+    assert {"event": "progress", "index": 1, "url": "https://www.ndtv.com/dup", "completed": 2, "total": 3,
+            "status": "skipped"} in events
+    assert events[-1] == {"event": "done", "total": 3, "processed": 1, "failed": 1, "skipped": 1}
+
+
+def test_sse_selected_by_accept_header(stream_client):
+    response = stream_client.post("/api/v1/articles/process/stream", json=URLS,
+                                  headers={"Accept": "text/event-stream"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    blocks = [block for block in response.text.split("\n\n") if block]
+    assert blocks[0].startswith("event: start\ndata: ")
+    assert json.loads(blocks[-1].split("data: ", 1)[1])["event"] == "done"
+
+
+def test_blocking_scraper_calls_run_off_the_event_loop(stream_client):
+    stream_client.post("/api/v1/articles/process/stream", json=URLS)
+    processed = stream_client.post("/api/v1/articles/process", json=URLS).json()
+    assert [a["processing_status"] for a in processed] == ["success", "failed"]  # The duplicate was skipped
+    assert FakeScraper.loop_calls and not any(FakeScraper.loop_calls)
+
+
+def test_scraper_keeps_a_bounded_window_in_flight(monkeypatch):
+    controller = AdaptiveRateController(initial_rate=1000, max_rate=1000)
+    scraper = UnifiedScraper(max_workers=2, throttle=DomainThrottle(min_interval=0), skip_seen=False,
+                             controller=controller)
+    started = []
+
+    def fake_scrape(url, platform):
+        started.append(url)
+        return ScrapedArticle(title=url, content="x", source=platform, url=url, scraped_at=datetime.now())
+
+    monkeypatch.setattr(scraper, "scrape_article", fake_scrape)
+    urls = [{"url": f"https://site.com/{i}", "platform": "ndtv"} for i in range(50)]
+    results = scraper.iter_scrape_articles(urls)
+    next(results)
+    assert len(started) <= 5  # 2 workers x 2 queued, plus the replacement for the consumed result
+    assert len(list(results)) == 49
@@ -0,0 +1,154 @@
+"""Tests for Batch API backfills, run against the local batch stub server."""
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from app.ai.batch_client import BatchAPIClient
+from app.config import settings
+from app.processors import analyzer as analyzer_module
+from app.processors import pipeline as pipeline_module
+from app.processors import batch_backfill as backfill_module
+from app.processors.batch_backfill import BackfillPending, BatchBackfill
+from app.processors.pipeline import ContentProcessingPipeline
+from app.scrapers.models import ScrapedArticle
+from tests.batch_stub import BatchStubServer
+from tests.fakes import FULL_REPLY, FakeOpenAI, FakeSeenIndex
+
+
+class FakeEmbeddingService:
+    backend = SimpleNamespace(name="openai", model="text-embedding-3-small")
+
+    def __init__(self):
+        self.stored = {}
+
+    def store_article_chunks(self, article_id, chunks, embeddings=None):
+        if embeddings is None:
+            embeddings = [[0.0, 0.0, 0.0] for _ in chunks]
+        self.stored[article_id] = embeddings
+        return True
+
+
+def article(n, words=40):
+    content = " ".join(f"word{n}x{i}." for i in range(words))
+    return ScrapedArticle(title=f"Article {n}", content=content, source="ndtv",
+                          url=f"https://www.ndtv.com/{n}", scraped_at=datetime(2026, 1, 1))
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    monkeypatch.setattr(analyzer_module, "OpenAIService", FakeOpenAI)
+    monkeypatch.setattr(pipeline_module, "EmbeddingService", FakeEmbeddingService)
+    monkeypatch.setattr(settings, "NEAR_DUP_ENABLED", False)
+    return ContentProcessingPipeline(seen_index=FakeSeenIndex())
+
+
+def backfill(stub, pipeline, tmp_path, **kwargs):
+    client = openai.OpenAI(api_key="test", base_url=stub.base_url, max_retries=0)
+    return BatchBackfill(pipeline=pipeline, work_dir=str(tmp_path),
+                         batch_client=BatchAPIClient(client, poll_interval=0), **kwargs)
+
+
+def test_backfill_merges_batch_replies(pipeline, tmp_path):
+    articles = [article(1), article(2)]
+    with BatchStubServer(chat_reply=lambda body: json.dumps(FULL_REPLY)) as stub:
+        results = backfill(stub, pipeline, tmp_path).run(articles, name="week-1")
+
+    assert [r.original_article_link for r in results] == [a.url for a in articles]
+    assert all(r.processing_status == "success" for r in results)
+    assert results[0].analysis.ai_summary == FULL_REPLY["summary"]
+    assert results[0].analysis.quality_score == 0.7
+    assert pipeline.analyzer.openai_service.calls == []  # Nothing interactive
+    assert len(stub.batches) == 2  # One chat and one embeddings batch
+    assert all(polls == 3 for polls in stub.polls.values())  # In progress, completed, then fetched for results
+
+    stored = pipeline.embedding_service.stored[articles[0].url]
+    assert [vector[0] for vector in stored] == [float(len(c.content)) for c in results[0].chunks]
+    assert pipeline.seen_index.is_seen(articles[1].url)
+
+
+def test_requests_are_split_across_files(pipeline, tmp_path):
+    with BatchStubServer(chat_reply=lambda body: json.dumps(FULL_REPLY)) as stub:
+        manifest = backfill(stub, pipeline, tmp_path, max_requests=2).prepare([article(n) for n in range(3)], "split")
+
+    analysis_files = [f for f in manifest.files if f.endpoint == "/v1/chat/completions"]
+    assert len(analysis_files) == 2
+    first = [json.loads(line) for line in open(analysis_files[0].path)]
+    assert [line["custom_id"] for line in first] == ["analysis-0", "analysis-1"]
+    assert first[0]["body"]["response_format"] == {"type": "json_object"}
+
+
+def test_prepare_chunks_long_articles_without_the_llm(pipeline, tmp_path, monkeypatch):
+    def no_llm(*args, **kwargs):
+        raise AssertionError("chunking called the LLM")
+
+    monkeypatch.setattr(pipeline.chunker.openai_service, "_make_request", no_llm)
+    with BatchStubServer(chat_reply=lambda body: json.dumps(FULL_REPLY)) as stub:
+        manifest = backfill(stub, pipeline, tmp_path).prepare([article(1, words=700)], "long")
+
+    chunks = manifest.chunks[0]
+    assert len(chunks) == 3
+    assert all(c.word_count <= 300 and c.content.endswith(".") for c in chunks)
+
+
+def test_failed_requests_fall_back_and_stay_unseen(pipeline, tmp_path):
+    articles = [article(1), article(2)]
+    with BatchStubServer(chat_reply=lambda body: json.dumps(FULL_REPLY), fail_ids={"analysis-1"}) as stub:
+        results = backfill(stub, pipeline, tmp_path).run(articles)
+
+    assert [r.processing_status for r in results] == ["success", "fallback"]
+    assert not pipeline.seen_index.is_seen(articles[1].url)
+
+
+def test_interrupted_backfill_resumes_from_manifest(pipeline, tmp_path):
+    with BatchStubServer(chat_reply=lambda body: json.dumps(FULL_REPLY), polls_before_complete=5) as stub:
+        first = backfill(stub, pipeline, tmp_path)
+        manifest = first.submit(first.prepare([article(1)], "resumable"))
+        assert set(first.wait(manifest, timeout=0).values()) == {"in_progress"}
+
+        results = backfill(stub, pipeline, tmp_path).resume("resumable")
+
+    assert len(stub.uploaded) == 2  # Resuming did not submit the files again
+    assert results[0].analysis.ai_summary == FULL_REPLY["summary"]
+
+
+def test_unfinished_backfill_is_not_merged(pipeline, tmp_path):
+    with BatchStubServer(chat_reply=lambda body: json.dumps(FULL_REPLY), polls_before_complete=5) as stub:
+        with pytest.raises(BackfillPending, match="--resume slow"):
+            backfill(stub, pipeline, tmp_path).run([article(1)], name="slow", timeout=0)
+        assert not pipeline.seen_index.is_seen(article(1).url)
+
+        results = backfill(stub, pipeline, tmp_path).resume("slow")
+
+    assert results[0].processing_status == "success"
+
+
+def test_command_line_leaves_a_running_backfill_for_resume(pipeline, tmp_path, monkeypatch, capsys):
+    articles_path = tmp_path / "articles.jsonl"
+    articles_path.write_text(article(1).model_dump_json())
+    output = tmp_path / "results.json"
+    with BatchStubServer(chat_reply=lambda body: json.dumps(FULL_REPLY), polls_before_complete=5) as stub:
+        monkeypatch.setattr(backfill_module, "BatchBackfill",
+                            lambda: backfill(stub, pipeline, tmp_path / "jobs"))
+        with pytest.raises(SystemExit):
+            backfill_module.main([str(articles_path), "--name", "cli", "--timeout", "0",
+                                  "--output", str(output)])
+
+    assert not output.exists()
+    assert "--resume cli" in capsys.readouterr().out
+
+
+def test_command_line_runs_a_backfill_from_a_json_lines_file(pipeline, tmp_path, monkeypatch, capsys):
+    articles_path = tmp_path / "articles.jsonl"
+    articles_path.write_text("\n".join(article(n).model_dump_json() for n in (1, 2)))
+    output = tmp_path / "results.json"
+    with BatchStubServer(chat_reply=lambda body: json.dumps(FULL_REPLY)) as stub:
+        monkeypatch.setattr(backfill_module, "BatchBackfill",
+                            lambda: backfill(stub, pipeline, tmp_path / "jobs"))
+        backfill_module.main([str(articles_path), "--name", "cli", "--output", str(output)])
+
+    assert [r["original_article_link"] for r in json.loads(output.read_text())] == \
+        ["https://www.ndtv.com/1", "https://www.ndtv.com/2"]
+    assert "2 articles processed, 2 from batch replies" in capsys.readouterr().out
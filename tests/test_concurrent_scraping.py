@@ -0,0 +1,72 @@
+"""Tests for concurrent scraping with per-domain politeness in UnifiedScraper."""
+import threading
+import time
+from datetime import datetime
+
+from app.scrapers.models import ScrapedArticle
+from app.scrapers.politeness import DomainThrottle, get_domain
+from app.scrapers.rate_control import AdaptiveRateController
+from app.scrapers.unified_scraper import UnifiedScraper
+
+
+def make_scraper(monkeypatch, throttle, delay=0.05):
+    controller = AdaptiveRateController(initial_rate=1000, max_rate=1000)
+    scraper = UnifiedScraper(max_workers=4, throttle=throttle, skip_seen=False, controller=controller)
+    lock = threading.Lock()
+    in_flight = {}
+    peak = {}
+
+    def fake_scrape(url, platform):
+        domain = get_domain(url)
+        with lock:
+            in_flight[domain] = in_flight.get(domain, 0) + 1
+            peak[domain] = max(peak.get(domain, 0), in_flight[domain])
+        time.sleep(delay)
+        with lock:
+            in_flight[domain] -= 1
+        return ScrapedArticle(title=url, content="x", source=platform, url=url, scraped_at=datetime.now())
+
+    monkeypatch.setattr(scraper, "scrape_article", fake_scrape)
+    return scraper, peak
+
+
+def test_results_keep_input_order(monkeypatch):
+    scraper, _ = make_scraper(monkeypatch, DomainThrottle(max_per_domain=4, min_interval=0))
+    urls = [{"url": f"https://site{i}.com/a", "platform": "ndtv"} for i in range(6)]
+    articles = scraper.scrape_multiple_articles(urls)
+    assert [a.url for a in articles] == [u["url"] for u in urls]
+    assert all("total" in a.timings for a in articles)
+
+
+def test_per_domain_cap_is_respected(monkeypatch):
+    scraper, peak = make_scraper(monkeypatch, DomainThrottle(max_per_domain=1, min_interval=0))
+    urls = [{"url": f"https://www.ndtv.com/{i}", "platform": "ndtv"} for i in range(4)]
+    urls += [{"url": f"https://other.com/{i}", "platform": "ndtv"} for i in range(4)]
+    scraper.scrape_multiple_articles(urls)
+    assert peak["ndtv.com"] == 1
+    assert peak["other.com"] == 1
+
+
+def test_min_interval_spaces_out_requests():
+    throttle = DomainThrottle(max_per_domain=4, min_interval=0.05)
+    starts = []
+    for _ in range(3):
+        with throttle.slot("https://www.ndtv.com/a"):
+            starts.append(time.monotonic())
+    assert starts[2] - starts[0] >= 0.09
+
+
+def test_a_group_slot_books_one_interval_per_request():
+    throttle = DomainThrottle(max_per_domain=4, min_interval=0.05)
+    with throttle.slot("https://www.ndtv.com/a", count=3):
+        pass
+    start = time.monotonic()
+    with throttle.slot("https://www.ndtv.com/b"):
+        assert time.monotonic() - start >= 0.04
+
+
+def test_iter_yields_as_completed(monkeypatch):
+    scraper, _ = make_scraper(monkeypatch, DomainThrottle(max_per_domain=4, min_interval=0))
+    urls = [{"url": f"https://site{i}.com/a", "platform": "ndtv"} for i in range(3)]
+    indexes = sorted(index for index, _ in scraper.iter_scrape_articles(urls))
+    assert indexes == [0, 1, 2]
@@ -0,0 +1,130 @@
+"""Tests for sitemap/RSS discovery and the persistent crawl frontier."""
+from datetime import datetime, timedelta, timezone
+
+from app.db.models import FrontierURL
+from app.scrapers import crawl as crawl_module
+from app.scrapers.discovery import DiscoveredURL
+from app.scrapers.frontier import CrawlFrontier
+from app.scrapers.models import ScrapedArticle
+from app.scrapers.ndtv_discovery import NDTVDiscovery
+
+NEWS_SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+  <url>
+    <loc>https://www.ndtv.com/india-news/metro-route-123</loc>
+    <news:news><news:publication_date>2025-07-10T09:30:00+05:30</news:publication_date></news:news>
+  </url>
+  <url><loc>https://www.ndtv.com/world-news/summit-456</loc><lastmod>2025-07-10T08:00:00Z</lastmod></url>
+</urlset>"""
+
+SITEMAP_INDEX = """<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://www.ndtv.com/sitemap/articles-1.xml</loc></sitemap>
+</sitemapindex>"""
+
+RSS_FEED = """<rss version="2.0"><channel>
+  <item><title>A</title><link>https://www.ndtv.com/india-news/flood-789</link>
+    <pubDate>Thu, 10 Jul 2025 10:00:00 +0530</pubDate><category>India</category></item>
+</channel></rss>"""
+
+
+class FakeScraper:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.scraped = []
+
+    def iter_scrape_articles(self, urls):
+        for index, info in enumerate(urls):
+            self.scraped.append(info["url"])
+            status = "failed" if info["url"] in self.failing else "success"
+            yield index, ScrapedArticle(title="t", content="c", source="NDTV", url=info["url"],
+                                        scraped_at=datetime.now(), status=status)
+
+
+def item(path, hours_ago, section="india-news"):
+    return DiscoveredURL(url=f"https://www.ndtv.com/{section}/{path}", platform="ndtv", section=section,
+                         published_at=datetime.now(timezone.utc) - timedelta(hours=hours_ago))
+
+
+def test_parse_news_sitemap():
+    urls, children = NDTVDiscovery().parse_sitemap(NEWS_SITEMAP)
+    assert children == []
+    assert [u.url for u in urls] == ["https://www.ndtv.com/india-news/metro-route-123",
+                                     "https://www.ndtv.com/world-news/summit-456"]
+    assert urls[0].section == "india-news"
+    assert urls[0].published_at.utcoffset() == timedelta(hours=5, minutes=30)
+
+
+def test_parse_sitemap_index_returns_children():
+    urls, children = NDTVDiscovery().parse_sitemap(SITEMAP_INDEX)
+    assert urls == []
+    assert children == ["https://www.ndtv.com/sitemap/articles-1.xml"]
+
+
+def test_parse_rss_feed():
+    urls = NDTVDiscovery().parse_feed(RSS_FEED)
+    assert len(urls) == 1
+    assert urls[0].discovered_via == "rss"
+    assert urls[0].published_at is not None
+
+
+def test_fresher_and_weightier_urls_come_first(db_session):
+    frontier = CrawlFrontier(session_factory=lambda: db_session, scraper=FakeScraper())
+    adapter = NDTVDiscovery()
+    frontier.add([item("old", 12), item("new", 1), item("ent", 1, section="entertainment")], adapter)
+    claimed = frontier.claim_batch(3)
+    assert [c["url"].rsplit("/", 1)[-1] for c in claimed] == ["new", "ent", "old"]
+
+
+def test_url_variants_enqueued_once(db_session):
+    frontier = CrawlFrontier(session_factory=lambda: db_session, scraper=FakeScraper())
+    first = item("story-1", 1)
+    amp = first.model_copy(update={"url": first.url + "/amp/1"})
+    assert frontier.add([first, amp]) == 1
+    assert frontier.add([first]) == 0
+
+
+def test_run_checkpoints_and_retries_failures_after_a_backoff(db_session):
+    scraper = FakeScraper(failing={"https://www.ndtv.com/india-news/bad"})
+    frontier = CrawlFrontier(session_factory=lambda: db_session, scraper=scraper, max_attempts=2,
+                             retry_backoff_seconds=60)
+    frontier.add([item("good", 1), item("bad", 2)])
+    processed = []
+    totals = frontier.run(batch_size=10, on_article=lambda a: processed.append(a.url))
+    assert totals == {"done": 1, "failed": 1, "deferred": 0}
+    assert processed == ["https://www.ndtv.com/india-news/good"]
+    assert frontier.stats() == {"done": 1, "pending": 1}
+
+    # Not claimed again until the backoff has passed
+    row = db_session.query(FrontierURL).filter_by(status="pending").one()
+    assert row.not_before > datetime.now() + timedelta(seconds=50)
+    assert frontier.run() == {"done": 0, "failed": 0, "deferred": 0}
+
+    db_session.query(FrontierURL).update({"not_before": datetime.now() - timedelta(seconds=1)})
+    db_session.commit()
+    assert frontier.run() == {"done": 0, "failed": 1, "deferred": 0}
+    assert frontier.stats() == {"done": 1, "failed": 1}
+
+
+def test_interrupted_leases_are_recovered(db_session):
+    frontier = CrawlFrontier(session_factory=lambda: db_session, scraper=FakeScraper(), lease_seconds=60)
+    frontier.add([item("a", 1)])
+    frontier.claim_batch(1)
+    row = db_session.query(FrontierURL).one()
+    row.claimed_at = datetime.now() - timedelta(minutes=5)
+    db_session.commit()
+    assert frontier.recover_stale() == 1
+    assert frontier.run() == {"done": 1, "failed": 0, "deferred": 0}
+
+
+def test_command_line_discovers_and_crawls(db_session, monkeypatch, capsys):
+    frontier = CrawlFrontier(session_factory=lambda: db_session, scraper=FakeScraper())
+    monkeypatch.setattr(frontier, "discover", lambda platforms: frontier.add([item("a", 1), item("b", 2)]))
+    monkeypatch.setattr(crawl_module, "CrawlFrontier", lambda: frontier)
+
+    crawl_module.main(["--discover", "--scrape-only"])
+
+    out = capsys.readouterr().out
+    assert "2 new URLs discovered" in out
+    assert "2 done, 0 failed, 0 deferred" in out
+    assert frontier.stats() == {"done": 2}
@@ -0,0 +1,114 @@
+"""Tests for the shared Chrome driver pool, using fake drivers instead of Chrome."""
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from app.scrapers import driver_pool as pool_module
+from app.scrapers.driver_pool import DriverPool, PooledDriver, _process_memory_kb, _process_tree
+
+
+class FakeDriver:
+    def __init__(self, pid=None):
+        self.alive = True
+        self.quit_called = False
+        self.service = SimpleNamespace(process=SimpleNamespace(pid=pid))
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def make_pool(**kwargs):
+    created = []
+
+    def factory():
+        driver = FakeDriver()
+        created.append(driver)
+        return driver
+
+    return DriverPool(driver_factory=factory, checkout_timeout=0.1, **kwargs), created
+
+
+def test_released_driver_is_reused():
+    pool, created = make_pool(max_size=2)
+    with pool.driver() as first:
+        pass
+    with pool.driver() as second:
+        pass
+    assert first is second
+    assert len(created) == 1
+
+
+def test_pool_is_bounded():
+    pool, _ = make_pool(max_size=1)
+    held = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    pool.release(held)
+
+
+def test_driver_recycled_after_max_pages():
+    pool, created = make_pool(max_size=1, max_pages=2)
+    for _ in range(3):
+        with pool.driver():
+            pass
+    assert len(created) == 2
+    assert created[0].quit_called
+
+
+def test_driver_recycled_when_memory_grows(monkeypatch):
+    pool, created = make_pool(max_size=1, max_memory_mb=100)
+    monkeypatch.setattr(pool_module, "_process_tree", lambda pid: [1, 2])
+    monkeypatch.setattr(pool_module, "_process_memory_kb", lambda pid: 60 * 1024)
+    with pool.driver():
+        pass
+    assert created[0].quit_called
+    assert pool.stats()["idle"] == 0
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+def test_memory_covers_the_whole_process_tree():
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+    try:
+        assert child.pid in _process_tree(os.getpid())
+        own = _process_memory_kb(os.getpid()) / 1024
+        assert PooledDriver(FakeDriver(pid=os.getpid())).memory_mb() > own
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_unhealthy_idle_driver_is_replaced():
+    pool, created = make_pool(max_size=1)
+    with pool.driver() as driver:
+        pass
+    driver.alive = False
+    with pool.driver() as replacement:
+        pass
+    assert replacement is not driver
+    assert created[0].quit_called
+
+
+def test_warm_survives_a_browser_that_will_not_start():
+    def factory():
+        raise RuntimeError("chrome not found")
+
+    pool = DriverPool(max_size=2, driver_factory=factory, checkout_timeout=0.1)
+    pool.warm()
+    assert pool.stats()["idle"] == 0
+
+
+def test_shutdown_quits_idle_drivers():
+    pool, created = make_pool(max_size=2)
+    pool.warm(2)
+    pool.shutdown()
+    assert all(driver.quit_called for driver in created)
+    with pytest.raises(RuntimeError):
+        pool.acquire()
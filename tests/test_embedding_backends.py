@@ -0,0 +1,149 @@
+"""Tests for pluggable embedding backends and per-backend Chroma collections."""
+import importlib.util
+from types import SimpleNamespace
+
+import chromadb
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.api.articles as articles_api
+from app.ai import embedding_backends, embedding_service
+from app.ai.embedding_backends import (
+    EmbeddingBackend, LocalEmbeddingBackend, OpenAIEmbeddingBackend, create_embedding_backend,
+)
+from app.ai.embedding_cache import EmbeddingCache
+from app.ai.embedding_service import EmbeddingService, get_embedding_service
+from app.config import settings
+from tests.fakes import FakeCompletions, FakeEmbeddings, make_service
+
+
+class FakeBackend(EmbeddingBackend):
+    def __init__(self, name="local", model="mini", size=3):
+        super().__init__(model)
+        self.name = name
+        self.size = size
+        self.calls = []
+
+    @property
+    def dimensions(self):
+        return self.size
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text))] + [1.0] * (self.size - 1) for text in texts]
+
+
+def chunk(index, content):
+    return SimpleNamespace(content=content, chunk_index=index, word_count=len(content.split()))
+
+
+@pytest.fixture
+def client(tmp_path):
+    return chromadb.PersistentClient(path=str(tmp_path / "chroma"))
+
+
+def test_collection_records_backend_model_and_dimensions(client):
+    service = EmbeddingService(backend=FakeBackend(), client=client)
+    assert service.collection.name == "articles_local"
+    metadata = service.collection.metadata
+    assert (metadata["embedding_backend"], metadata["embedding_model"], metadata["embedding_dimensions"]) == \
+        ("local", "mini", 3)
+
+
+def test_store_and_search_use_the_backend(client):
+    backend = FakeBackend()
+    service = EmbeddingService(backend=backend, client=client)
+    assert service.store_article_chunks("a1", [chunk(0, "short"), chunk(1, "a longer chunk")])
+
+    results = service.similarity_search("tiny!", n_results=1)
+    assert backend.calls[-1] == ["tiny!"]
+    assert results[0]["content"] == "short"
+
+
+def test_vectors_from_another_model_are_refused(client):
+    EmbeddingService(backend=FakeBackend(model="mini"), client=client)
+    with pytest.raises(ValueError, match="embedding_model"):
+        EmbeddingService(backend=FakeBackend(model="other"), client=client)
+
+
+def test_dimension_is_recorded_on_first_store_and_enforced(client):
+    backend = FakeBackend(size=None)
+    service = EmbeddingService(backend=backend, client=client)
+    backend.size = 4
+    assert service.store_article_chunks("a1", [chunk(0, "first")])
+    assert service.collection.metadata["embedding_dimensions"] == 4
+
+    backend.size = 2
+    assert not service.store_article_chunks("a2", [chunk(0, "second")])
+
+
+def test_local_backend_encodes_in_batches(monkeypatch):
+    calls = []
+
+    class Encoder:
+        def encode(self, texts, batch_size, **kwargs):
+            calls.append((list(texts), batch_size, kwargs["normalize_embeddings"]))
+            return np.ones((len(texts), 2), dtype=np.float32)
+
+    backend = LocalEmbeddingBackend(model="mini", batch_size=8, device="cpu")
+    monkeypatch.setitem(LocalEmbeddingBackend._models, ("mini", "cpu"), Encoder())
+    assert backend.embed(["a", "b"]) == [[1.0, 1.0], [1.0, 1.0]]
+    assert calls == [(["a", "b"], 8, True)]
+
+
+def test_opening_a_local_collection_does_not_load_the_model(client, monkeypatch):
+    def load(*args, **kwargs):
+        raise AssertionError("model loaded")
+
+    monkeypatch.setattr(LocalEmbeddingBackend, "encoder", property(load))
+    service = EmbeddingService(backend=LocalEmbeddingBackend(model="unloaded", device="cpu"), client=client)
+    assert service.collection.metadata["embedding_model"] == "unloaded"
+    assert "embedding_dimensions" not in service.collection.metadata
+
+
+def test_search_endpoint_reuses_one_service(client, monkeypatch):
+    created = []
+
+    def service():
+        created.append(EmbeddingService(backend=FakeBackend(), client=client))
+        return created[-1]
+
+    monkeypatch.setattr(embedding_service, "EmbeddingService", service)
+    get_embedding_service.cache_clear()
+    app = FastAPI()
+    app.include_router(articles_api.router)
+    try:
+        with TestClient(app) as http:
+            for query in ("first", "second"):
+                assert http.get("/articles/search", params={"query": query}).json()["total_found"] == 0
+    finally:
+        get_embedding_service.cache_clear()
+    assert len(created) == 1
+    assert created[0].backend.calls == [["first"], ["second"]]
+
+
+def test_openai_backend_requests_and_caches_its_own_model(tmp_path):
+    embeddings = FakeEmbeddings()
+    service = make_service(FakeCompletions(), embeddings=embeddings)
+    service.vector_cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"))
+    backend = OpenAIEmbeddingBackend(model="text-embedding-3-large", openai_service=service)
+
+    backend.embed(["alpha"])
+    backend.embed(["alpha"])
+    service._create_embeddings(["alpha"])
+
+    # Vectors from the large model are not served for the default model
+    assert embeddings.models == ["text-embedding-3-large", settings.OPENAI_EMBEDDING_MODEL]
+
+
+def test_missing_or_unknown_backends_fall_back_to_openai(monkeypatch):
+    monkeypatch.setattr(embedding_backends, "OpenAIService", lambda: SimpleNamespace())
+    real_find_spec = importlib.util.find_spec
+    monkeypatch.setattr(embedding_backends.importlib.util, "find_spec",
+                        lambda name: None if name == "sentence_transformers" else real_find_spec(name))
+
+    assert isinstance(create_embedding_backend("local"), OpenAIEmbeddingBackend)
+    assert isinstance(create_embedding_backend("nonsense"), OpenAIEmbeddingBackend)
+    assert create_embedding_backend("openai").dimensions == 1536
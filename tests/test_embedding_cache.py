@@ -0,0 +1,42 @@
+"""Tests for the content-hash embedding cache."""
+import pytest
+
+from app.ai.embedding_cache import EmbeddingCache
+from tests.fakes import FakeCompletions, FakeEmbeddings, make_service
+
+
+def embedding_service(tmp_path):
+    embeddings = FakeEmbeddings()
+    service = make_service(FakeCompletions(), embeddings=embeddings)
+    service.vector_cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"))
+    return service, embeddings
+
+
+def test_vectors_round_trip_as_float32(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"))
+    cache.put_many("m", ["a", "b"], [[0.1, 2.0], [3.0, -4.5]], tokens=[1, 1])
+    first, second, missing = cache.get_many("m", ["a", "b", "c"])
+    assert first == pytest.approx([0.1, 2.0])
+    assert second == [3.0, -4.5]
+    assert missing is None
+    assert cache.get_many("other-model", ["a"]) == [None]
+    assert cache.stats()["bytes"] == 16  # Two 2-dimension vectors at 4 bytes each
+
+
+def test_only_misses_are_sent_in_one_batch(tmp_path):
+    service, embeddings = embedding_service(tmp_path)
+    first = service._create_embeddings(["alpha beta", "gamma"])
+    second = service._create_embeddings(["gamma", "delta", "delta", "alpha beta"])
+
+    assert embeddings.inputs == [["alpha beta", "gamma"], ["delta"]]
+    assert second == [first[1], [5.0, 0.5, -1.25], [5.0, 0.5, -1.25], first[0]]
+
+
+def test_fully_cached_batch_skips_the_api(tmp_path):
+    service, embeddings = embedding_service(tmp_path)
+    service._create_embeddings(["alpha beta", "gamma"])
+    service._create_embeddings(["gamma", "alpha beta"])
+
+    assert len(embeddings.inputs) == 1
+    stats = service.vector_cache.stats()
+    assert (stats["hits"], stats["calls_saved"], stats["tokens_saved"]) == (2, 1, 3)
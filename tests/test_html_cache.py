@@ -0,0 +1,88 @@
+"""Tests for the on-disk raw HTML cache and conditional re-fetching."""
+import time
+
+from app.scrapers.html_cache import HTMLCache
+from app.scrapers.http_client import fetch_html
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.headers = {}
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+def test_entries_are_keyed_by_page_url(tmp_path):
+    cache = HTMLCache(str(tmp_path))
+    cache.put("HTTPS://www.NDTV.com/a?utm_source=x#top", "<p>a</p>")
+    assert cache.get("https://www.ndtv.com/a").html == "<p>a</p>"
+
+
+def test_mirror_pages_are_cached_separately(tmp_path):
+    cache = HTMLCache(str(tmp_path))
+    cache.put("https://www.ndtv.com/a", "<p>desktop</p>")
+    for mirror in ("https://m.ndtv.com/a", "https://www.ndtv.com/a/amp/1", "https://www.ndtv.com/a?amp=1"):
+        assert cache.get(mirror) is None
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    cache = HTMLCache(str(tmp_path))
+    cache.put("https://a.com/1", "<p>same</p>")
+    cache.put("https://a.com/2", "<p>same</p>")
+    assert len(list((tmp_path / "objects").glob("*/*.html.gz"))) == 1
+
+
+def test_fresh_entry_served_without_network(tmp_path):
+    cache = HTMLCache(str(tmp_path), ttl=60)
+    cache.put("https://a.com/1", "<p>cached</p>")
+    session = FakeSession([])
+    assert fetch_html("https://a.com/1", session=session, cache=cache) == "<p>cached</p>"
+    assert session.requests == []
+
+
+def test_stale_entry_revalidated_with_conditional_get(tmp_path):
+    cache = HTMLCache(str(tmp_path), ttl=0)
+    cache.put("https://a.com/1", "<p>cached</p>", etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    session = FakeSession([FakeResponse(304)])
+    assert fetch_html("https://a.com/1", session=session, cache=cache) == "<p>cached</p>"
+    assert session.requests[0]["If-None-Match"] == '"v1"'
+    assert "If-Modified-Since" in session.requests[0]
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_changed_page_replaces_entry(tmp_path):
+    cache = HTMLCache(str(tmp_path), ttl=0)
+    cache.put("https://a.com/1", "<p>old</p>", etag='"v1"')
+    session = FakeSession([FakeResponse(200, "<p>new</p>", {"ETag": '"v2"'})])
+    assert fetch_html("https://a.com/1", session=session, cache=cache) == "<p>new</p>"
+    entry = cache.get("https://a.com/1")
+    assert entry.html == "<p>new</p>"
+    assert entry.etag == '"v2"'
+    assert len(list((tmp_path / "objects").glob("*/*.html.gz"))) == 1
+
+
+def test_least_recently_used_entries_evicted(tmp_path):
+    cache = HTMLCache(str(tmp_path), max_bytes=10 ** 9)
+    for i in range(3):
+        cache.put(f"https://a.com/{i}", f"<p>{'x' * 50}{i}</p>")
+        time.sleep(0.01)
+    cache.get("https://a.com/0")
+    cache.max_bytes = cache.stats()["bytes"] - 1
+    cache.evict()
+    assert cache.get("https://a.com/1") is None
+    assert cache.get("https://a.com/0") is not None
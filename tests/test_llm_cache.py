@@ -0,0 +1,63 @@
+"""Tests for the persistent LLM response cache."""
+import time
+
+from app.ai.response_cache import LLMResponseCache
+from app.config import settings
+from tests.fakes import FakeCompletions, make_service
+
+MESSAGES = [{"role": "system", "content": "Summarize."}, {"role": "user", "content": "article"}]
+
+
+def test_key_covers_every_request_parameter():
+    base = LLMResponseCache.key("gpt-4o-mini", 0.3, 1000, MESSAGES)
+    assert base == LLMResponseCache.key("gpt-4o-mini", 0.3, 1000, [dict(m) for m in MESSAGES])
+    assert base != LLMResponseCache.key("gpt-4o", 0.3, 1000, MESSAGES)
+    assert base != LLMResponseCache.key("gpt-4o-mini", 0.0, 1000, MESSAGES)
+    assert base != LLMResponseCache.key("gpt-4o-mini", 0.3, 500, MESSAGES)
+    assert base != LLMResponseCache.key("gpt-4o-mini", 0.3, 1000, MESSAGES[:1])
+    assert base != LLMResponseCache.key("gpt-4o-mini", 0.3, 1000, MESSAGES, {"type": "json_object"})
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "cache.sqlite3"), ttl=0.05)
+    cache.put("k", "m", "reply", tokens=30)
+    assert cache.get("k") == "reply"
+    time.sleep(0.06)
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "cache.sqlite3"), max_bytes=25)
+    cache.put("a", "m", "x" * 10)
+    cache.put("b", "m", "y" * 10)
+    cache.get("a")
+    cache.put("c", "m", "z" * 10)
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+
+
+def test_service_serves_repeats_from_cache(tmp_path):
+    completions = FakeCompletions()
+    service = make_service(completions)
+    service.cache = LLMResponseCache(str(tmp_path / "cache.sqlite3"))
+
+    first = service._make_request(MESSAGES)
+    second = service._make_request(MESSAGES)
+    assert first == second == "reply to article"
+    assert completions.calls == 1
+    stats = service.cache.stats()
+    assert (stats["hits"], stats["misses"], stats["tokens_saved"]) == (1, 1, 10)
+
+
+def test_bypass_skips_lookup_but_refreshes_entry(tmp_path, monkeypatch):
+    completions = FakeCompletions()
+    service = make_service(completions)
+    service.cache = LLMResponseCache(str(tmp_path / "cache.sqlite3"))
+
+    service._make_request(MESSAGES)
+    service._make_request(MESSAGES, bypass_cache=True)
+    monkeypatch.setattr(settings, "LLM_CACHE_BYPASS", True)
+    service._make_request(MESSAGES)
+    assert completions.calls == 3
+    assert service.cache.stats()["entries"] == 1
@@ -0,0 +1,64 @@
+"""Tests for the local fast-path classifiers and their LLM escalation."""
+from app.processors.local_classifiers import (
+    LocalClassifier, analyze_sentiment, assess_quality, detect_language,
+)
+from tests.fakes import ARTICLE, make_analyzer
+
+ENGLISH = ("The government said on Monday that the new policy will be rolled out in all districts by the end "
+           "of the year, and officials have been asked to submit their reports within a month.")
+HINDI = "सरकार ने सोमवार को कहा कि नई नीति साल के अंत तक सभी जिलों में लागू की जाएगी।"
+MARATHI = "सरकारने सोमवारी सांगितले की नवीन धोरण वर्षाअखेरपर्यंत सर्व जिल्ह्यांमध्ये लागू केले जाईल."
+SPANISH = "El gobierno anunció una nueva política para todos los distritos antes de fin de año."
+
+
+def test_language_comes_from_the_script():
+    assert detect_language("ਸਰਕਾਰ ਨੇ ਨਵੀਂ ਨੀਤੀ ਦਾ ਐਲਾਨ ਕੀਤਾ").value == "Punjabi"
+    assert detect_language("ਸਰਕਾਰ ਨੇ ਨਵੀਂ ਨੀਤੀ ਦਾ ਐਲਾਨ ਕੀਤਾ").confidence > 0.95
+    assert detect_language(ENGLISH) == ("English", 1.0)
+    # Latin script without English function words is not claimed as English
+    assert detect_language(SPANISH).confidence < 0.5
+
+
+def test_shared_scripts_are_left_to_the_llm():
+    # Devanagari is also Marathi, Nepali and Konkani; the script alone cannot tell them apart
+    classifier = LocalClassifier()
+    for text in (HINDI, MARATHI, "সরকার নতুন নীতি ঘোষণা করেছে"):
+        assert detect_language(text).confidence == 0.0
+        assert classifier.language(text) is None
+    assert classifier.stats()["tasks"]["language"]["escalated"] == 3
+
+
+def test_sentiment_is_confident_only_with_agreeing_opinion_words():
+    clear = ("Floods killed dozens and injured hundreds; the disaster deepened the crisis as deaths mounted "
+             "and protests over corruption spread.")
+    prediction = analyze_sentiment(clear)
+    assert prediction.value["label"] == "negative"
+    assert prediction.confidence >= 0.7
+    assert analyze_sentiment(ENGLISH).confidence == 0.0
+    assert analyze_sentiment("The win was followed by a loss.").confidence < 0.7
+
+
+def test_quality_is_only_decided_for_clear_cases():
+    assert assess_quality("Breaking: more soon.") == (0.2, 0.9)
+    assert assess_quality(" ".join([ENGLISH] * 5)).confidence == 0.0
+
+
+def test_confident_cases_skip_the_llm_and_are_counted():
+    analyzer = make_analyzer("not json", mode="per_field")
+    analyzer.local_classifier = LocalClassifier()
+    analysis = analyzer.analyze(ARTICLE)
+
+    # Language (Latin script, English prose) and quality (a two-sentence stub) are answered locally
+    assert analysis.language == "English"
+    assert analysis.quality_score == 0.2
+    assert len(analyzer.openai_service.calls) == 5
+    stats = analyzer.local_classifier.stats()
+    assert stats["llm_calls_avoided"] == 2
+    assert stats["tasks"]["sentiment"] == {"local": 0, "escalated": 1, "threshold": 0.7}
+
+
+def test_uncertain_cases_escalate_to_the_llm():
+    analyzer = make_analyzer("not json", mode="per_field")
+    analyzer.local_classifier = LocalClassifier(language_threshold=1.01)
+    assert analyzer._detect_language(ENGLISH) == "Hindi"  # FakeOpenAI's language answer
+    assert analyzer.local_classifier.stats()["tasks"]["language"]["escalated"] == 1
@@ -0,0 +1,85 @@
+"""Tests for task-based model routing and escalation in OpenAIService."""
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from app.ai.model_router import ModelRouter, _parse_tiers, json_array, max_words, number_between
+from tests.fakes import FakeCompletions, make_service
+
+SUMMARY = [{"role": "user", "content": "Summarize this article"}]
+
+
+class ModelCompletions(FakeCompletions):
+    """Replies per model: `replies[model]` is the reply text, or an exception to raise"""
+
+    def __init__(self, replies):
+        super().__init__(delay=0)
+        self.replies = replies
+        self.models = []
+
+    async def create(self, **kwargs):
+        self.models.append(kwargs["model"])
+        reply = self.replies[kwargs["model"]]
+        if isinstance(reply, Exception):
+            raise reply
+        message = SimpleNamespace(content=reply)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=SimpleNamespace(total_tokens=10))
+
+
+def routed_service(replies, **router_kwargs):
+    completions = ModelCompletions(replies)
+    service = make_service(completions)
+    service.router = ModelRouter(["mini", "large"], **router_kwargs)
+    return service, completions
+
+
+def test_validators():
+    assert json_array('```json\n["a"]\n```') and not json_array('{"a": 1}')
+    assert max_words(3)("Hindi") and not max_words(3)("The language is Hindi") and not max_words(3)("")
+    assert number_between(0, 10)(" 7 ") and not number_between(0, 10)("11") and not number_between(0, 10)("good")
+
+
+def test_tasks_start_at_their_tier():
+    router = ModelRouter(["mini", "large", "huge"], tiers=_parse_tiers("summary:1, quality:9, bad"))
+    assert router.models_for("keywords") == ["mini", "large", "huge"]
+    assert router.models_for("summary") == ["large", "huge"]
+    assert router.models_for("quality") == ["huge"]
+    assert router.models_for(None) == ["mini"]  # Unvalidated requests have nothing to escalate on
+
+
+def test_valid_reply_stays_on_the_cheap_model():
+    service, completions = routed_service({"mini": "A short summary.", "large": "unused"})
+    assert service._make_request(SUMMARY, task="summary") == "A short summary."
+    assert completions.models == ["mini"]
+    stats = service.router.stats()["tasks"]["summary"]
+    assert (stats["calls"], stats["escalation_rate"], stats["avg_tokens"], stats["models"]) == (1, 0.0, 10, {"mini": 1})
+
+
+def test_invalid_reply_escalates_to_the_next_tier():
+    service, completions = routed_service({"mini": "word " * 80, "large": "A short summary."})
+    assert service._make_request(SUMMARY, task="summary") == "A short summary."
+    assert completions.models == ["mini", "large"]
+    stats = service.router.stats()["tasks"]["summary"]
+    assert (stats["escalation_rate"], stats["invalid"], stats["avg_tokens"], stats["models"]) == \
+        (1.0, 0, 20, {"large": 1})
+
+
+def test_last_tier_reply_is_returned_even_if_invalid():
+    service, _ = routed_service({"mini": "not a number", "large": "still not"})
+    assert service._make_request([{"role": "user", "content": "rate"}], task="quality") == "still not"
+    assert service.router.stats()["tasks"]["quality"]["invalid"] == 1
+
+
+def test_api_error_on_a_cheap_model_escalates():
+    response = httpx.Response(400, request=httpx.Request("POST", "https://api.openai.com"))
+    error = openai.BadRequestError("unsupported", response=response, body=None)
+    service, completions = routed_service({"mini": error, "large": '["a", "b"]'})
+    assert service._make_request([{"role": "user", "content": "keywords"}], task="keywords") == '["a", "b"]'
+    assert completions.models == ["mini", "large"]
+
+    service, _ = routed_service({"mini": error, "large": error})
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(service._make_request_async([{"role": "user", "content": "keywords"}], task="keywords"))
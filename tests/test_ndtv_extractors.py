@@ -0,0 +1,53 @@
+"""Golden tests for NDTVScraper's extractors on the recorded fixture corpus.
+
+expected.json holds the output of each extract_* method per page. Regenerate
+it deliberately when a fixture is added or an extraction change is intended.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from app.scrapers.ndtv_scraper import NDTVScraper
+from benchmarks.bench_scrapers import compare, load_corpus, run_benchmark
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "ndtv"
+EXPECTED = json.loads((FIXTURE_DIR / "expected.json").read_text(encoding="utf-8"))
+PAGES = sorted(FIXTURE_DIR.glob("*.html"))
+
+
+def test_every_fixture_has_expectations():
+    assert sorted(EXPECTED) == [page.name for page in PAGES]
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda p: p.name)
+@pytest.mark.parametrize("field", ["title", "content", "metadata", "image_url"])
+def test_extractor_matches_recorded_output(page, field):
+    scraper = NDTVScraper()
+    soup = scraper.parse(page.read_text(encoding="utf-8"))
+    method = "extract_image" if field == "image_url" else f"extract_{field}"
+    assert getattr(scraper, method)(soup) == EXPECTED[page.name][field]
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda p: p.name)
+def test_recorded_pages_yield_complete_articles(page):
+    article = NDTVScraper()._build_article("https://www.ndtv.com/x", page.read_text(encoding="utf-8"), {},
+                                           fetched_via="fixture")
+    assert NDTVScraper().is_complete(article)
+    assert article.image_url.startswith("https://")
+    assert article.published_date
+
+
+def test_benchmark_report_covers_every_stage():
+    report = run_benchmark(NDTVScraper(), load_corpus("ndtv"), repeat=1)
+    assert report["pages"] == len(PAGES)
+    assert set(report["stages"]) == {"parse", "extract_title", "extract_content", "extract_metadata",
+                                     "extract_image", "extract_all", "selector_path", "structured_data",
+                                     "end_to_end"}
+    assert all(stage["pages_per_s"] > 0 and stage["peak_kb"] > 0 for stage in report["stages"].values())
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = {"stages": {"parse": {"median_ms": 2.0, "peak_kb": 100.0}}}
+    report = {"stages": {"parse": {"median_ms": 2.4, "peak_kb": 140.0}, "new_stage": {"median_ms": 9.0}}}
+    assert compare(report, baseline, tolerance=0.25) == ["parse peak_kb: 100.0 -> 140.0 (+40%)"]
@@ -0,0 +1,111 @@
+"""Tests for SimHash near-duplicate detection of article content."""
+import uuid
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.db.models import ContentFingerprint, Source, Story
+from app.processors.models import ContentAnalysis
+from app.processors.near_duplicates import NearDuplicateIndex, hamming_distance, simhash
+from app.scrapers.models import ScrapedArticle
+from tests.fakes import FakePipeline, FakeSeenIndex, make_runner, urls
+
+STORY = (
+    "The state government on Monday announced a new scheme to provide free electricity to farmers "
+    "across all districts, with the chief minister saying the programme would cost the exchequer "
+    "nearly two thousand crore rupees every year. Officials said the scheme would be rolled out in "
+    "phases starting next month, beginning with districts that have the highest number of small and "
+    "marginal farmers. Opposition leaders criticised the announcement, calling it an election gimmick "
+    "and questioning how the government planned to fund it while the power utilities remain in debt. "
+    "Farmer unions welcomed the move but demanded that the government also clear pending dues for "
+    "crops procured during the last season. The energy minister told reporters that meters would "
+    "still be installed on agricultural connections so that consumption could be monitored, and that "
+    "the subsidy would be paid directly to the distribution companies every quarter. Economists warned "
+    "that free power has in the past encouraged excessive groundwater extraction, and urged the "
+    "government to pair the scheme with incentives for drip irrigation and solar pumps. The cabinet "
+    "is expected to approve the detailed guidelines at its meeting later this week, after which the "
+    "agriculture department will begin registering eligible farmers through village level camps."
+)
+REPUBLISHED = STORY.replace("crops procured", "paddy procured") + " (With inputs from agencies)"
+UNRELATED = (
+    "The national cricket team completed a comfortable seven wicket win in the second test match on "
+    "Sunday, chasing down the target with more than a session to spare. The captain praised the bowlers "
+    "for their discipline on a flat pitch and said the young opener had shown great maturity in his "
+    "first series. The third test begins next week at a venue known for assisting spin, and selectors "
+    "are expected to name an unchanged squad after the injured fast bowler was ruled out for the rest "
+    "of the tour because of a hamstring strain picked up during fielding practice on Saturday."
+)
+
+ANALYSIS = ContentAnalysis(word_count=100, sentence_count=5, readability_score=0.0, sentiment_score=0.0,
+                           ai_summary="Free power for farmers")
+
+
+def make_index(db_session, **kwargs):
+    return NearDuplicateIndex(session_factory=lambda: db_session, **kwargs)
+
+
+def test_simhash_keeps_edited_copies_close():
+    assert hamming_distance(simhash(STORY), simhash(REPUBLISHED)) <= 5
+    assert hamming_distance(simhash(STORY), simhash(UNRELATED)) > 10
+
+
+def test_find_returns_the_original_with_its_analysis(db_session):
+    index = make_index(db_session)
+    index.add("https://www.ndtv.com/a", index.fingerprint(STORY), ANALYSIS)
+
+    match = index.find(index.fingerprint(REPUBLISHED))
+    assert match.url == "https://www.ndtv.com/a"
+    assert match.analysis.ai_summary == "Free power for farmers"
+    assert index.find(index.fingerprint(UNRELATED)) is None
+    assert index.find(index.fingerprint(STORY), exclude_url="https://ndtv.com/a/") is None
+
+
+def test_short_content_is_not_fingerprinted(db_session):
+    index = make_index(db_session)
+    assert index.fingerprint("Breaking: markets open higher") is None
+    assert index.find(None) is None
+
+
+def test_fingerprints_survive_a_restart_and_link_stories(db_session):
+    story = Story(id=uuid.uuid4(), title_en="t", title_hi="t", summary_en="s", summary_hi="s", category="india")
+    story.sources = [Source(outlet="NDTV", url="https://www.ndtv.com/a")]
+    db_session.add(story)
+    db_session.commit()
+    story_id = str(story.id)
+    make_index(db_session).add("https://www.ndtv.com/a", simhash(STORY), ANALYSIS)
+    assert db_session.query(ContentFingerprint).count() == 1
+
+    match = make_index(db_session).find(simhash(REPUBLISHED))
+    assert match.url == "https://www.ndtv.com/a"
+    assert match.story_id == story_id
+
+
+def test_lookup_only_compares_band_candidates(db_session):
+    index = make_index(db_session)
+    index.add("https://www.ndtv.com/a", simhash(STORY))
+    index.add("https://www.ndtv.com/b", simhash(UNRELATED))
+    assert index.candidates(simhash(REPUBLISHED)) == {"https://ndtv.com/a"}
+
+
+class ContentScraper:
+    def __init__(self, contents):
+        self.contents = contents
+
+    def scrape_article_politely(self, url, platform):
+        return ScrapedArticle(title=url, content=self.contents[url], source=platform, url=url,
+                              scraped_at=datetime.now())
+
+
+def test_job_links_near_duplicates_instead_of_analyzing(db_session):
+    job_urls = urls("original", "copy")
+    scraper = ContentScraper({job_urls[0]["url"]: STORY, job_urls[1]["url"]: REPUBLISHED})
+    pipeline = FakePipeline()
+    # The index closes its sessions, so it must not share the runner's
+    index = NearDuplicateIndex(session_factory=lambda: Session(bind=db_session.bind))
+    runner = make_runner(db_session, scraper=scraper, pipeline=pipeline, seen=FakeSeenIndex(), near_duplicates=index)
+
+    status = runner.run_job(runner.create_job(job_urls))
+    assert status["counts"] == {"done": 1, "near_duplicate": 1}
+    assert status["items"][1]["duplicate_of"] == job_urls[0]["url"]
+    assert status["items"][1]["summary"] == "A summary"
+    assert ("analyze", job_urls[1]["url"]) not in pipeline.calls
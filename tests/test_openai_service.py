@@ -0,0 +1,126 @@
+"""Tests for the async OpenAI client, its rate limiter and retry handling."""
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from app.ai import openai_service as service_module
+from app.ai.embedding_batcher import EmbeddingBatcher
+from app.ai.rate_limiter import RequestRateLimiter, backoff_delay, retry_after_seconds
+from tests.fakes import FakeCompletions, FakeEmbeddings, make_service
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def rate_limit_error(headers):
+    response = httpx.Response(429, headers=headers, request=httpx.Request("POST", "https://api.openai.com"))
+    return openai.RateLimitError("slow down", response=response, body=None)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of waiting them out"""
+    recorded = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds):
+        recorded.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(service_module.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+def test_limiter_enforces_requests_and_tokens_per_minute():
+    clock = FakeClock()
+    limiter = RequestRateLimiter(requests_per_minute=2, tokens_per_minute=100, clock=clock)
+    assert limiter.reserve(40) == 0
+    assert limiter.reserve(40) == 0
+    assert limiter.reserve(10) == pytest.approx(30)  # Out of requests: one comes back every 30s
+
+    clock.now = 30
+    assert limiter.reserve(80) == pytest.approx(6)  # 70 tokens refilled; 10 more take 6s
+    limiter.settle(estimated=40, actual=10)
+    assert limiter.reserve(80) == 0
+
+
+def test_retry_after_headers_are_parsed():
+    assert retry_after_seconds(rate_limit_error({"retry-after": "7"})) == 7
+    assert retry_after_seconds(rate_limit_error({"retry-after-ms": "1500"})) == 1.5
+    assert retry_after_seconds(rate_limit_error({})) is None
+    assert retry_after_seconds(ValueError("no response")) is None
+
+
+def test_backoff_honors_retry_after_with_jitter():
+    for attempt in range(5):
+        assert 0 <= backoff_delay(attempt, base=1.0) <= 2 ** attempt
+        assert 3.0 <= backoff_delay(attempt, retry_after=3.0) <= 3.5
+
+
+def test_requests_run_concurrently():
+    completions = FakeCompletions()
+    service = make_service(completions)
+
+    async def run():
+        return await asyncio.gather(*[
+            service._make_request_async([{"role": "user", "content": f"q{i}"}]) for i in range(8)
+        ])
+
+    replies = asyncio.run(run())
+    assert replies == [f"reply to q{i}" for i in range(8)]
+    assert completions.peak == 8
+
+
+def test_rate_limit_retries_after_server_delay(sleeps):
+    completions = FakeCompletions(failures=[rate_limit_error({"retry-after": "4"})])
+    service = make_service(completions)
+    reply = asyncio.run(service._make_request_async([{"role": "user", "content": "hi"}]))
+    assert reply == "reply to hi"
+    assert completions.calls == 2
+    assert any(4 <= delay <= 4.5 for delay in sleeps)
+
+
+def test_bad_request_is_not_retried(sleeps):
+    response = httpx.Response(400, request=httpx.Request("POST", "https://api.openai.com"))
+    completions = FakeCompletions(failures=[openai.BadRequestError("bad", response=response, body=None)])
+    service = make_service(completions)
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(service._make_request_async([{"role": "user", "content": "hi"}]))
+    assert completions.calls == 1
+
+
+def test_sync_facade_runs_on_background_loop():
+    service = make_service(FakeCompletions())
+    assert service._make_request([{"role": "user", "content": "sync"}]) == "reply to sync"
+
+
+def test_embedding_batches_respect_token_and_item_limits():
+    batcher = EmbeddingBatcher(max_tokens=10, max_items=3)
+    assert batcher.plan([4, 4, 4, 1, 1, 1, 1, 20, 2]) == [[0, 1], [2, 3, 4], [5, 6], [7], [8]]
+
+
+def test_only_failed_embedding_sub_batches_are_retried(sleeps):
+    embeddings = FakeEmbeddings(failures=[rate_limit_error({"retry-after": "2"})])
+    service = make_service(FakeCompletions(), embeddings=embeddings)
+    service.embedding_batcher.max_items = 2
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+    vectors = service._create_embeddings(texts)
+    assert [vector[0] for vector in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert len(embeddings.inputs) == 4  # Three sub-batches, the first failed once
+    assert embeddings.inputs[0] == embeddings.inputs[3] == ["a", "bb"]
+    assert any(2 <= delay <= 2.5 for delay in sleeps)
+
+
+def test_embedding_failure_returns_nothing_rather_than_misaligned(sleeps):
+    failures = [rate_limit_error({}) for _ in range(9)]  # Every sub-batch fails all three attempts
+    service = make_service(FakeCompletions(), embeddings=FakeEmbeddings(failures=failures))
+    service.embedding_batcher.max_items = 1
+    assert service._create_embeddings(["a", "b", "c"]) == []
@@ -0,0 +1,79 @@
+"""Tests for waiting on per-scraper readiness signals before extracting a rendered page."""
+import json
+
+from bs4 import BeautifulSoup
+
+from app.scrapers.driver_pool import DriverPool
+from app.scrapers.ndtv_scraper import NDTVScraper
+
+LOADING = '<html><head></head><body><h1 class="sp-ttl">Headline</h1></body></html>'
+BODY = '<html><body><h1 class="sp-ttl">Headline</h1><div class="sp-descp"><p>Body.</p></div></body></html>'
+JSON_LD = ('<html><head><script type="application/ld+json">{"@type": "NewsArticle"}</script></head>'
+           '<body><h1 class="sp-ttl">Headline</h1></body></html>')
+
+
+class DOMDriver:
+    """Serves `pages` in turn, one per readiness poll, and runs readiness scripts against the current one"""
+
+    def __init__(self, *pages):
+        self.pages = list(pages)
+        self.polls = 0
+
+    @property
+    def page_source(self):
+        return self.pages[min(self.polls, len(self.pages)) - 1]
+
+    def execute_script(self, script):
+        self.polls += 1
+        selectors = json.loads(script[len("return "):script.index(".some(")])
+        soup = BeautifulSoup(self.page_source, "html.parser")
+        return any(soup.select_one(selector) is not None for selector in selectors)
+
+    def get(self, url):
+        pass
+
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+    def get_log(self, kind):
+        return []
+
+    def quit(self):
+        pass
+
+
+def scraper(**attrs):
+    scraper = NDTVScraper()
+    scraper.html_cache = None
+    for name, value in attrs.items():
+        setattr(scraper, name, value)
+    return scraper
+
+
+def test_waits_for_a_ready_selector():
+    driver = DOMDriver(LOADING, LOADING, BODY)
+    assert scraper(ready_on_json_ld=False).wait_until_ready(driver)
+    assert driver.polls == 3
+
+
+def test_json_ld_block_counts_as_ready():
+    driver = DOMDriver(LOADING, JSON_LD)
+    assert scraper().wait_until_ready(driver)
+    assert driver.polls == 2
+
+
+def test_json_ld_is_ignored_when_disabled():
+    driver = DOMDriver(JSON_LD)
+    assert not scraper(ready_on_json_ld=False, ready_timeout=0.3).wait_until_ready(driver)
+
+
+def test_page_is_extracted_anyway_after_the_timeout(monkeypatch):
+    driver = DOMDriver(LOADING)
+    page_scraper = scraper(ready_timeout=0.3)
+    page_scraper.driver_pool = DriverPool(max_size=1, driver_factory=lambda: driver)
+    monkeypatch.setattr(page_scraper, "get_fetch_mode", lambda: "browser")
+
+    article = page_scraper.scrape_article("https://www.ndtv.com/india-news/slow")
+    assert driver.polls > 1
+    assert article.timings["page_ready"] >= 0.3
+    assert article.title == "Headline"
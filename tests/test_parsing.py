@@ -0,0 +1,55 @@
+"""Tests for HTML pruning, parser selection and single-pass NDTV extraction."""
+from pathlib import Path
+
+import pytest
+
+from app.scrapers.ndtv_scraper import NDTVScraper
+from app.scrapers.parsing import parse_html, prune_html, resolve_parser
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "ndtv").glob("*.html"))
+
+
+def test_prune_drops_scripts_and_styles():
+    html = "<div><script>var a = '<p>';</script><style>p{}</style><p>kept</p></div>"
+    assert prune_html(html) == "<div><p>kept</p></div>"
+
+
+def test_prune_keeps_marked_elements():
+    html = '<nav class="menu">a</nav><nav class="pst-by">b</nav>'
+    assert prune_html(html, tags=("nav",), keep_markers=("pst-by",)) == '<nav class="pst-by">b</nav>'
+
+
+def test_prune_drops_comments_before_matching_tags():
+    html = "<!-- <iframe src=ad> --><p>Body para one</p><p>two</p><iframe src=x></iframe><p>end</p>"
+    assert prune_html(html) == "<p>Body para one</p><p>two</p><p>end</p>"
+
+
+def test_prune_drops_nested_elements_whole():
+    html = "<svg><svg><g/></svg><text>x</text></svg><p>a</p><template><template>t</template>u</template><p>b</p>"
+    assert prune_html(html) == "<p>a</p><p>b</p>"
+
+
+def test_prune_reads_script_content_as_text():
+    html = "<script>document.write('<script>x</scr' + 'ipt>');</script><p>kept</p>"
+    assert prune_html(html) == "<p>kept</p>"
+
+
+def test_prune_leaves_unclosed_elements():
+    assert prune_html("<p>a</p><iframe src=x><p>b</p>") == "<p>a</p><iframe src=x><p>b</p>"
+
+
+def test_unknown_parser_falls_back_to_html_parser():
+    assert resolve_parser("not-a-parser") == "html.parser"
+
+
+@pytest.mark.parametrize("page", FIXTURES, ids=lambda p: p.name)
+def test_extract_all_matches_individual_extractors(page):
+    scraper = NDTVScraper()
+    soup = parse_html(page.read_text(encoding="utf-8"), prune_tags=scraper.prune_tags,
+                      keep_markers=scraper.prune_keep_markers)
+    assert scraper.extract_all(soup) == {
+        "title": scraper.extract_title(soup),
+        "content": scraper.extract_content(soup),
+        "metadata": scraper.extract_metadata(soup),
+        "image_url": scraper.extract_image(soup),
+    }
@@ -0,0 +1,112 @@
+"""Tests for resumable, stage-checkpointed processing jobs."""
+import time
+
+from app.db.models import ProcessingJobItem
+from app.scrapers.models import ScrapedArticle
+from tests.fakes import FakePipeline, FakeScraper, FakeSeenIndex, make_runner, urls
+
+
+def test_job_runs_every_stage_and_reports_progress(db_session):
+    seen = FakeSeenIndex()
+    runner = make_runner(db_session, seen=seen)
+    job_id = runner.create_job(urls("a", "b"))
+
+    status = runner.run_job(job_id)
+    assert status["status"] == "completed"
+    assert status["counts"] == {"done": 2}
+    assert status["stages"]["embedded"] == 2
+    assert status["items"][0]["summary"] == "A summary"
+    assert "https://www.ndtv.com/a" in seen.seen
+
+
+def test_seen_urls_are_not_scraped(db_session):
+    scraper = FakeScraper()
+    runner = make_runner(db_session, scraper=scraper, seen=FakeSeenIndex({"https://www.ndtv.com/a"}))
+    status = runner.run_job(runner.create_job(urls("a", "b")))
+    assert scraper.calls == ["https://www.ndtv.com/b"]
+    assert status["counts"] == {"duplicate": 1, "done": 1}
+
+
+def wait_for_status(runner, job_id, status, timeout=5):
+    deadline = time.monotonic() + timeout
+    while runner.job_status(job_id)["status"] != status and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return runner.job_status(job_id)["status"]
+
+
+def test_interrupted_item_resumes_from_last_completed_stage(db_session):
+    scraper, pipeline = FakeScraper(), FakePipeline()
+    runner = make_runner(db_session, scraper=scraper, pipeline=pipeline, lease_seconds=0.2)
+    job_id = runner.create_job(urls("a"))
+
+    # Simulate a worker that chunked the article and then died right before a restart,
+    # so its lease is still live when the job is resumed
+    [item_id] = runner.claim_items(job_id)
+    item = db_session.get(ProcessingJobItem, item_id)
+    item.stage = "chunked"
+    item.scraped = scraper.scrape_article_politely(item.url, "ndtv").model_dump(mode="json")
+    item.chunks = [c.model_dump(mode="json") for c in pipeline.chunk(ScrapedArticle(**item.scraped))]
+    db_session.commit()
+    scraper.calls.clear()
+    pipeline.calls.clear()
+
+    assert runner.resume_incomplete() == [job_id]
+    assert runner.job_status(job_id)["status"] == "pending"
+
+    # A retry runs once the lease has expired
+    assert wait_for_status(runner, job_id, "completed") == "completed"
+    assert scraper.calls == []
+    assert pipeline.calls == [("analyze", "https://www.ndtv.com/a"), ("embed", "https://www.ndtv.com/a")]
+
+
+def test_live_lease_is_not_stolen(db_session):
+    runner = make_runner(db_session, lease_seconds=600)
+    job_id = runner.create_job(urls("a"))
+    assert runner.claim_items(job_id)
+    assert runner.claim_items(job_id) == []
+
+
+def test_stage_failures_retry_then_fail(db_session):
+    pipeline = FakePipeline(fail_analysis_times=1)
+    scraper = FakeScraper(statuses={"https://www.ndtv.com/bad": "failed"})
+    runner = make_runner(db_session, scraper=scraper, pipeline=pipeline, max_attempts=2)
+    status = runner.run_job(runner.create_job(urls("flaky", "bad")))
+
+    flaky, bad = status["items"]
+    assert flaky["status"] == "done" and flaky["attempts"] == 2
+    # The retry skipped the scrape and chunk stages that had already succeeded
+    assert scraper.calls.count("https://www.ndtv.com/flaky") == 1
+    assert bad["status"] == "failed" and bad["last_error"] == "scrape failed"
+    assert status["status"] == "completed_with_errors"
+
+
+def test_throttled_source_leaves_job_pending(db_session):
+    scraper = FakeScraper(statuses={"https://www.ndtv.com/a": "circuit_open"})
+    runner = make_runner(db_session, scraper=scraper)
+    status = runner.run_job(runner.create_job(urls("a")))
+    assert status["status"] == "pending"
+    assert status["items"][0]["attempts"] == 0
+
+
+def test_jobs_api_runs_in_background_and_reports_status(db_session, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    import app.api.articles as articles_api
+    from app.config import settings
+
+    # The test session is shared, so keep to one worker thread
+    monkeypatch.setattr(settings, "JOB_WORKERS", 1)
+    monkeypatch.setattr(articles_api, "job_runner", make_runner(db_session))
+    app = FastAPI()
+    app.include_router(articles_api.router, prefix="/api/v1")
+    client = TestClient(app)
+
+    created = client.post("/api/v1/articles/jobs", json={"urls": ["https://www.ndtv.com/a"]})
+    assert created.status_code == 202
+    assert created.json()["status"] == "pending"
+
+    status = client.get(f"/api/v1/articles/jobs/{created.json()['job_id']}").json()
+    assert status["status"] == "completed"
+    assert status["items"][0]["stage"] == "embedded"
+    assert client.get("/api/v1/articles/jobs/not-a-job").status_code == 404
@@ -0,0 +1,130 @@
+"""Tests for the adaptive per-domain rate controller and circuit breaker."""
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.api.scrapers as scrapers_api
+from app.scrapers.models import ScrapedArticle
+from app.scrapers.politeness import DomainThrottle
+from app.scrapers.rate_control import AdaptiveRateController, CircuitOpenError
+from app.scrapers.unified_scraper import UnifiedScraper
+
+URL = "https://www.ndtv.com/india-news/a"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def make_controller(**kwargs):
+    clock = FakeClock()
+    options = dict(initial_rate=1.0, min_rate=0.1, max_rate=4.0, failure_threshold=3, cooldown=30)
+    options.update(kwargs)
+    return AdaptiveRateController(clock=clock, sleep=clock.sleep, **options), clock
+
+
+def test_token_bucket_paces_requests():
+    controller, clock = make_controller(initial_rate=2.0)
+    for _ in range(4):
+        controller.acquire(URL)
+    # Burst of 2, then one token every 0.5s
+    assert clock.slept == [0.5, 0.5]
+
+
+def test_rate_grows_additively_and_halves_on_slow_or_failed_requests():
+    controller, _ = make_controller(increase=0.5, target_latency=2.0)
+    controller.record(URL, 1.0, success=True)
+    controller.record(URL, 1.0, success=True)
+    assert controller.snapshot()["ndtv.com"]["rate_per_s"] == 2.0
+    controller.record(URL, 5.0, success=True)
+    assert controller.snapshot()["ndtv.com"]["rate_per_s"] == 1.0
+    controller.record(URL, 1.0, success=False)
+    assert controller.snapshot()["ndtv.com"]["rate_per_s"] == 0.5
+
+
+def test_breaker_opens_after_repeated_failures_and_probes_recovery():
+    controller, clock = make_controller()
+    for _ in range(3):
+        controller.record(URL, 1.0, success=False)
+    state = controller.snapshot()["ndtv.com"]
+    assert state["state"] == "open" and state["throttled"]
+    with pytest.raises(CircuitOpenError):
+        controller.acquire(URL)
+
+    clock.now += 30
+    probe = controller.acquire(URL)  # The single half-open probe
+    assert probe
+    with pytest.raises(CircuitOpenError):
+        controller.acquire(URL)
+    controller.record(URL, 1.0, success=True, probe=probe)
+    assert controller.snapshot()["ndtv.com"]["state"] == "closed"
+
+
+def test_only_the_probe_decides_a_half_open_breaker():
+    controller, clock = make_controller()
+    assert not controller.acquire(URL)  # Admitted while closed, finishes after the breaker opens
+    for _ in range(3):
+        controller.record(URL, 1.0, success=False)
+    clock.now += 30
+    probe = controller.acquire(URL)
+
+    controller.record(URL, 1.0, success=True)
+    assert controller.snapshot()["ndtv.com"]["state"] == "half_open"
+    with pytest.raises(CircuitOpenError):
+        controller.acquire(URL)  # The probe is still in flight
+    controller.record(URL, 1.0, success=True, probe=probe)
+    assert controller.snapshot()["ndtv.com"]["state"] == "closed"
+
+
+def test_failed_probe_reopens_breaker():
+    controller, clock = make_controller()
+    for _ in range(3):
+        controller.record(URL, 1.0, success=False)
+    clock.now += 30
+    controller.record(URL, 1.0, success=False, probe=controller.acquire(URL))
+    assert controller.snapshot()["ndtv.com"]["retry_after_s"] == 30
+
+
+def test_unified_scraper_skips_domain_with_open_breaker(monkeypatch):
+    controller, _ = make_controller(failure_threshold=2)
+    scraper = UnifiedScraper(throttle=DomainThrottle(min_interval=0), skip_seen=False, controller=controller)
+    calls = []
+
+    def failing_scrape(url, platform):
+        calls.append(url)
+        return ScrapedArticle(title="", content="", source=platform, url=url, scraped_at=datetime.now(),
+                              status="failed")
+
+    monkeypatch.setattr(scraper, "scrape_article", failing_scrape)
+    urls = [{"url": f"https://www.ndtv.com/india-news/{i}", "platform": "ndtv"} for i in range(4)]
+    articles = scraper.scrape_multiple_articles(urls, concurrent=False)
+    assert len(calls) == 2
+    assert [a.status for a in articles] == ["failed", "failed", "circuit_open", "circuit_open"]
+
+
+def test_api_reports_and_resets_domain_state(monkeypatch):
+    controller, _ = make_controller(failure_threshold=1)
+    controller.record(URL, 1.0, success=False)
+    monkeypatch.setattr(scrapers_api, "rate_controller", controller)
+    app = FastAPI()
+    app.include_router(scrapers_api.router, prefix="/api/v1")
+    client = TestClient(app)
+
+    body = client.get("/api/v1/scrapers/domains").json()
+    assert body["throttled"] == ["ndtv.com"]
+    assert body["domains"]["ndtv.com"]["state"] == "open"
+
+    reset = client.post("/api/v1/scrapers/domains/ndtv.com/reset").json()
+    assert reset["state"]["state"] == "closed"
+    assert client.post("/api/v1/scrapers/domains/unknown.com/reset").status_code == 404
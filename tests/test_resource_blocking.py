@@ -0,0 +1,100 @@
+"""Tests for Chrome resource blocking and per-page network reporting."""
+import json
+
+from app.scrapers.driver_pool import DriverPool
+from app.scrapers.ndtv_scraper import NDTVScraper
+from app.scrapers.resource_blocking import apply_resource_blocking, summarize_network
+
+PAGE = """
+<html><head><meta property="og:image" content="https://c.ndtvimg.com/lead.jpg"></head>
+<body><h1>Headline</h1><div class="sp-descp"><p>Body text.</p></div></body></html>
+"""
+
+
+def event(method, **params):
+    return {"method": method, "params": params}
+
+
+PAGE_EVENTS = [
+    event("Network.requestWillBeSent", requestId="1", type="Document"),
+    event("Network.loadingFinished", requestId="1", encodedDataLength=50_000),
+    event("Network.requestWillBeSent", requestId="2", type="Image"),
+    event("Network.loadingFailed", requestId="2", type="Image", blockedReason="inspector"),
+    event("Network.requestWillBeSent", requestId="3", type="Script"),
+    event("Network.loadingFailed", requestId="3", blockedReason="inspector"),
+    event("Network.requestWillBeSent", requestId="4", type="XHR"),
+    event("Network.loadingFailed", requestId="4", type="XHR", errorText="net::ERR_ABORTED"),
+]
+
+
+class FakeDriver:
+    def __init__(self, events=(), reject_ordered=False):
+        self.commands = []
+        self.events = list(events)
+        self.reject_ordered = reject_ordered
+
+    def execute_cdp_cmd(self, cmd, params):
+        if self.reject_ordered and "urlPatterns" in params:
+            raise RuntimeError("Invalid parameters")
+        self.commands.append((cmd, params))
+
+    def get_log(self, kind):
+        entries = [{"message": json.dumps({"message": e})} for e in self.events]
+        self.events = []
+        return entries
+
+    def get(self, url):
+        self.events = list(PAGE_EVENTS)
+
+    def execute_script(self, script):
+        return True
+
+    @property
+    def page_source(self):
+        return PAGE
+
+    def quit(self):
+        pass
+
+
+def test_allowlist_takes_precedence():
+    driver = FakeDriver()
+    assert apply_resource_blocking(driver, ["*.jpg", "*.woff2"], ["*logo.jpg"])
+    cmd, params = driver.commands[-1]
+    assert cmd == "Network.setBlockedURLs"
+    assert params["urlPatterns"][0] == {"urlPattern": "*logo.jpg", "block": False}
+    assert {"urlPattern": "*.woff2", "block": True} in params["urlPatterns"]
+
+
+def test_flat_block_list_fallback_drops_allowlisted_patterns():
+    driver = FakeDriver(reject_ordered=True)
+    assert apply_resource_blocking(driver, ["*.jpg", "*.woff2"], ["*.jpg"])
+    assert driver.commands[-1] == ("Network.setBlockedURLs", {"urls": ["*.woff2"]})
+
+
+def test_summary_counts_only_blocked_failures():
+    stats = summarize_network(PAGE_EVENTS, load_seconds=1.0)
+    assert stats["requests"] == 4
+    assert stats["bytes"] == 50_000
+    assert stats["blocked"] == 2
+    assert stats["blocked_image"] == 1
+    assert stats["blocked_script"] == 1
+    assert stats["est_bytes_saved"] == 95_000
+    assert stats["est_seconds_saved"] == 1.9
+
+
+def test_browser_fetch_reports_network_and_keeps_og_image(monkeypatch):
+    driver = FakeDriver(events=[event("Network.requestWillBeSent", requestId="old")])
+    pool = DriverPool(max_size=1, driver_factory=lambda: driver)
+    scraper = NDTVScraper()
+    scraper.driver_pool = pool
+    scraper.html_cache = None
+    monkeypatch.setattr(scraper, "get_fetch_mode", lambda: "browser")
+
+    article = scraper.scrape_article("https://www.ndtv.com/india-news/x")
+    assert article.fetched_via == "browser"
+    assert article.image_url == "https://c.ndtvimg.com/lead.jpg"
+    # Events from before navigation are discarded
+    assert article.network["requests"] == 4
+    assert article.network["blocked"] == 2
+    assert ("Network.setBlockedURLs", {"urls": list(scraper.blocked_resources)}) in driver.commands
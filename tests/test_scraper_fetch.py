@@ -0,0 +1,79 @@
+"""Tests for the HTTP-first fetch strategy in SeleniumBaseScraper."""
+from app.config import settings
+from app.scrapers.factory import ScraperFactory
+from app.scrapers.ndtv_scraper import NDTVScraper
+
+FULL_PAGE = """
+<html><head><meta property="og:image" content="https://c.ndtvimg.com/a.jpg"></head>
+<body><h1 class="sp-ttl">Headline</h1><div class="sp-descp"><p>Body text.</p></div></body></html>
+"""
+SHELL_PAGE = "<html><body><div id='root'></div></body></html>"
+
+
+def make_scraper(monkeypatch, http_html, browser_html=FULL_PAGE):
+    scraper = NDTVScraper()
+    calls = []
+
+    def fake_http(url, timings):
+        calls.append("http")
+        if isinstance(http_html, Exception):
+            raise http_html
+        return http_html
+
+    def fake_browser(url, timings, network=None):
+        calls.append("browser")
+        return browser_html
+
+    monkeypatch.setattr(scraper, "fetch_http", fake_http)
+    monkeypatch.setattr(scraper, "fetch_browser", fake_browser)
+    return scraper, calls
+
+
+def test_http_result_used_when_complete(monkeypatch):
+    scraper, calls = make_scraper(monkeypatch, FULL_PAGE)
+    article = scraper.scrape_article("https://www.ndtv.com/x")
+    assert calls == ["http"]
+    assert article.fetched_via == "http"
+    assert article.title == "Headline"
+    assert article.content == "Body text."
+
+
+def test_falls_back_to_browser_when_extraction_empty(monkeypatch):
+    scraper, calls = make_scraper(monkeypatch, SHELL_PAGE)
+    article = scraper.scrape_article("https://www.ndtv.com/x")
+    assert calls == ["http", "browser"]
+    assert article.fetched_via == "browser"
+    assert article.status == "success"
+
+
+def test_falls_back_to_browser_when_http_errors(monkeypatch):
+    scraper, calls = make_scraper(monkeypatch, ConnectionError("reset"))
+    article = scraper.scrape_article("https://www.ndtv.com/x")
+    assert calls == ["http", "browser"]
+    assert article.status == "success"
+
+
+def test_platform_setting_forces_browser(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPER_FETCH_MODES", "ndtv:browser")
+    scraper, calls = make_scraper(monkeypatch, FULL_PAGE)
+    scraper.scrape_article("https://www.ndtv.com/x")
+    assert calls == ["browser"]
+
+
+def test_platform_setting_forces_http(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPER_FETCH_MODES", "ndtv:http")
+    scraper, calls = make_scraper(monkeypatch, SHELL_PAGE)
+    article = scraper.scrape_article("https://www.ndtv.com/x")
+    assert calls == ["http"]
+    assert article.content == ""
+
+
+def test_fetch_mode_is_keyed_by_factory_platform(monkeypatch):
+    class ExampleScraper(NDTVScraper):
+        def __init__(self):
+            super().__init__()
+            self.source_name = "Example News"
+
+    monkeypatch.setitem(ScraperFactory._scrapers, "example_news", ExampleScraper)
+    monkeypatch.setattr(settings, "SCRAPER_FETCH_MODES", "example_news:browser")
+    assert ScraperFactory.get_scraper("Example_News").get_fetch_mode() == "browser"
@@ -0,0 +1,78 @@
+"""Tests for the JSON-LD fast path in SeleniumBaseScraper."""
+import json
+from pathlib import Path
+
+import pytest
+
+from app.scrapers.ndtv_scraper import NDTVScraper
+from app.scrapers.structured_data import article_fields, extract_json_ld, find_article
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "ndtv"
+
+
+def page(*blocks, body=""):
+    scripts = "".join(f'<script type="application/ld+json">{block}</script>' for block in blocks)
+    return f"<html><head>{scripts}</head><body>{body}</body></html>"
+
+
+def test_graph_and_lists_are_flattened():
+    html = page(json.dumps({"@graph": [{"@type": "WebSite"}, {"@type": ["NewsArticle"], "headline": "A"}]}),
+                json.dumps([{"@type": "Organization"}]))
+    objects = extract_json_ld(html)
+    assert [o.get("@type") for o in objects] == [None, "WebSite", ["NewsArticle"], "Organization"]
+    assert find_article(objects)["headline"] == "A"
+
+
+def test_invalid_blocks_are_skipped():
+    html = page("{not json", json.dumps({"@type": "NewsArticle", "headline": "Kept"}))
+    assert find_article(extract_json_ld(html))["headline"] == "Kept"
+
+
+def test_article_fields_normalise_schema_org_shapes():
+    fields = article_fields({
+        "headline": "Rains &amp; floods",
+        "articleBody": "Body",
+        "image": [{"@type": "ImageObject", "url": "https://c.ndtvimg.com/a.jpg"}],
+        "author": [{"name": "A. Writer"}, {"name": "B. Writer"}],
+        "datePublished": "2025-07-10T09:30:00+05:30",
+        "articleSection": ["India News"],
+    })
+    assert fields == {
+        "title": "Rains & floods",
+        "content": "Body",
+        "image_url": "https://c.ndtvimg.com/a.jpg",
+        "author": "A. Writer, B. Writer",
+        "published_date": "2025-07-10T09:30:00+05:30",
+        "category": "India News",
+    }
+
+
+def test_complete_json_ld_skips_the_selector_path(monkeypatch):
+    scraper = NDTVScraper()
+    monkeypatch.setattr(scraper, "parse", lambda html: pytest.fail("selector path should not run"))
+    html = (FIXTURE_DIR / "india_news_sp_descp.html").read_text(encoding="utf-8")
+    expected = json.loads((FIXTURE_DIR / "expected.json").read_text(encoding="utf-8"))["india_news_sp_descp.html"]
+
+    article = scraper._build_article("https://www.ndtv.com/x", html, {}, fetched_via="http")
+    assert article.title == expected["title"]
+    assert article.content == expected["content"]
+    assert article.image_url == expected["image_url"]
+    assert article.category == "India News"
+
+
+def test_missing_fields_fall_back_to_selectors():
+    html = page(json.dumps({"@type": "NewsArticle", "headline": "From JSON-LD", "articleBody": "Structured body"}),
+                body='<meta property="og:image" content="https://c.ndtvimg.com/og.jpg">'
+                     '<h1>From HTML</h1><nav class="pst-by"><span class="pst-by_txt">Reporter</span></nav>')
+    article = NDTVScraper()._build_article("https://www.ndtv.com/x", html, {}, fetched_via="http")
+    assert article.title == "From JSON-LD"
+    assert article.content == "Structured body"
+    assert article.image_url == "https://c.ndtvimg.com/og.jpg"
+    assert article.author == "Reporter"
+
+
+def test_structured_data_can_be_disabled(monkeypatch):
+    scraper = NDTVScraper()
+    monkeypatch.setattr(scraper, "use_structured_data", False)
+    html = page(json.dumps({"@type": "NewsArticle", "headline": "From JSON-LD"}), body="<h1>From HTML</h1>")
+    assert scraper._build_article("https://www.ndtv.com/x", html, {}, fetched_via="http").title == "From HTML"
@@ -0,0 +1,212 @@
+"""Tests for multi-tab page loading in one browser session."""
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from selenium.common.exceptions import WebDriverException
+
+from app.config import settings
+from app.scrapers.models import ScrapedArticle
+from app.scrapers.ndtv_scraper import NDTVScraper
+from app.scrapers.politeness import DomainThrottle
+from app.scrapers.rate_control import AdaptiveRateController
+from app.scrapers.tabs import TabScheduler
+from app.scrapers.unified_scraper import UnifiedScraper
+
+PAGE = '<html><body><h1 class="sp-ttl">{}</h1><div class="sp-descp"><p>Body.</p></div></body></html>'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        if handle not in self.driver.windows:
+            raise WebDriverException("no such window")
+        self.driver.current = handle
+
+    def new_window(self, kind):
+        self.driver.opened += 1
+        handle = f"tab{self.driver.opened}"
+        self.driver.windows[handle] = {"url": None, "polls": 0}
+        self.driver.current = handle
+
+
+class FakeDriver:
+    """Windows load a URL after `load_polls` readiness checks; `crash` URLs kill their tab"""
+
+    def __init__(self, load_polls=2, crash=(), hang=()):
+        self.windows = {"tab0": {"url": None, "polls": 0}}
+        self.current = "tab0"
+        self.opened = 0
+        self.load_polls = load_polls
+        self.crash = set(crash)
+        self.hang = set(hang)
+        self.switch_to = FakeSwitchTo(self)
+        self.peak_windows = 1
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    @property
+    def window_handles(self):
+        return list(self.windows)
+
+    def execute_script(self, script, *args):
+        window = self.windows[self.current]
+        self.peak_windows = max(self.peak_windows, len(self.windows))
+        if args:
+            window["url"], window["polls"] = args[0], 0
+            return None
+        if window["url"] in self.crash:
+            raise WebDriverException("tab crashed")
+        window["polls"] += 1
+        if window["url"] in self.hang:
+            return "pending"
+        return "ready" if window["polls"] >= self.load_polls else "loading"
+
+    @property
+    def page_source(self):
+        return PAGE.format(self.windows[self.current]["url"])
+
+    def close(self):
+        del self.windows[self.current]
+
+
+def make_scheduler(driver, tabs=3, timeout=10.0):
+    clock = FakeClock()
+    return TabScheduler(driver, tabs, "return true;", ready_timeout=timeout, clock=clock, sleep=clock.sleep)
+
+
+def test_loads_every_url_across_tabs():
+    driver = FakeDriver()
+    urls = [f"https://www.ndtv.com/{i}" for i in range(7)]
+    results = list(make_scheduler(driver).run(urls))
+    assert sorted(r.url for r in results) == sorted(urls)
+    assert all(r.ready and r.url in r.html for r in results)
+    assert driver.peak_windows == 3
+    assert driver.window_handles == ["tab0"]
+
+
+def test_crashed_tab_only_fails_its_url():
+    driver = FakeDriver(crash={"https://www.ndtv.com/bad"})
+    urls = ["https://www.ndtv.com/1", "https://www.ndtv.com/bad", "https://www.ndtv.com/2", "https://www.ndtv.com/3"]
+    results = {r.url: r for r in make_scheduler(driver, tabs=2).run(urls)}
+    assert results["https://www.ndtv.com/bad"].error
+    assert all(results[url].html for url in urls if url != "https://www.ndtv.com/bad")
+    assert len(driver.window_handles) == 1
+
+
+def test_timeout_without_navigation_is_an_error():
+    driver = FakeDriver(hang={"https://www.ndtv.com/slow"})
+    results = {r.url: r for r in make_scheduler(driver, tabs=2, timeout=1.0).run(
+        ["https://www.ndtv.com/slow", "https://www.ndtv.com/ok"])}
+    assert results["https://www.ndtv.com/slow"].html is None
+    assert results["https://www.ndtv.com/ok"].ready
+
+
+def test_tab_count_per_host(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPER_TABS_PER_HOST", "ndtv.com:4, www.other.com:2")
+    scraper = NDTVScraper()
+    assert scraper.get_tab_count("https://www.ndtv.com/a") == 4
+    assert scraper.get_tab_count("https://other.com/a") == 2
+    assert scraper.get_tab_count("https://elsewhere.com/a") == 1
+
+
+class FakePool:
+    def __init__(self, driver):
+        self.fake = driver
+        self.checkouts = 0
+
+    @contextmanager
+    def driver(self, timeout=None, pages=1):
+        self.checkouts += 1
+        yield self.fake
+
+
+def test_scrape_articles_shares_one_browser(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPER_TABS_PER_HOST", "ndtv.com:3")
+    monkeypatch.setattr(settings, "SCRAPER_FETCH_MODES", "ndtv:browser")
+    pool = FakePool(FakeDriver(crash={"https://www.ndtv.com/bad"}))
+    scraper = NDTVScraper()
+    scraper.driver_pool, scraper.html_cache = pool, None
+    monkeypatch.setattr(scraper, "apply_blocking", lambda driver: None)
+    urls = ["https://www.ndtv.com/1", "https://www.ndtv.com/bad", "https://www.ndtv.com/2"]
+    articles = scraper.scrape_articles(urls)
+    assert pool.checkouts == 1
+    assert [a.url for a in articles] == urls
+    assert [a.status for a in articles] == ["success", "failed", "success"]
+    assert articles[0].title == "https://www.ndtv.com/1"
+    assert articles[0].network["pages"] == 3
+
+
+def test_extraction_error_only_fails_its_tab(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPER_TABS_PER_HOST", "ndtv.com:3")
+    monkeypatch.setattr(settings, "SCRAPER_FETCH_MODES", "ndtv:browser")
+    scraper = NDTVScraper()
+    scraper.driver_pool, scraper.html_cache = FakePool(FakeDriver()), None
+    monkeypatch.setattr(scraper, "apply_blocking", lambda driver: None)
+    build_article = scraper._build_article
+
+    def flaky_build(url, html, timings, fetched_via):
+        if url.endswith("/1"):
+            raise ValueError("extractor broke")
+        return build_article(url, html, timings, fetched_via)
+
+    monkeypatch.setattr(scraper, "_build_article", flaky_build)
+    articles = scraper.scrape_articles([f"https://www.ndtv.com/{i}" for i in range(3)])
+    assert [a.status for a in articles] == ["success", "failed", "success"]
+
+
+def test_unified_scraper_groups_same_host_urls(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPER_TABS_PER_HOST", "ndtv.com:3")
+    controller = AdaptiveRateController(initial_rate=1000, max_rate=1000)
+    scraper = UnifiedScraper(max_workers=2, throttle=DomainThrottle(max_per_domain=3, min_interval=0),
+                             skip_seen=False, controller=controller)
+    batches = []
+
+    def fake_scrape_articles(self, urls):
+        batches.append(list(urls))
+        return [ScrapedArticle(title=url, content="x", source="ndtv", url=url, scraped_at=datetime.now())
+                for url in urls]
+
+    monkeypatch.setattr(NDTVScraper, "scrape_articles", fake_scrape_articles)
+    urls = [{"url": f"https://www.ndtv.com/{i}", "platform": "ndtv"} for i in range(5)]
+    articles = scraper.scrape_multiple_articles(urls)
+    assert [a.url for a in articles] == [u["url"] for u in urls]
+    assert sorted(len(batch) for batch in batches) == [2, 3]
+    assert controller.snapshot()["ndtv.com"]["requests"] == 5
+
+
+def test_tab_groups_stay_within_per_domain_concurrency(monkeypatch):
+    monkeypatch.setattr(settings, "SCRAPER_TABS_PER_HOST", "ndtv.com:4")
+    scraper = UnifiedScraper(max_workers=3, throttle=DomainThrottle(max_per_domain=2, min_interval=0),
+                             skip_seen=False, controller=AdaptiveRateController(initial_rate=1000, max_rate=1000))
+    lock, active, peak = threading.Lock(), [0], [0]
+
+    def fake_scrape_articles(self, urls):
+        with lock:
+            active[0] += len(urls)
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= len(urls)
+        return [ScrapedArticle(title=url, content="x", source="ndtv", url=url, scraped_at=datetime.now())
+                for url in urls]
+
+    monkeypatch.setattr(NDTVScraper, "scrape_articles", fake_scrape_articles)
+    scraper.scrape_multiple_articles([{"url": f"https://www.ndtv.com/{i}", "platform": "ndtv"} for i in range(8)])
+    assert peak[0] == 2
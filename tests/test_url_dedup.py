@@ -0,0 +1,76 @@
+"""Tests for URL canonicalization and the seen-URL dedup index."""
+import pytest
+
+from app.db.models import Source, Story
+from app.scrapers.dedup import BloomFilter, SeenURLIndex
+from app.scrapers.utils import canonicalize_url
+
+CANONICAL = "https://ndtv.com/india-news/metro-route-123"
+
+
+@pytest.mark.parametrize("variant", [
+    "https://www.ndtv.com/india-news/metro-route-123",
+    "http://www.ndtv.com/india-news/metro-route-123/",
+    "https://m.ndtv.com/india-news/metro-route-123",
+    "https://www.ndtv.com/india-news/metro-route-123/amp/1",
+    "https://www.ndtv.com/amp/india-news/metro-route-123",
+    "https://www.ndtv.com/india-news/metro-route-123?utm_source=twitter&utm_medium=social",
+    "https://www.ndtv.com/india-news/metro-route-123?amp=1&fbclid=abc#comments",
+    "HTTPS://WWW.NDTV.COM:443/india-news/metro-route-123",
+])
+def test_url_variants_share_canonical_form(variant):
+    assert canonicalize_url(variant) == CANONICAL
+
+
+def test_meaningful_query_params_are_kept_and_sorted():
+    assert canonicalize_url("https://a.com/s?q=x&page=2") == "https://a.com/s?page=2&q=x"
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"https://a.com/{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"https://b.com/{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+
+def test_marked_url_is_seen_in_any_variant(db_session):
+    index = SeenURLIndex(session_factory=lambda: db_session, capacity=1000)
+    assert not index.is_seen("https://www.ndtv.com/india-news/metro-route-123")
+    index.mark_seen("https://www.ndtv.com/india-news/metro-route-123?utm_source=x")
+    assert index.is_seen("http://m.ndtv.com/india-news/metro-route-123/amp/1")
+
+
+def test_story_sources_are_indexed_on_warm(db_session):
+    story = Story(title_en="t", title_hi="t", summary_en="s", summary_hi="s", category="c")
+    db_session.add(story)
+    db_session.flush()
+    db_session.add(Source(story_id=story.id, outlet="NDTV", url="https://www.ndtv.com/india-news/metro-route-123"))
+    db_session.commit()
+
+    index = SeenURLIndex(session_factory=lambda: db_session, capacity=1000)
+    assert index.is_seen("https://ndtv.com/india-news/metro-route-123?utm_campaign=y")
+    assert not index.is_seen("https://www.ndtv.com/india-news/other-story-456")
+
+
+def test_refresh_picks_up_sources_added_by_other_writers(db_session):
+    index = SeenURLIndex(session_factory=lambda: db_session, capacity=1000, refresh_interval=0)
+    assert not index.is_seen("https://www.ndtv.com/india-news/metro-route-123")
+
+    story = Story(title_en="t", title_hi="t", summary_en="s", summary_hi="s", category="c")
+    db_session.add(story)
+    db_session.flush()
+    db_session.add(Source(story_id=story.id, outlet="NDTV", url="https://www.ndtv.com/india-news/metro-route-123"))
+    db_session.commit()
+    assert index.is_seen("https://ndtv.com/india-news/metro-route-123")
+
+
+def test_lookup_failures_fail_open():
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    index = SeenURLIndex(session_factory=broken_session, capacity=1000)
+    assert not index.is_seen("https://www.ndtv.com/a")
+    index.mark_seen("https://www.ndtv.com/a")